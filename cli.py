@@ -0,0 +1,260 @@
+"""
+Command-line access to the reading tracker database, for scripts and cron
+jobs. Never imports Tk: only the database layer, and each command's helpers
+are imported when that command runs, so starting up stays fast.
+
+Output is JSON: one object per line for listings (streamed as rows are
+read), a single object for everything else. Errors go to stderr with a
+non-zero exit status.
+
+    python cli.py list --type project
+    python cli.py search "history" --files
+    python cli.py create project "Essay 2" --parent 3 --assignment
+    python cli.py export ~/export --format html --item 3
+    python cli.py export changes.rtsync --format changes
+    python cli.py maintenance --purge-trash
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+DEFAULT_DB_FILE = "reading_tracker.db"  # Same default as the app: relative to the working directory
+LOCK_RETRIES = 5  # Times maintenance waits for another instance's write lock before giving up
+LOCK_RETRY_SECONDS = 1  # First wait; doubled after each retry
+
+
+class CliContext:
+    """Stands in for the executor's TaskContext, so background tasks can run in the foreground."""
+
+    def __init__(self, db, show_progress=False):
+        self.db = db
+        self.show_progress = show_progress
+
+    def check_cancelled(self):
+        pass  # Ctrl+C interrupts the process instead
+
+    def report_progress(self, value):
+        if self.show_progress:
+            print(f"\r{value}", end="", file=sys.stderr, flush=True)
+
+
+class CliError(Exception):
+    """A command that can't be carried out; printed without a traceback."""
+
+
+def emit(value):
+    sys.stdout.write(json.dumps(value, ensure_ascii=False, default=str) + "\n")
+
+
+def emit_rows(rows):
+    """Writes rows as JSON lines as they come, so long listings start printing at once."""
+    for row in rows:
+        emit(dict(row))
+
+
+def open_db(path, must_exist=True):
+    if must_exist and not os.path.exists(path):
+        raise CliError(f"No database at '{path}' (use --db)")
+    from contextlib import redirect_stdout
+    from database_manager import DatabaseManager
+    with redirect_stdout(sys.stderr):  # Schema migration messages would corrupt the JSON output
+        return DatabaseManager(path)
+
+
+def require_item(db, item_id, item_type=None):
+    item = db.get_item_details(item_id)
+    if item is None or item['deleted_at'] is not None:
+        raise CliError(f"No item with id {item_id}")
+    if item_type is not None and item['type'] != item_type:
+        raise CliError(f"Item {item_id} is a {item['type']}, not a {item_type}")
+    return item
+
+
+# --- Commands ---
+
+def cmd_list(args, db):
+    if args.readings is not None:
+        require_item(db, args.readings, "project")
+        emit_rows(db.iter_project_readings(args.readings))
+    else:
+        emit_rows(db.iter_items(item_type=args.type, parent_id=args.parent, trashed=args.trash))
+
+
+def cmd_search(args, db):
+    if args.files:
+        for row in db.search_attachment_text(args.query, args.limit):
+            emit({key: row[key] for key in row.keys()})
+    else:
+        emit_rows(db.search_names(args.query, args.limit))
+
+
+def cmd_create(args, db):
+    if args.parent is not None:
+        if args.type == "class":
+            raise CliError("Classes can't be nested")
+        require_item(db, args.parent, "class")
+    item_id = db.create_item(args.name, args.type, args.parent, 1 if args.assignment else 0)
+    emit({"id": item_id, "type": args.type, "name": args.name, "parent_id": args.parent})
+
+
+def cmd_move(args, db):
+    require_item(db, args.project_id, "project")
+    if args.to is not None:
+        require_item(db, args.to, "class")
+    db.move_item(args.project_id, args.to)
+    emit({"id": args.project_id, "parent_id": args.to})
+
+
+def cmd_export(args, db):
+    ctx = CliContext(db, args.progress)
+    if args.format == "changes":
+        from utils.sync_manager import export_changes
+        rows, size = export_changes(ctx, args.target, args.since)
+        emit({"path": os.path.abspath(args.target), "rows": rows, "bytes": size})
+    else:
+        from utils.library_exporter import export_projects
+        if args.item is not None:
+            require_item(db, args.item)
+        count, index_path = export_projects(ctx, args.item, args.format, args.target)
+        emit({"path": os.path.abspath(index_path), "projects": count})
+
+
+def cmd_import(args, db):
+    from utils.sync_manager import import_changes, SyncError
+    try:
+        emit(import_changes(CliContext(db, args.progress), args.file))
+    except SyncError as e:
+        raise CliError(str(e)) from e
+
+
+def cmd_stats(args, db):
+    emit(db.get_library_stats())
+
+
+def cmd_maintenance(args, db):
+    result = {}
+    ctx = CliContext(db, args.progress)
+    if args.purge_trash:
+        purged = 0
+        while True:
+            count = db.purge_trash_chunk()
+            if not count:
+                break
+            purged += count
+        result['purged_rows'] = purged
+
+    if args.attachments:
+        from utils.attachment_store import AttachmentStore, collect_garbage, verify_blobs
+        store = AttachmentStore.for_database(db.db_file)
+        result['removed_files'] = collect_garbage(ctx, store)
+        result['verified_files'], result['damaged_files'] = verify_blobs(ctx, store)
+
+    if db.incremental_vacuum_pending():
+        # The app only does this one-time rebuild while the user is away; here nobody is waiting
+        try:
+            db.enable_incremental_vacuum(progress=lambda seconds: ctx.report_progress(f"vacuum {seconds}s"))
+            result['incremental_vacuum_enabled'] = True
+        except sqlite3.OperationalError as e:
+            result['incremental_vacuum_enabled'] = False
+            result['incremental_vacuum_error'] = str(e)
+
+    # Without the app's idle time box, run the whole pass in one go. Steps give way
+    # to other instances' write locks; wait a little for those, but not forever
+    steps = 0
+    retries = 0
+    while db.run_maintenance(budget_ms=args.budget_ms, force=args.force and steps == 0):
+        steps += 1
+        if not db.maintenance_blocked:
+            retries = 0
+            continue
+        if retries == LOCK_RETRIES:
+            result['stopped'] = "database busy"
+            break
+        time.sleep(LOCK_RETRY_SECONDS * 2 ** retries)
+        retries += 1
+    result['maintenance_log'] = [dict(row) for row in db.get_maintenance_log(limit=args.log)]
+    emit(result)
+    if 'stopped' in result:
+        raise CliError("another instance kept the database locked; maintenance stopped before the pass finished")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Reading tracker from the command line (JSON output).")
+    parser.add_argument("--db", default=DEFAULT_DB_FILE, help=f"database file (default: {DEFAULT_DB_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("list", help="stream classes and projects (or a project's readings) as JSON lines")
+    p.add_argument("--type", choices=("class", "project"))
+    p.add_argument("--parent", type=int, help="only the projects of this class")
+    p.add_argument("--trash", action="store_true", help="list trashed items instead")
+    p.add_argument("--readings", type=int, metavar="PROJECT_ID", help="list this project's readings")
+    p.set_defaults(handler=cmd_list)
+
+    p = commands.add_parser("search", help="find items and readings by name, or attached files by content")
+    p.add_argument("query")
+    p.add_argument("--files", action="store_true", help="full-text search of attached files")
+    p.add_argument("--limit", type=int, default=50)
+    p.set_defaults(handler=cmd_search)
+
+    p = commands.add_parser("create", help="create a class or project")
+    p.add_argument("type", choices=("class", "project"))
+    p.add_argument("name")
+    p.add_argument("--parent", type=int, metavar="CLASS_ID")
+    p.add_argument("--assignment", action="store_true", help="mark the project as an assignment")
+    p.set_defaults(handler=cmd_create, create_db=True)
+
+    p = commands.add_parser("move", help="move a project into a class (or out of it)")
+    p.add_argument("project_id", type=int)
+    p.add_argument("--to", type=int, metavar="CLASS_ID", help="target class (default: standalone)")
+    p.set_defaults(handler=cmd_move)
+
+    p = commands.add_parser("export", help="export projects to Markdown/HTML, or local edits to a change file")
+    p.add_argument("target", help="folder (markdown/html) or file (changes)")
+    p.add_argument("--format", choices=("markdown", "html", "changes"), default="markdown")
+    p.add_argument("--item", type=int, help="only this project or class (markdown/html)")
+    p.add_argument("--since", type=int, metavar="VERSION",
+                   help="changes after this version (default: those the other copy hasn't confirmed)")
+    p.add_argument("--progress", action="store_true", help="show progress on stderr")
+    p.set_defaults(handler=cmd_export)
+
+    p = commands.add_parser("import", help="apply a change file exported from another copy of the database")
+    p.add_argument("file")
+    p.add_argument("--progress", action="store_true", help="show progress on stderr")
+    p.set_defaults(handler=cmd_import)
+
+    p = commands.add_parser("stats", help="counts and totals over the whole library")
+    p.set_defaults(handler=cmd_stats)
+
+    p = commands.add_parser("maintenance", help="run a database maintenance pass")
+    p.add_argument("--force", action="store_true", help="run even if a pass ran recently")
+    p.add_argument("--purge-trash", action="store_true", help="permanently delete everything in the Trash")
+    p.add_argument("--attachments", action="store_true", help="delete unused attached files and verify the rest")
+    p.add_argument("--budget-ms", type=int, default=1000, help="time box per maintenance call")
+    p.add_argument("--log", type=int, default=20, help="maintenance log entries to print")
+    p.add_argument("--progress", action="store_true", help="show progress on stderr")
+    p.set_defaults(handler=cmd_maintenance)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        db = open_db(args.db, must_exist=not getattr(args, "create_db", False))
+        args.handler(args, db)
+        if getattr(args, "progress", False):
+            print(file=sys.stderr)  # End the progress line
+        sys.stdout.flush()
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Output piped into e.g. head, which stopped reading
+        sys.stdout = open(os.devnull, "w")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,206 @@
 import sqlite3
 import shutil
 import os
+import re
+import socket
+import time
+import uuid
+import zlib
+from collections import deque
+
+READING_STATUSES = ("Not Started", "Reading", "Finished")
+READING_FIELDS = ("title", "authors", "total_pages", "status", "pages_read")
+ASSIGNMENT_STATUSES = ("Not Started", "In Progress", "Submitted", "Graded")
+ASSIGNMENT_FIELDS = ("due_at", "status", "rubric", "remind_minutes_before")
+
+# Project note fields (items columns) -> display name
+NOTE_FIELDS = {
+    "project_purpose_text": "Purpose",
+    "project_goals_text": "Goals",
+    "key_questions_text": "Key Questions",
+    "thesis_text": "Thesis/Argument",
+    "insights_text": "Key Insights",
+    "unresolved_text": "Unresolved Questions",
+}
+
+# Note values at least this long (UTF-8 bytes) are stored zlib-compressed, as a BLOB
+# starting with NOTE_COMPRESSED_MARKER; shorter ones (and all older rows) stay plain TEXT
+NOTE_COMPRESS_MIN_BYTES = 16 * 1024
+NOTE_COMPRESSED_MARKER = b"ZLB1"
+NOTE_COMPRESS_BATCH = 20  # Existing large notes compressed per maintenance step
+
+# Rollup table -> period column it is keyed on (None = whole project)
+SESSION_ROLLUPS = {
+    "session_daily_totals": "day",
+    "session_weekly_totals": "week_start",
+    "session_project_totals": None,
+}
+
+# Tables whose row changes are recorded in change_log -> column saved as the change's scope
+# (the parent a row is listed under, so a view knows which of its parts to refresh)
+CHANGE_LOG_TABLES = {
+    "items": "parent_id",
+    "readings": "project_id",
+    "reading_sessions": "project_id",
+}
+# Tables holding a project's own rows -> their project column, parents before children
+# (purged in reverse order, so each chunk deletes rows nothing else still points at)
+SUBTREE_TABLES = {
+    "instructions": "project_id",
+    "readings": "project_id",
+    "reading_sessions": "project_id",
+    "reading_attachments": "project_id",
+    "mindmap_nodes": "project_id",
+    "mindmap_edges": "project_id",
+    "assignments": "project_id",
+    "note_links": "source_project_id",
+}
+# Tables exchanged by sync -> (key column, {synced column: table its value refers to}),
+# parents first. References are sent as sync uids (sync_ids), since row ids differ
+# between databases; SYNC_NODE_KEY marks connection endpoints, which embed ids.
+# instructions and assignments are keyed by their project and share its uid.
+SYNC_NODE_KEY = "node_key"
+SYNC_TABLES = {
+    "items": ("id", {
+        "parent_id": "items", "type": None, "name": None, "display_order": None, "is_assignment": None,
+        **{field: None for field in NOTE_FIELDS}, "deleted_at": None,
+    }),
+    "instructions": ("project_id", {
+        "key_questions_instr": None, "thesis_instr": None, "insights_instr": None, "unresolved_instr": None,
+    }),
+    "readings": ("id", {
+        "project_id": "items", "title": None, "authors": None, "total_pages": None, "status": None,
+        "pages_read": None, "display_order": None,
+    }),
+    "reading_sessions": ("id", {
+        "reading_id": "readings", "project_id": "items", "started_at": None, "ended_at": None, "pages_read": None,
+    }),
+    "assignments": ("project_id", {
+        "due_at": None, "status": None, "rubric": None, "remind_minutes_before": None,
+    }),
+    "mindmap_nodes": ("id", {"project_id": "items", "label": None, "x": None, "y": None, "color": None}),
+    "mindmap_edges": ("id", {"project_id": "items", "source_id": "mindmap_nodes", "target_id": "mindmap_nodes"}),
+    "connections": ("id", {"source_key": SYNC_NODE_KEY, "target_key": SYNC_NODE_KEY, "label": None}),
+}
+SYNC_TOMBSTONE = ""  # sync_log field name recording that the row was deleted
+MAX_EXTRACTION_ATTEMPTS = 3  # Text extraction of a file is given up after this many crashed runs
+BUSY_TIMEOUT_MS = 5000  # How long a write waits for another connection's lock before failing
+PURGE_CHUNK_ROWS = 500  # Rows deleted per transaction when emptying the Trash
+
+# --- Idle maintenance ---
+MAINTENANCE_BUDGET_MS = 50  # Time box for one run_maintenance() call
+MAINTENANCE_INTERVAL_HOURS = 6  # How often a maintenance pass is planned
+ANALYZE_INTERVAL_DAYS = 7  # Full per-table ANALYZE at most this often
+ANALYSIS_LIMIT = 1000  # Rows sampled per index by ANALYZE / optimize, which bounds their run time
+VACUUM_MIN_FREE_PAGES = 64  # Free pages worth reclaiming
+VACUUM_PROGRESS_OPCODES = 10000  # How often (in SQLite VM steps) a full VACUUM checks whether to stop
+MAINTENANCE_LOG_ROWS = 500  # Log entries kept
+CHANGE_LOG_RETENTION_HOURS = 24  # change_log rows are kept this long; watchers read them within seconds
+CHANGE_LOG_PRUNE_ROWS = 5000  # change_log rows deleted per maintenance slice
+
+# Prefix for queries over an item and all its descendants (bind the item id)
+SUBTREE_CTE = """
+WITH RECURSIVE subtree(id) AS (
+    SELECT id FROM items WHERE id = ?
+    UNION ALL
+    SELECT i.id FROM items i JOIN subtree s ON i.parent_id = s.id
+)
+"""
+
+WIKI_LINK_PATTERN = re.compile(r"\[\[([^\[\]\n]+?)\]\]")
+
+
+def normalize_link_name(name):
+    """Link targets match project names case- and whitespace-insensitively."""
+    return " ".join(name.split()).casefold()
+
+
+def extract_wiki_links(text):
+    """The set of normalized [[Project Name]] targets in a note."""
+    if not text:
+        return set()
+    return {normalize_link_name(match) for match in WIKI_LINK_PATTERN.findall(text) if match.strip()}
+
+
+def encode_note(text):
+    """The value to store for a note field: compressed if it is large and that pays off."""
+    if not text:
+        return text
+    data = text.encode("utf-8")
+    if len(data) < NOTE_COMPRESS_MIN_BYTES:
+        return text
+    packed = NOTE_COMPRESSED_MARKER + zlib.compress(data, 6)
+    return packed if len(packed) < len(data) else text
+
+
+def decode_note(value):
+    """The text of a stored note field, whether plain TEXT (old rows) or compressed."""
+    if isinstance(value, bytes):
+        if value.startswith(NOTE_COMPRESSED_MARKER):
+            return zlib.decompress(value[len(NOTE_COMPRESSED_MARKER):]).decode("utf-8")
+        return value.decode("utf-8")
+    return value
+
+
+def make_node_key(kind, item_id, field=None):
+    """
+    Builds a connection endpoint key: 'project:12', 'reading:5' or 'note:12:thesis_text'.
+    Keys sort by kind and id, so everything of one project is a contiguous key range.
+    """
+    if kind == "note":
+        return f"note:{item_id}:{field}"
+    return f"{kind}:{item_id}"
+
+
+def parse_node_key(key):
+    """Splits a node key into (kind, id, field); field is None except for notes."""
+    parts = key.split(":")
+    return parts[0], int(parts[1]), (parts[2] if len(parts) > 2 else None)
+
+
+def live_node_sql(key_column):
+    """
+    SQL condition that the node in key_column is not in the Trash: the project
+    it belongs to (its own, its note's, or its reading's) has no deleted_at.
+    CAST reads the leading digits, so 'note:12:thesis_text' yields 12.
+    """
+    return f"""NOT EXISTS (
+        SELECT 1 FROM items trashed WHERE trashed.deleted_at IS NOT NULL AND trashed.id = CASE
+            WHEN substr({key_column}, 1, 8) = 'reading:'
+            THEN (SELECT project_id FROM readings WHERE id = CAST(substr({key_column}, 9) AS INTEGER))
+            ELSE CAST(substr({key_column}, instr({key_column}, ':') + 1) AS INTEGER)
+        END
+    )"""
 
 
 class DatabaseManager:
-    def __init__(self, db_file="reading_tracker.db"):
-        """Initialize and connect to the SQLite database."""
+    def __init__(self, db_file="reading_tracker.db", initialize=True):
+        """
+        Initialize and connect to the SQLite database.
+        Extra connections to an already set-up file (e.g. for worker threads)
+        pass initialize=False to skip the schema checks.
+        """
+        self.db_file = db_file
         self.conn = sqlite3.connect(db_file)
         self.conn.row_factory = sqlite3.Row  # Access columns by name
         self.conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign key cascade
+        # Other app instances, scripts and worker threads share the file: wait for
+        # their locks instead of failing, and let readers run alongside a writer
+        self.conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        if initialize:
+            if self.conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+                # A new file starts in incremental mode (it can only be set before the
+                # first write); older files are converted by enable_incremental_vacuum()
+                self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL, fewer fsyncs
         self.cursor = self.conn.cursor()
-        self.setup_database()
+        self._maintenance_queue = deque()  # Steps of the maintenance pass in progress
+        self._vacuum_slice_pages = 64  # Adapted so one incremental_vacuum slice fits its time box
+        self.maintenance_blocked = False  # The last run_maintenance call gave way to another connection's lock
+        self._compress_after_id = 0  # Where the compress_notes step continues
+        if initialize:
+            self.setup_database()
 
     def setup_database(self):
         """
@@ -37,7 +227,8 @@ class DatabaseManager:
             "key_questions_text": "TEXT",
             "thesis_text": "TEXT",
             "insights_text": "TEXT",
-            "unresolved_text": "TEXT"
+            "unresolved_text": "TEXT",
+            "deleted_at": "TEXT"  # Set when the item is in the Trash
         }
 
         # Get existing columns
@@ -66,8 +257,676 @@ class DatabaseManager:
         """)
         # --- END NEW TABLE ---
 
+        # --- Readings (per-project sources) ---
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS readings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            authors TEXT,
+            total_pages INTEGER,
+            status TEXT NOT NULL DEFAULT 'Not Started',
+            pages_read INTEGER NOT NULL DEFAULT 0,
+            display_order INTEGER,
+            FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE
+        )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_readings_project_order ON readings(project_id, display_order, id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_readings_project_status ON readings(project_id, status)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_items_parent ON items(parent_id, display_order)"
+        )
+        # Only trashed items are indexed, so this stays tiny
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_items_deleted ON items(deleted_at) WHERE deleted_at IS NOT NULL"
+        )
+
+        # --- Per-class counters shown in the home tree ---
+        # Kept up to date by triggers on items, so loading the tree reads them
+        # with one join instead of counting every class's projects
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_counters'")
+        item_counters_existed = self.cursor.fetchone() is not None
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS item_counters (
+            item_id INTEGER PRIMARY KEY,
+            project_count INTEGER NOT NULL DEFAULT 0,
+            assignment_count INTEGER NOT NULL DEFAULT 0,
+            notes_bytes INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE CASCADE
+        )
+        """)
+        self._create_item_counter_triggers()
+        if not item_counters_existed:
+            self.rebuild_item_counters()
+
+        # --- Reading sessions and their rollups ---
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reading_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reading_id INTEGER NOT NULL,
+            project_id INTEGER NOT NULL,
+            started_at TEXT NOT NULL,
+            ended_at TEXT NOT NULL,
+            pages_read INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (reading_id) REFERENCES readings(id) ON DELETE CASCADE,
+            FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE
+        )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_reading ON reading_sessions(reading_id, started_at)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_project ON reading_sessions(project_id, started_at)"
+        )
+
+        # --- Reading attachments (source files in the content-addressed store) ---
+        # One attachment_blobs row per distinct file content; ref_count is kept
+        # by triggers on reading_attachments, including ON DELETE CASCADE deletes.
+        # Blobs left at 0 references are removed from disk by collect_garbage.
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS attachment_blobs (
+            sha256 TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            added_at TEXT NOT NULL,
+            verified_at TEXT,
+            status TEXT NOT NULL DEFAULT 'ok'
+        ) WITHOUT ROWID
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_blobs_unreferenced ON attachment_blobs(sha256) WHERE ref_count <= 0"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_blobs_verified ON attachment_blobs(verified_at)"
+        )
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reading_attachments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reading_id INTEGER NOT NULL,
+            project_id INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            media_type TEXT,
+            added_at TEXT NOT NULL,
+            FOREIGN KEY (reading_id) REFERENCES readings(id) ON DELETE CASCADE,
+            FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE,
+            FOREIGN KEY (sha256) REFERENCES attachment_blobs(sha256)
+        )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attachments_reading ON reading_attachments(reading_id, id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attachments_project ON reading_attachments(project_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attachments_blob ON reading_attachments(sha256)"
+        )
+        self._create_attachment_refcount_triggers()
+
+        # --- Attachment text (persisted extraction queue and full-text index) ---
+        # One job per blob, so a file attached to several readings is extracted once
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS extraction_jobs (
+            sha256 TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            media_type TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            queued_at TEXT NOT NULL,
+            finished_at TEXT
+        ) WITHOUT ROWID
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extraction_jobs_open ON extraction_jobs(status, queued_at) "
+            "WHERE status IN ('pending', 'running')"
+        )
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS attachment_chunks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sha256 TEXT NOT NULL,
+            chunk_no INTEGER NOT NULL,
+            body TEXT NOT NULL
+        )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attachment_chunks_blob ON attachment_chunks(sha256, chunk_no)"
+        )
+        # External-content FTS5 index over attachment_chunks.body (the text is stored once)
+        self.cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS attachment_text_fts USING fts5(
+            body, content='attachment_chunks', content_rowid='id'
+        )
+        """)
+        self._create_attachment_text_triggers()
+
+        # Totals are kept per (project, period) and updated by triggers on every
+        # session insert/delete, so reading them never scans the session history.
+        for table, period_column in SESSION_ROLLUPS.items():
+            key_columns = "project_id" if period_column is None else f"project_id, {period_column}"
+            period_definition = "" if period_column is None else f"{period_column} TEXT NOT NULL,"
+            self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                project_id INTEGER NOT NULL,
+                {period_definition}
+                pages INTEGER NOT NULL DEFAULT 0,
+                seconds INTEGER NOT NULL DEFAULT 0,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY ({key_columns}),
+                FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+            """)
+        self._create_session_rollup_triggers()
+
+        # --- Mindmaps (one map per project) ---
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS mindmap_nodes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            label TEXT NOT NULL,
+            x REAL NOT NULL DEFAULT 0,
+            y REAL NOT NULL DEFAULT 0,
+            color TEXT,
+            FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE
+        )
+        """)
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS mindmap_edges (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            source_id INTEGER NOT NULL,
+            target_id INTEGER NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE,
+            FOREIGN KEY (source_id) REFERENCES mindmap_nodes(id) ON DELETE CASCADE,
+            FOREIGN KEY (target_id) REFERENCES mindmap_nodes(id) ON DELETE CASCADE
+        )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mindmap_nodes_project ON mindmap_nodes(project_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mindmap_edges_project ON mindmap_edges(project_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mindmap_edges_source ON mindmap_edges(source_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mindmap_edges_target ON mindmap_edges(target_id)"
+        )
+
+        # --- Assignments (one per project marked as an assignment) ---
+        # due_at is 'YYYY-MM-DD HH:MM:SS' local time; reminded_at is set once the reminder fired
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS assignments (
+            project_id INTEGER PRIMARY KEY,
+            due_at TEXT,
+            status TEXT NOT NULL DEFAULT 'Not Started',
+            rubric TEXT NOT NULL DEFAULT '',
+            remind_minutes_before INTEGER,
+            reminded_at TEXT,
+            FOREIGN KEY (project_id) REFERENCES items(id) ON DELETE CASCADE
+        )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_assignments_due ON assignments(due_at)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_assignments_status_due ON assignments(status, due_at)"
+        )
+
+        # --- Connections (undirected links between projects, readings and notes) ---
+        # Endpoints are node keys (see make_node_key), stored with source_key < target_key
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS connections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_key TEXT NOT NULL,
+            target_key TEXT NOT NULL,
+            label TEXT NOT NULL DEFAULT '',
+            UNIQUE (source_key, target_key),
+            CHECK (source_key < target_key)
+        )
+        """)
+        # The UNIQUE constraint indexes source_key; this covers the other endpoint
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_connections_target ON connections(target_key, source_key)"
+        )
+        self._create_connection_cleanup_triggers()
+
+        # --- [[Wiki links]] between project notes ---
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'note_links'")
+        note_links_existed = self.cursor.fetchone() is not None
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS note_links (
+            source_project_id INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            target_name TEXT NOT NULL,
+            PRIMARY KEY (source_project_id, field, target_name),
+            FOREIGN KEY (source_project_id) REFERENCES items(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_note_links_target ON note_links(target_name, source_project_id)"
+        )
+        if not note_links_existed:
+            self._index_existing_note_links()
+
+        # --- Graph analytics cache ---
+        # graph_version is bumped by triggers whenever the link graph (or the
+        # reading/class membership it is summarised by) changes
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS graph_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            graph_version INTEGER NOT NULL DEFAULT 0
+        )
+        """)
+        self.cursor.execute("INSERT OR IGNORE INTO graph_state (id, graph_version) VALUES (1, 0)")
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_cache (
+            name TEXT PRIMARY KEY,
+            graph_version INTEGER NOT NULL,
+            payload TEXT NOT NULL
+        )
+        """)
+        self._create_graph_version_triggers()
+
+        # --- Change log (lets other connections see which rows changed) ---
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            scope_id INTEGER
+        )
+        """)
+        self._create_change_log_triggers()
+        # change_log rows carry no time: each maintenance pass notes the last version
+        # it saw, so a later pass knows which rows are older than the retention window
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS change_log_marks (
+            marked_at TEXT NOT NULL,
+            version INTEGER NOT NULL
+        )
+        """)
+
+        # --- Sync (exchanging edits with a copy of this database on another machine) ---
+        # sync_log holds, per synced field, when it last changed and on which
+        # database (origin), with the local change counter (sync_state.version)
+        # at the time; deletes leave a tombstone row (field SYNC_TOMBSTONE).
+        # Triggers keep it current, skipping the writes of an import (applying = 1).
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sync_state'")
+        sync_existed = self.cursor.fetchone() is not None
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            site_id TEXT NOT NULL,
+            host TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
+            applying INTEGER NOT NULL DEFAULT 0
+        )
+        """)
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_ids (
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            uid TEXT NOT NULL,
+            PRIMARY KEY (table_name, row_id)
+        ) WITHOUT ROWID
+        """)
+        self.cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_sync_ids_uid ON sync_ids(table_name, uid)"
+        )
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_log (
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            changed_at TEXT NOT NULL,
+            origin TEXT NOT NULL,
+            PRIMARY KEY (table_name, row_id, field)
+        ) WITHOUT ROWID
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sync_log_version ON sync_log(version)"
+        )
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_peers (
+            site_id TEXT PRIMARY KEY,
+            imported_version INTEGER NOT NULL DEFAULT 0,
+            acked_version INTEGER NOT NULL DEFAULT 0,
+            last_import_at TEXT
+        )
+        """)
+        self._check_sync_site()
+        self._create_sync_triggers()
+        if not sync_existed:
+            self._assign_baseline_sync_ids()
+
+        # --- Maintenance log (one row per idle maintenance step) ---
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS maintenance_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ran_at TEXT NOT NULL,
+            step TEXT NOT NULL,
+            duration_ms REAL NOT NULL,
+            bytes_reclaimed INTEGER NOT NULL DEFAULT 0
+        )
+        """)
+
         self.conn.commit()
 
+    def _index_existing_note_links(self):
+        """One-time backfill of note_links from the notes saved before it existed."""
+        columns = ", ".join(NOTE_FIELDS)
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT id, {columns} FROM items WHERE type = 'project'")
+        rows = []
+        for row in cursor:
+            for field in NOTE_FIELDS:
+                rows.extend((row['id'], field, target) for target in extract_wiki_links(decode_note(row[field])))
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO note_links (source_project_id, field, target_name) VALUES (?, ?, ?)", rows
+        )
+
+    def _create_graph_version_triggers(self):
+        """Bumps graph_state.graph_version on every change the graph analytics depend on."""
+        bump = "UPDATE graph_state SET graph_version = graph_version + 1 WHERE id = 1;"
+        watched = {
+            "connections": ("INSERT", "DELETE", "UPDATE OF source_key, target_key"),
+            "readings": ("INSERT", "DELETE", "UPDATE OF title, project_id"),
+            "items": ("INSERT", "DELETE", "UPDATE OF parent_id, name"),
+        }
+        for table, events in watched.items():
+            for event in events:
+                name = f"trg_{table}_{event.split()[0].lower()}_graph_version"
+                self.cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {name}
+                AFTER {event} ON {table}
+                BEGIN {bump} END
+                """)
+        # Moving projects to and from the Trash hides them from the graph too
+        self.cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_items_trash_graph_version
+        AFTER UPDATE OF deleted_at ON items
+        BEGIN {bump} END
+        """)
+
+    def _create_change_log_triggers(self):
+        """Records every insert, update and delete of the CHANGE_LOG_TABLES rows in change_log."""
+        for table, scope_column in CHANGE_LOG_TABLES.items():
+            for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                self.cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_change_log
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, row_id, op, scope_id)
+                    VALUES ('{table}', {row}.id, '{event.lower()}', {row}.{scope_column});
+                END
+                """)
+
+    def _check_sync_site(self):
+        """
+        Gives this database its own sync identity, and a new one when the file
+        has been copied to another machine, so two copies never pass their
+        edits off as each other's.
+        """
+        host = socket.gethostname()
+        self.cursor.execute("SELECT site_id, host FROM sync_state WHERE id = 1")
+        row = self.cursor.fetchone()
+        if row is None:
+            self.cursor.execute("INSERT INTO sync_state (id, site_id, host) VALUES (1, ?, ?)", (uuid.uuid4().hex, host))
+        elif row['host'] != host:
+            print("Database copied from another machine: starting a new sync identity...")
+            self.cursor.execute("UPDATE sync_state SET site_id = ?, host = ?", (uuid.uuid4().hex, host))
+
+    def _assign_baseline_sync_ids(self):
+        """
+        One-time: uids for the rows that existed before sync did. They are
+        derived from the row ids, so copies of the same database agree on them.
+        """
+        for table, (key, _) in SYNC_TABLES.items():
+            uid_table = table if key == "id" else "items"
+            self.cursor.execute(f"""
+                INSERT OR IGNORE INTO sync_ids (table_name, row_id, uid)
+                SELECT '{table}', {key}, '0-{uid_table}-' || {key} FROM {table}
+            """)
+
+    def _create_sync_triggers(self):
+        """
+        Keeps sync_ids and sync_log up to date for every SYNC_TABLES row: an
+        insert gets a random uid and logs all its fields, an update logs the
+        fields whose value changed, and a delete replaces the row's entries
+        with a tombstone.
+        """
+        bump = "UPDATE sync_state SET version = version + 1;"
+        version = "(SELECT version FROM sync_state)"
+        now = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+        site = "(SELECT site_id FROM sync_state)"
+        local_write = "(SELECT applying FROM sync_state) = 0"
+        for table, (key, columns) in SYNC_TABLES.items():
+            if key == "id":
+                uid = "lower(hex(randomblob(8)))"
+            else:
+                uid = (f"COALESCE((SELECT uid FROM sync_ids WHERE table_name = 'items' AND row_id = NEW.{key}), "
+                       "lower(hex(randomblob(8))))")
+            self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_id
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT OR IGNORE INTO sync_ids (table_name, row_id, uid) VALUES ('{table}', NEW.{key}, {uid});
+                DELETE FROM sync_log
+                WHERE table_name = '{table}' AND row_id = NEW.{key} AND field = '{SYNC_TOMBSTONE}';
+            END
+            """)
+            inserted = ", ".join(f"('{table}', NEW.{key}, '{column}', {version}, {now}, {site})" for column in columns)
+            self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_sync
+            AFTER INSERT ON {table} WHEN {local_write}
+            BEGIN
+                {bump}
+                INSERT OR REPLACE INTO sync_log (table_name, row_id, field, version, changed_at, origin)
+                VALUES {inserted};
+            END
+            """)
+            updated = "".join(f"""
+                INSERT OR REPLACE INTO sync_log (table_name, row_id, field, version, changed_at, origin)
+                SELECT '{table}', NEW.{key}, '{column}', {version}, {now}, {site} WHERE NEW.{column} IS NOT OLD.{column};"""
+                for column in columns)
+            self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_update_sync
+            AFTER UPDATE OF {", ".join(columns)} ON {table} WHEN {local_write}
+            BEGIN
+                {bump}{updated}
+            END
+            """)
+            self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_delete_sync
+            AFTER DELETE ON {table}
+            BEGIN
+                DELETE FROM sync_log WHERE table_name = '{table}' AND row_id = OLD.{key};
+                UPDATE sync_state SET version = version + 1 WHERE {local_write};
+                INSERT INTO sync_log (table_name, row_id, field, version, changed_at, origin)
+                SELECT '{table}', OLD.{key}, '{SYNC_TOMBSTONE}', {version}, {now}, {site} WHERE {local_write};
+            END
+            """)
+
+    def _create_connection_cleanup_triggers(self):
+        """Drops connections whose project (or its notes) or reading is deleted."""
+        note_range = "BETWEEN 'note:' || OLD.id || ':' AND 'note:' || OLD.id || ';'"  # ';' sorts after ':'
+        self.cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_items_delete_connections
+        AFTER DELETE ON items
+        BEGIN
+            DELETE FROM connections WHERE source_key = 'project:' || OLD.id OR source_key {note_range};
+            DELETE FROM connections WHERE target_key = 'project:' || OLD.id OR target_key {note_range};
+        END
+        """)
+        self.cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_readings_delete_connections
+        AFTER DELETE ON readings
+        BEGIN
+            DELETE FROM connections WHERE source_key = 'reading:' || OLD.id;
+            DELETE FROM connections WHERE target_key = 'reading:' || OLD.id;
+        END
+        """)
+
+    def _create_item_counter_triggers(self):
+        """
+        Keeps item_counters in step with the projects directly under each class.
+        A live project adds 1 project, 1 assignment if it is one, and the stored
+        size of its notes to its parent's row; every insert, delete, move,
+        trash/restore, assignment flag change and note save moves that
+        contribution between the old and the new state.
+        """
+        notes_bytes = " + ".join(f"COALESCE(LENGTH(CAST({{0}}.{field} AS BLOB)), 0)" for field in NOTE_FIELDS)
+        counts = "CASE WHEN {0}.type = 'project' AND {0}.deleted_at IS NULL AND {0}.parent_id IS NOT NULL THEN 1 ELSE 0 END"
+        is_assignment = "(COALESCE({0}.is_assignment, 0) != 0)"
+
+        def add(row):
+            return f"""
+                INSERT INTO item_counters (item_id, project_count, assignment_count, notes_bytes)
+                SELECT {row}.parent_id, 1, {is_assignment.format(row)}, {notes_bytes.format(row)}
+                WHERE {counts.format(row)}
+                ON CONFLICT (item_id) DO UPDATE SET
+                    project_count = project_count + excluded.project_count,
+                    assignment_count = assignment_count + excluded.assignment_count,
+                    notes_bytes = notes_bytes + excluded.notes_bytes;"""
+
+        def subtract(row):
+            return f"""
+                UPDATE item_counters SET
+                    project_count = project_count - 1,
+                    assignment_count = assignment_count - {is_assignment.format(row)},
+                    notes_bytes = notes_bytes - ({notes_bytes.format(row)})
+                WHERE item_id = {row}.parent_id AND {counts.format(row)};"""
+
+        watched_columns = ", ".join(["parent_id", "type", "deleted_at", "is_assignment", *NOTE_FIELDS])
+        triggers = {
+            "insert": ("AFTER INSERT ON items WHEN NEW.type = 'project'", add("NEW")),
+            "delete": ("AFTER DELETE ON items WHEN OLD.type = 'project'", subtract("OLD")),
+            "update": (f"AFTER UPDATE OF {watched_columns} ON items "
+                       "WHEN OLD.type = 'project' OR NEW.type = 'project'", subtract("OLD") + add("NEW")),
+        }
+        for event, (when, body) in triggers.items():
+            self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_items_{event}_counters
+            {when}
+            BEGIN {body}
+            END
+            """)
+
+    def rebuild_item_counters(self):
+        """Recomputes item_counters from scratch (done once when the table is created)."""
+        notes_bytes = " + ".join(f"COALESCE(LENGTH(CAST({field} AS BLOB)), 0)" for field in NOTE_FIELDS)
+        self.cursor.execute("DELETE FROM item_counters")
+        self.cursor.execute(f"""
+            INSERT INTO item_counters (item_id, project_count, assignment_count, notes_bytes)
+            SELECT parent_id, COUNT(*), SUM(COALESCE(is_assignment, 0) != 0), SUM({notes_bytes})
+            FROM items
+            WHERE type = 'project' AND deleted_at IS NULL AND parent_id IS NOT NULL
+            GROUP BY parent_id
+        """)
+
+    def get_item_counters(self, item_ids):
+        """{item_id: row of (project_count, assignment_count, notes_bytes)} for the given classes."""
+        if not item_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in item_ids)
+        self.cursor.execute(
+            f"SELECT * FROM item_counters WHERE item_id IN ({placeholders})", list(item_ids)
+        )
+        return {row['item_id']: row for row in self.cursor.fetchall()}
+
+    def _create_attachment_refcount_triggers(self):
+        """Keeps attachment_blobs.ref_count equal to the number of reading_attachments rows using each blob."""
+        for event, row, delta in (("INSERT", "NEW", "+ 1"), ("DELETE", "OLD", "- 1")):
+            self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_attachments_{event.lower()}_refcount
+            AFTER {event} ON reading_attachments
+            BEGIN
+                UPDATE attachment_blobs SET ref_count = ref_count {delta} WHERE sha256 = {row}.sha256;
+            END
+            """)
+
+    def _create_attachment_text_triggers(self):
+        """Keeps the FTS index in step with attachment_chunks, and drops a blob's text and job with the blob."""
+        self.cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_attachment_chunks_insert_fts
+        AFTER INSERT ON attachment_chunks
+        BEGIN
+            INSERT INTO attachment_text_fts (rowid, body) VALUES (NEW.id, NEW.body);
+        END
+        """)
+        self.cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_attachment_chunks_delete_fts
+        AFTER DELETE ON attachment_chunks
+        BEGIN
+            INSERT INTO attachment_text_fts (attachment_text_fts, rowid, body) VALUES ('delete', OLD.id, OLD.body);
+        END
+        """)
+        self.cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_attachment_blobs_delete_text
+        AFTER DELETE ON attachment_blobs
+        BEGIN
+            DELETE FROM attachment_chunks WHERE sha256 = OLD.sha256;
+            DELETE FROM extraction_jobs WHERE sha256 = OLD.sha256;
+        END
+        """)
+
+    def _create_session_rollup_triggers(self):
+        """Creates the triggers that keep the session rollup tables up to date."""
+        seconds_expr = "CAST(ROUND((julianday({0}.ended_at) - julianday({0}.started_at)) * 86400) AS INTEGER)"
+        period_exprs = {
+            "day": "date({0}.started_at)",
+            "week_start": "date({0}.started_at, '-6 days', 'weekday 1')",
+        }
+
+        insert_body = []
+        delete_body = []
+        for table, period_column in SESSION_ROLLUPS.items():
+            if period_column is None:
+                columns, values, where = "project_id", "NEW.project_id", "project_id = OLD.project_id"
+                conflict = "project_id"
+            else:
+                period_expr = period_exprs[period_column]
+                columns = f"project_id, {period_column}"
+                values = f"NEW.project_id, {period_expr.format('NEW')}"
+                where = f"project_id = OLD.project_id AND {period_column} = {period_expr.format('OLD')}"
+                conflict = columns
+
+            insert_body.append(f"""
+                INSERT INTO {table} ({columns}, pages, seconds, sessions)
+                VALUES ({values}, NEW.pages_read, {seconds_expr.format('NEW')}, 1)
+                ON CONFLICT ({conflict}) DO UPDATE SET
+                    pages = pages + excluded.pages,
+                    seconds = seconds + excluded.seconds,
+                    sessions = sessions + 1;""")
+            delete_body.append(f"""
+                UPDATE {table} SET
+                    pages = pages - OLD.pages_read,
+                    seconds = seconds - {seconds_expr.format('OLD')},
+                    sessions = sessions - 1
+                WHERE {where};""")
+
+        self.cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_sessions_rollup_insert
+        AFTER INSERT ON reading_sessions
+        BEGIN {"".join(insert_body)}
+        END
+        """)
+        self.cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_sessions_rollup_delete
+        AFTER DELETE ON reading_sessions
+        BEGIN {"".join(delete_body)}
+        END
+        """)
+
     # --- NEW FUNCTION: GET/CREATE INSTRUCTIONS ---
     def get_or_create_instructions(self, project_id):
         """
@@ -116,28 +975,73 @@ class DatabaseManager:
         This is used for auto-saving text boxes.
         """
         # Securely build query to prevent SQL injection
-        if field_name not in ['project_purpose_text', 'project_goals_text',
-                              'key_questions_text', 'thesis_text',
-                              'insights_text', 'unresolved_text']:
+        if field_name not in NOTE_FIELDS:
             print(f"Error: Invalid field name {field_name}")
             return
 
         # Use f-string to safely insert the column name
         query = f"UPDATE items SET {field_name} = ? WHERE id = ?"
-        self.cursor.execute(query, (content, project_id))
+        self.cursor.execute(query, (encode_note(content), project_id))
+        self._update_note_links(project_id, field_name, content)
         self.conn.commit()
 
+    def _update_note_links(self, project_id, field_name, content):
+        """Applies only the difference between the field's stored links and its new ones."""
+        self.cursor.execute(
+            "SELECT target_name FROM note_links WHERE source_project_id = ? AND field = ?",
+            (project_id, field_name)
+        )
+        old_links = {row['target_name'] for row in self.cursor.fetchall()}
+        new_links = extract_wiki_links(content)
+
+        self.cursor.executemany(
+            "DELETE FROM note_links WHERE source_project_id = ? AND field = ? AND target_name = ?",
+            [(project_id, field_name, target) for target in old_links - new_links]
+        )
+        self.cursor.executemany(
+            "INSERT INTO note_links (source_project_id, field, target_name) VALUES (?, ?, ?)",
+            [(project_id, field_name, target) for target in new_links - old_links]
+        )
+
+    def get_backlinks(self, project_name):
+        """Projects whose notes contain [[project_name]]: rows of (id, name, field)."""
+        self.cursor.execute("""
+            SELECT i.id, i.name, l.field
+            FROM note_links l JOIN items i ON i.id = l.source_project_id
+            WHERE l.target_name = ? AND i.deleted_at IS NULL
+            ORDER BY i.name, l.field
+        """, (normalize_link_name(project_name),))
+        return self.cursor.fetchall()
+
     # --- END NEW FUNCTIONS ---
 
+    def get_item_tree(self):
+        """
+        Every class and project in one query, as {parent_id: [rows in display order]}
+        (root items under None). Used to build the whole home tree at once.
+        Items in the Trash are left out. Classes come with their item_counters
+        (project_count, assignment_count, notes_bytes; None for projects).
+        """
+        self.cursor.execute("""
+            SELECT i.id, i.parent_id, i.type, i.name, c.project_count, c.assignment_count, c.notes_bytes
+            FROM items i LEFT JOIN item_counters c ON c.item_id = i.id
+            WHERE i.deleted_at IS NULL
+            ORDER BY i.parent_id, i.display_order
+        """)
+        children = {}
+        for row in self.cursor.fetchall():
+            children.setdefault(row['parent_id'], []).append(dict(row))
+        return children
+
     def get_items(self, parent_id=None):
         """
         Get all items under a specific parent.
         If parent_id is None, gets root items (standalone projects and classes).
         """
-        query = "SELECT * FROM items WHERE parent_id IS ? ORDER BY display_order"
+        query = "SELECT * FROM items WHERE parent_id IS ? AND deleted_at IS NULL ORDER BY display_order"
         params = (parent_id,)
         if parent_id is None:
-            query = "SELECT * FROM items WHERE parent_id IS NULL ORDER BY display_order"
+            query = "SELECT * FROM items WHERE parent_id IS NULL AND deleted_at IS NULL ORDER BY display_order"
             params = ()
 
         self.cursor.execute(query, params)
@@ -202,8 +1106,19 @@ class DatabaseManager:
             self.cursor.execute("UPDATE items SET display_order = ? WHERE id = ?", (index, item_id))
         self.conn.commit()
 
+    def set_item_position(self, item_id, parent_id, display_order):
+        """Puts an item back under a given parent at a given display_order (used by undo)."""
+        self.cursor.execute(
+            "UPDATE items SET parent_id = ?, display_order = ? WHERE id = ?",
+            (parent_id, display_order, item_id)
+        )
+        self.conn.commit()
+
     def get_item_details(self, item_id):
-        """Get all details for a single item by its ID."""
+        """
+        Get all details for a single item by its ID.
+        Note fields come back as stored; read them with decode_note().
+        """
         self.cursor.execute("SELECT * FROM items WHERE id = ?", (item_id,))
         return self.cursor.fetchone()
 
@@ -211,22 +1126,168 @@ class DatabaseManager:
 
     def delete_item(self, item_id):
         """
-        Delete an item.
-        If it's a class, ON DELETE CASCADE will handle deleting its children.
+        Moves an item and everything under it to the Trash.
+        Only the deleted_at flag is set (one indexed UPDATE), so this is instant
+        however big the class is; the rows are removed later by purge_trash_chunk.
+        The millisecond timestamp also marks which rows were deleted together.
+        """
+        self.cursor.execute(f"""
+            {SUBTREE_CTE}
+            UPDATE items SET deleted_at = strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+            WHERE id IN (SELECT id FROM subtree) AND deleted_at IS NULL
+        """, (item_id,))
+        self.conn.commit()
+
+    def restore_item(self, item_id):
+        """
+        Takes an item out of the Trash together with the descendants that were
+        deleted along with it. If its class is still in the Trash it is restored
+        as a standalone item.
         """
-        self.cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
+        item = self.get_item_details(item_id)
+        if item is None or item['deleted_at'] is None:
+            return
+        self.cursor.execute(f"""
+            {SUBTREE_CTE}
+            UPDATE items SET deleted_at = NULL
+            WHERE id IN (SELECT id FROM subtree) AND deleted_at = ?
+        """, (item_id, item['deleted_at']))
+        if item['parent_id'] is not None:
+            parent = self.get_item_details(item['parent_id'])
+            if parent['deleted_at'] is not None:
+                self.cursor.execute("UPDATE items SET parent_id = NULL WHERE id = ?", (item_id,))
         self.conn.commit()
 
+    def get_trash_items(self):
+        """
+        The items deleted directly (not along with their class): rows of
+        (id, name, type, deleted_at, item_count), most recently deleted first.
+        """
+        self.cursor.execute(f"""
+            SELECT i.id, i.name, i.type, i.deleted_at,
+                   (SELECT COUNT(*) FROM items c WHERE c.parent_id = i.id AND c.deleted_at = i.deleted_at) + 1
+                       AS item_count
+            FROM items i LEFT JOIN items p ON p.id = i.parent_id
+            WHERE i.deleted_at IS NOT NULL AND (p.id IS NULL OR p.deleted_at IS NOT i.deleted_at)
+            ORDER BY i.deleted_at DESC, i.name
+        """)
+        return self.cursor.fetchall()
+
+    def purge_trash_chunk(self, item_id=None, limit=PURGE_CHUNK_ROWS):
+        """
+        Permanently deletes up to limit rows of trashed items (all of the Trash,
+        or just item_id's subtree) in one short transaction, and returns how many
+        rows went. Dependent rows go first and items leaves-first, so no chunk
+        triggers a large ON DELETE CASCADE. Call repeatedly until it returns 0.
+        """
+        if item_id is None:
+            scope, params = "SELECT id FROM items WHERE deleted_at IS NOT NULL", ()
+        else:
+            scope = f"{SUBTREE_CTE} SELECT s.id FROM subtree s JOIN items i ON i.id = s.id WHERE i.deleted_at IS NOT NULL"
+            params = (item_id,)
+
+        with self.conn:
+            for table, column in reversed(SUBTREE_TABLES.items()):
+                # note_links is WITHOUT ROWID, so rows are picked by its primary key
+                key = "source_project_id, field, target_name" if table == "note_links" else "rowid"
+                self.cursor.execute(f"""
+                    DELETE FROM {table} WHERE ({key}) IN (
+                        SELECT {key} FROM {table} WHERE {column} IN ({scope}) LIMIT ?
+                    )
+                """, params + (limit,))
+                if self.cursor.rowcount > 0:
+                    return self.cursor.rowcount
+
+            self.cursor.execute(f"""
+                DELETE FROM items WHERE id IN (
+                    SELECT id FROM items i
+                    WHERE id IN ({scope}) AND NOT EXISTS (SELECT 1 FROM items c WHERE c.parent_id = i.id)
+                    LIMIT ?
+                )
+            """, params + (limit,))
+            return max(self.cursor.rowcount, 0)
+
+    def iter_items(self, item_type=None, parent_id=None, trashed=False):
+        """
+        Yields classes and projects (without their notes) in tree order, one
+        row at a time: all of them, or only one type and/or the children of
+        parent_id. Trashed items instead of live ones if trashed is set.
+        """
+        conditions = ["deleted_at IS NOT NULL" if trashed else "deleted_at IS NULL"]
+        params = []
+        if item_type is not None:
+            conditions.append("type = ?")
+            params.append(item_type)
+        if parent_id is not None:
+            conditions.append("parent_id = ?")
+            params.append(parent_id)
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT id, parent_id, type, name, display_order, is_assignment, deleted_at
+            FROM items WHERE {" AND ".join(conditions)}
+            ORDER BY parent_id IS NOT NULL, parent_id, display_order, id
+        """, params)
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def search_names(self, query, limit=50):
+        """Live classes, projects and readings whose name or title contains query (case-insensitive)."""
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        self.cursor.execute("""
+            SELECT kind, id, name, project_id FROM (
+                SELECT type AS kind, id, name, NULL AS project_id
+                FROM items WHERE name LIKE :pattern ESCAPE '\\' AND deleted_at IS NULL
+                UNION ALL
+                SELECT 'reading', r.id, r.title, r.project_id
+                FROM readings r JOIN items p ON p.id = r.project_id
+                WHERE r.title LIKE :pattern ESCAPE '\\' AND p.deleted_at IS NULL
+            )
+            ORDER BY kind, name LIMIT :limit
+        """, {"pattern": pattern, "limit": limit})
+        return self.cursor.fetchall()
+
+    def get_library_stats(self):
+        """Counts and totals over the whole library, as a dict."""
+        stats = {}
+        self.cursor.execute("""
+            SELECT COALESCE(SUM(type = 'class'), 0) AS classes,
+                   COALESCE(SUM(type = 'project'), 0) AS projects,
+                   COALESCE(SUM(type = 'project' AND is_assignment), 0) AS assignments
+            FROM items WHERE deleted_at IS NULL
+        """)
+        stats.update(dict(self.cursor.fetchone()))
+        self.cursor.execute("SELECT COUNT(*) FROM items WHERE deleted_at IS NOT NULL")
+        stats['trashed_items'] = self.cursor.fetchone()[0]
+        self.cursor.execute("SELECT status, COUNT(*) FROM readings GROUP BY status")
+        stats['readings'] = {row[0]: row[1] for row in self.cursor.fetchall()}
+        self.cursor.execute(
+            "SELECT COALESCE(SUM(sessions), 0), COALESCE(SUM(pages), 0), COALESCE(SUM(seconds), 0) "
+            "FROM session_project_totals"
+        )
+        stats['sessions'], stats['pages_read'], stats['seconds_read'] = self.cursor.fetchone()
+        self.cursor.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM attachment_blobs")
+        stats['attachment_files'], stats['attachment_bytes'] = self.cursor.fetchone()
+        stats['files_to_index'] = self.count_open_extraction_jobs()
+        stats['database_bytes'] = self.conn.execute(
+            "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+        ).fetchone()[0]
+        stats['sync_site'] = self.get_sync_site()
+        stats['sync_version'] = self.get_sync_version()
+        return stats
+
     def get_all_classes(self):
         """Get a list of all classes, used for the 'Move' dialog."""
-        self.cursor.execute("SELECT id, name FROM items WHERE type = 'class' ORDER BY name")
+        self.cursor.execute("SELECT id, name FROM items WHERE type = 'class' AND deleted_at IS NULL ORDER BY name")
         return self.cursor.fetchall()
 
-    def duplicate_item(self, item_id, new_parent_id=None):
+    def duplicate_item(self, item_id, new_parent_id=None, progress=None):
         """
         Recursively duplicates an item (project or class).
         If new_parent_id is provided, it's used as the parent for the new copy.
         If not, the original's parent_id is used.
+        progress, if given, is called with the name of each item as it is copied.
         """
         # 1. Get original item's data
         original = self.get_item_details(item_id)
@@ -245,12 +1306,1367 @@ class DatabaseManager:
             original['is_assignment']
         )
 
+        if progress:
+            progress(original['name'])
+
         # 4. If it was a class, recursively duplicate its children
         if original['type'] == 'class':
             children = self.get_items(original['id'])
             for child in children:
                 # Pass the *new* class's ID as the new_parent_id
-                self.duplicate_item(child['id'], new_parent_id=new_id)
+                self.duplicate_item(child['id'], new_parent_id=new_id, progress=progress)
+
+        return new_id
+
+    # --- Readings ---
+
+    def add_reading(self, project_id, title, authors="", total_pages=None, status="Not Started", pages_read=0):
+        """Adds a reading to the end of a project's reading list."""
+        self.cursor.execute(
+            "SELECT MAX(display_order) FROM readings WHERE project_id = ?", (project_id,)
+        )
+        max_order = self.cursor.fetchone()[0]
+        new_order = 0 if max_order is None else max_order + 1
+
+        self.cursor.execute("""
+            INSERT INTO readings (project_id, title, authors, total_pages, status, pages_read, display_order)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (project_id, title, authors, total_pages, status, pages_read, new_order))
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def update_reading(self, reading_id, **fields):
+        """
+        Updates any of a reading's editable fields.
+        e.g. update_reading(5, status="Finished", pages_read=320)
+        """
+        columns = [name for name in fields if name in READING_FIELDS]
+        if not columns:
+            return
+
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        params = [fields[name] for name in columns] + [reading_id]
+        self.cursor.execute(f"UPDATE readings SET {assignments} WHERE id = ?", params)
+        self.conn.commit()
+
+    def delete_reading(self, reading_id):
+        """Delete a single reading."""
+        self.cursor.execute("DELETE FROM readings WHERE id = ?", (reading_id,))
+        self.conn.commit()
+
+    def get_reading(self, reading_id):
+        """Get all details for a single reading by its ID."""
+        self.cursor.execute("SELECT * FROM readings WHERE id = ?", (reading_id,))
+        return self.cursor.fetchone()
+
+    def count_readings(self, project_id):
+        """Number of readings in a project (answered from the index)."""
+        self.cursor.execute("SELECT COUNT(*) FROM readings WHERE project_id = ?", (project_id,))
+        return self.cursor.fetchone()[0]
+
+    def get_readings_page(self, project_id, after_order=None, after_id=None, limit=100):
+        """
+        Gets one page of a project's readings in display order.
+        Pages are keyed on the last (display_order, id) seen rather than an OFFSET,
+        so every page is a single index range scan no matter how deep it is.
+        """
+        if after_order is None:
+            self.cursor.execute("""
+                SELECT * FROM readings WHERE project_id = ?
+                ORDER BY display_order, id LIMIT ?
+            """, (project_id, limit))
+        else:
+            self.cursor.execute("""
+                SELECT * FROM readings
+                WHERE project_id = ? AND (display_order, id) > (?, ?)
+                ORDER BY display_order, id LIMIT ?
+            """, (project_id, after_order, after_id, limit))
+        return self.cursor.fetchall()
+
+    def get_reading_titles(self, project_id):
+        """Lightweight (id, title) list of a project's readings, used for reordering."""
+        self.cursor.execute("""
+            SELECT id, title FROM readings WHERE project_id = ?
+            ORDER BY display_order, id
+        """, (project_id,))
+        return self.cursor.fetchall()
+
+    def update_reading_order(self, ordered_reading_ids):
+        """Updates the display_order of readings to match the given list."""
+        self.cursor.executemany(
+            "UPDATE readings SET display_order = ? WHERE id = ?",
+            [(index, reading_id) for index, reading_id in enumerate(ordered_reading_ids)]
+        )
+        self.conn.commit()
+
+    # --- Reading Sessions ---
+
+    def add_reading_session(self, reading_id, started_at, ended_at, pages_read):
+        """
+        Logs a reading session and advances the reading's progress.
+        Timestamps are 'YYYY-MM-DD HH:MM:SS' strings; the rollup tables are
+        updated by triggers in the same transaction.
+        """
+        reading = self.get_reading(reading_id)
+        if not reading:
+            return None
+
+        self.cursor.execute("""
+            INSERT INTO reading_sessions (reading_id, project_id, started_at, ended_at, pages_read)
+            VALUES (?, ?, ?, ?, ?)
+        """, (reading_id, reading['project_id'], started_at, ended_at, pages_read))
+        session_id = self.cursor.lastrowid
+
+        self.cursor.execute("""
+            UPDATE readings
+            SET pages_read = pages_read + ?,
+                status = CASE WHEN status = 'Not Started' THEN 'Reading' ELSE status END
+            WHERE id = ?
+        """, (pages_read, reading_id))
+        self.conn.commit()
+        return session_id
+
+    def delete_reading_session(self, session_id):
+        """Removes a logged session (the rollups are adjusted by trigger)."""
+        self.cursor.execute("""
+            UPDATE readings
+            SET pages_read = MAX(0, pages_read - (SELECT pages_read FROM reading_sessions WHERE id = ?))
+            WHERE id = (SELECT reading_id FROM reading_sessions WHERE id = ?)
+        """, (session_id, session_id))
+        self.cursor.execute("DELETE FROM reading_sessions WHERE id = ?", (session_id,))
+        self.conn.commit()
+
+    def get_session_totals(self, project_id, day):
+        """
+        Reading totals for the dashboard, read straight from the rollup tables.
+
+        :param project_id: The project to summarize
+        :param day: The 'YYYY-MM-DD' date that counts as today
+        :return: dict of 'day', 'week', 'project', 'class' -> {pages, seconds, sessions}
+                 ('class' is None for standalone projects)
+        """
+        empty = {"pages": 0, "seconds": 0, "sessions": 0}
+
+        def totals(query, params):
+            self.cursor.execute(query, params)
+            row = self.cursor.fetchone()
+            if row is None or row['sessions'] is None:
+                return dict(empty)
+            return {"pages": row['pages'], "seconds": row['seconds'], "sessions": row['sessions']}
+
+        result = {
+            "day": totals(
+                "SELECT pages, seconds, sessions FROM session_daily_totals WHERE project_id = ? AND day = ?",
+                (project_id, day)
+            ),
+            "week": totals(
+                """SELECT pages, seconds, sessions FROM session_weekly_totals
+                   WHERE project_id = ? AND week_start = date(?, '-6 days', 'weekday 1')""",
+                (project_id, day)
+            ),
+            "project": totals(
+                "SELECT pages, seconds, sessions FROM session_project_totals WHERE project_id = ?",
+                (project_id,)
+            ),
+            "class": None
+        }
+
+        project = self.get_item_details(project_id)
+        if project and project['parent_id'] is not None:
+            result["class"] = totals("""
+                SELECT SUM(t.pages) AS pages, SUM(t.seconds) AS seconds, SUM(t.sessions) AS sessions
+                FROM items i JOIN session_project_totals t ON t.project_id = i.id
+                WHERE i.parent_id = ? AND i.deleted_at IS NULL
+            """, (project['parent_id'],))
+
+        return result
+
+    def get_session_rows(self, project_ids):
+        """
+        Bulk-loads the session history of several projects as plain tuples of
+        (reading_id, project_id, start_epoch, duration_seconds, pages_read),
+        ready to be turned into column arrays.
+        """
+        project_ids = list(project_ids)
+        if not project_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in project_ids)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # Plain tuples convert to arrays much faster
+        cursor.execute(f"""
+            SELECT reading_id, project_id,
+                   CAST(strftime('%s', started_at) AS INTEGER),
+                   CAST(ROUND((julianday(ended_at) - julianday(started_at)) * 86400) AS INTEGER),
+                   pages_read
+            FROM reading_sessions
+            WHERE project_id IN ({placeholders})
+        """, project_ids)
+        return cursor.fetchall()
+
+    def get_reading_progress_rows(self, project_ids):
+        """
+        Bulk-loads (reading_id, project_id, total_pages, pages_read) for several
+        projects; total_pages is 0 when unknown.
+        """
+        project_ids = list(project_ids)
+        if not project_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in project_ids)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT id, project_id, COALESCE(total_pages, 0), pages_read
+            FROM readings
+            WHERE project_id IN ({placeholders})
+        """, project_ids)
+        return cursor.fetchall()
+
+    # --- Export ---
+
+    def _export_scope(self, root_id):
+        """(CTE prefix, WHERE clause, params) selecting the live projects under root_id, or all of them."""
+        if root_id is None:
+            return "", "p.type = 'project' AND p.deleted_at IS NULL", ()
+        return SUBTREE_CTE, "p.id IN (SELECT id FROM subtree) AND p.type = 'project' AND p.deleted_at IS NULL", (root_id,)
+
+    def count_export_projects(self, root_id=None):
+        """Number of projects iter_export_projects(root_id) will yield."""
+        cte, where, params = self._export_scope(root_id)
+        self.cursor.execute(f"{cte} SELECT COUNT(*) FROM items p WHERE {where}", params)
+        return self.cursor.fetchone()[0]
+
+    def iter_export_projects(self, root_id=None):
+        """
+        Yields the live projects under root_id (a project, a class, or None for
+        the whole library) one row at a time: standalone projects first, then
+        each class's projects in tree order. Each row is the project's items
+        row plus class_name and its saved instructions (NULL where the project
+        never had any). Rows are fetched from a cursor of their own as the
+        caller asks for them, so only one project's notes are in memory at once.
+        """
+        cte, where, params = self._export_scope(root_id)
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            {cte}
+            SELECT p.*, c.name AS class_name,
+                   ins.key_questions_instr, ins.thesis_instr, ins.insights_instr, ins.unresolved_instr
+            FROM items p
+            LEFT JOIN items c ON c.id = p.parent_id
+            LEFT JOIN instructions ins ON ins.project_id = p.id
+            WHERE {where}
+            ORDER BY c.id IS NOT NULL, c.display_order, c.id, p.display_order, p.id
+        """, params)
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def iter_project_readings(self, project_id):
+        """Yields a project's readings in display order, one row at a time."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT * FROM readings WHERE project_id = ?
+            ORDER BY display_order, id
+        """, (project_id,))
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    # --- Reading attachments ---
+
+    def add_attachment(self, reading_id, sha256, size, filename, media_type=None):
+        """
+        Links a file already placed in the attachment store to a reading and
+        returns the attachment id. The blob's reference count is raised by trigger.
+        """
+        reading = self.get_reading(reading_id)
+        if reading is None:
+            raise LookupError("The reading no longer exists.")
+        with self.conn:
+            # The caller has just written (or found) the file, so a blob flagged missing is back
+            self.cursor.execute("""
+                INSERT INTO attachment_blobs (sha256, size, added_at) VALUES (?, ?, datetime('now', 'localtime'))
+                ON CONFLICT (sha256) DO UPDATE SET status = 'ok', verified_at = NULL WHERE status != 'ok'
+            """, (sha256, size))
+            self.cursor.execute("""
+                INSERT INTO reading_attachments (reading_id, project_id, sha256, filename, media_type, added_at)
+                VALUES (?, ?, ?, ?, ?, datetime('now', 'localtime'))
+            """, (reading_id, reading['project_id'], sha256, filename, media_type))
+            attachment_id = self.cursor.lastrowid
+            # Queued in the same transaction, so no attachment is ever left unindexed
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO extraction_jobs (sha256, filename, media_type, queued_at)
+                VALUES (?, ?, ?, datetime('now', 'localtime'))
+            """, (sha256, filename, media_type))
+            return attachment_id
+
+    def get_attachments(self, reading_id):
+        """A reading's attachments, oldest first, with their blob's size and integrity status."""
+        self.cursor.execute("""
+            SELECT a.id, a.reading_id, a.sha256, a.filename, a.media_type, a.added_at,
+                   b.size, b.status, b.verified_at
+            FROM reading_attachments a JOIN attachment_blobs b ON b.sha256 = a.sha256
+            WHERE a.reading_id = ? ORDER BY a.id
+        """, (reading_id,))
+        return self.cursor.fetchall()
+
+    def get_cover_attachments(self, reading_ids):
+        """
+        For each given reading with an image, PDF or EPUB attached, the first
+        such attachment: {reading_id: row of (sha256, media_type)}.
+        """
+        if not reading_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in reading_ids)
+        self.cursor.execute(f"""
+            SELECT reading_id, sha256, media_type, MIN(id) FROM reading_attachments
+            WHERE reading_id IN ({placeholders})
+              AND (media_type LIKE 'image/%' OR media_type IN ('application/pdf', 'application/epub+zip'))
+            GROUP BY reading_id
+        """, list(reading_ids))
+        return {row['reading_id']: row for row in self.cursor.fetchall()}
+
+    def get_attachment(self, attachment_id):
+        self.cursor.execute("""
+            SELECT a.*, b.size, b.status FROM reading_attachments a
+            JOIN attachment_blobs b ON b.sha256 = a.sha256 WHERE a.id = ?
+        """, (attachment_id,))
+        return self.cursor.fetchone()
+
+    def delete_attachment(self, attachment_id):
+        """Unlinks an attachment. Its file stays on disk until collect_garbage finds it unreferenced."""
+        self.cursor.execute("DELETE FROM reading_attachments WHERE id = ?", (attachment_id,))
+        self.conn.commit()
+
+    def get_unreferenced_blobs(self, limit=100):
+        """sha256 of blobs no attachment points at any more (from a partial index)."""
+        self.cursor.execute("SELECT sha256 FROM attachment_blobs WHERE ref_count <= 0 LIMIT ?", (limit,))
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def forget_blob(self, sha256):
+        """
+        Drops a blob's row if it is still unreferenced. Returns True when it
+        was dropped, i.e. its file may now be deleted from disk.
+        """
+        self.cursor.execute("DELETE FROM attachment_blobs WHERE sha256 = ? AND ref_count <= 0", (sha256,))
+        self.conn.commit()
+        return self.cursor.rowcount > 0
+
+    def get_blobs_to_verify(self, verified_before, limit=100):
+        """
+        Referenced blobs never checked, or last checked before verified_before,
+        as (sha256, size) rows, least recently checked first.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute("""
+            SELECT sha256, size FROM attachment_blobs
+            WHERE ref_count > 0 AND (verified_at IS NULL OR verified_at < ?)
+            ORDER BY verified_at LIMIT ?
+        """, (verified_before, limit))
+        return cursor.fetchall()
+
+    def mark_blob_verified(self, sha256, status):
+        """Records an integrity check result: 'ok', 'missing' or 'corrupt'."""
+        self.cursor.execute(
+            "UPDATE attachment_blobs SET status = ?, verified_at = datetime('now', 'localtime') WHERE sha256 = ?",
+            (status, sha256)
+        )
+        self.conn.commit()
+
+    # --- Attachment text extraction ---
+
+    def claim_extraction_jobs(self, limit):
+        """
+        Marks up to limit pending jobs as running and returns them
+        (sha256, filename, media_type), oldest first.
+        """
+        with self.conn:
+            self.cursor.execute("""
+                SELECT sha256, filename, media_type FROM extraction_jobs
+                WHERE status = 'pending' ORDER BY queued_at LIMIT ?
+            """, (limit,))
+            jobs = self.cursor.fetchall()
+            self.cursor.executemany(
+                "UPDATE extraction_jobs SET status = 'running', attempts = attempts + 1 WHERE sha256 = ?",
+                [(job['sha256'],) for job in jobs]
+            )
+        return jobs
+
+    def release_extraction_jobs(self, sha256s, attempt_failed=False):
+        """
+        Puts running jobs back in the queue: after a clean stop (the attempt is
+        not counted), or after a worker crash, in which case a job that has
+        crashed MAX_EXTRACTION_ATTEMPTS times is marked failed instead.
+        """
+        if attempt_failed:
+            query = f"""
+                UPDATE extraction_jobs SET
+                    status = CASE WHEN attempts >= {MAX_EXTRACTION_ATTEMPTS} THEN 'failed' ELSE 'pending' END,
+                    error = 'The extraction worker crashed'
+                WHERE sha256 = ? AND status = 'running'
+            """
+        else:
+            query = """
+                UPDATE extraction_jobs SET status = 'pending', attempts = MAX(attempts - 1, 0)
+                WHERE sha256 = ? AND status = 'running'
+            """
+        self.cursor.executemany(query, [(sha256,) for sha256 in sha256s])
+        self.conn.commit()
+
+    def release_all_running_extraction_jobs(self):
+        """Re-queues jobs left running when the app last stopped (resumes the queue after a restart)."""
+        self.cursor.execute("SELECT sha256 FROM extraction_jobs WHERE status = 'running'")
+        self.release_extraction_jobs([row[0] for row in self.cursor.fetchall()])
+
+    def save_extraction_result(self, sha256, chunks):
+        """
+        Replaces a blob's indexed text with chunks and completes its job, in
+        one transaction. Does nothing if the blob was removed meanwhile.
+        """
+        with self.conn:
+            self.cursor.execute("""
+                UPDATE extraction_jobs SET status = 'done', error = NULL, finished_at = datetime('now', 'localtime')
+                WHERE sha256 = ?
+            """, (sha256,))
+            if self.cursor.rowcount == 0:
+                return
+            self.cursor.execute("DELETE FROM attachment_chunks WHERE sha256 = ?", (sha256,))
+            self.cursor.executemany(
+                "INSERT INTO attachment_chunks (sha256, chunk_no, body) VALUES (?, ?, ?)",
+                [(sha256, chunk_no, body) for chunk_no, body in enumerate(chunks)]
+            )
+
+    def fail_extraction_job(self, sha256, error):
+        self.cursor.execute("""
+            UPDATE extraction_jobs SET status = 'failed', error = ?, finished_at = datetime('now', 'localtime')
+            WHERE sha256 = ?
+        """, (error, sha256))
+        self.conn.commit()
+
+    def count_open_extraction_jobs(self, pending_only=False):
+        """Jobs still pending (or running) - answered from a partial index."""
+        statuses = "'pending'" if pending_only else "'pending', 'running'"
+        self.cursor.execute(f"SELECT COUNT(*) FROM extraction_jobs WHERE status IN ({statuses})")
+        return self.cursor.fetchone()[0]
+
+    def search_attachment_text(self, query, limit=50):
+        """
+        Full-text search of the attached files. Every word of query must occur
+        (prefix matches count). Returns the best-matching attachments as dicts
+        of attachment_id, sha256, reading_id, title, project_id, project_name,
+        filename and a snippet of the matching text.
+        """
+        terms = ['"' + word.replace('"', '""') + '"*' for word in query.split()]
+        if not terms:
+            return []
+        # Best chunks first; each blob keeps the snippet of its best chunk
+        self.cursor.execute("""
+            SELECT c.sha256, snippet(attachment_text_fts, 0, '[', ']', '...', 12) AS snippet
+            FROM attachment_text_fts f JOIN attachment_chunks c ON c.id = f.rowid
+            WHERE attachment_text_fts MATCH ?
+            ORDER BY f.rank LIMIT ?
+        """, (" ".join(terms), limit * 10))
+        snippets = {}
+        for sha256, snippet in self.cursor.fetchall():
+            snippets.setdefault(sha256, snippet)
+        if not snippets:
+            return []
+
+        placeholders = ", ".join("?" for _ in snippets)
+        self.cursor.execute(f"""
+            SELECT a.id AS attachment_id, a.sha256, r.id AS reading_id, r.title, p.id AS project_id,
+                   p.name AS project_name, a.filename
+            FROM reading_attachments a
+            JOIN readings r ON r.id = a.reading_id
+            JOIN items p ON p.id = r.project_id
+            WHERE a.sha256 IN ({placeholders}) AND p.deleted_at IS NULL
+        """, list(snippets))
+        rank = {sha256: index for index, sha256 in enumerate(snippets)}
+        rows = sorted(self.cursor.fetchall(), key=lambda row: (rank[row['sha256']], row['attachment_id']))
+        return [dict(row, snippet=snippets[row['sha256']]) for row in rows[:limit]]
+
+    # --- Mindmaps ---
+
+    def get_mindmap_nodes(self, project_id):
+        """All nodes of a project's mindmap."""
+        self.cursor.execute(
+            "SELECT id, label, x, y, color FROM mindmap_nodes WHERE project_id = ?", (project_id,)
+        )
+        return self.cursor.fetchall()
+
+    def get_mindmap_edges(self, project_id):
+        """All edges of a project's mindmap."""
+        self.cursor.execute(
+            "SELECT id, source_id, target_id FROM mindmap_edges WHERE project_id = ?", (project_id,)
+        )
+        return self.cursor.fetchall()
+
+    def add_mindmap_node(self, project_id, label, x, y, color=None):
+        """Creates a mindmap node and returns its id."""
+        self.cursor.execute(
+            "INSERT INTO mindmap_nodes (project_id, label, x, y, color) VALUES (?, ?, ?, ?, ?)",
+            (project_id, label, x, y, color)
+        )
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def add_mindmap_edge(self, project_id, source_id, target_id):
+        """Connects two nodes and returns the new edge's id."""
+        self.cursor.execute(
+            "INSERT INTO mindmap_edges (project_id, source_id, target_id) VALUES (?, ?, ?)",
+            (project_id, source_id, target_id)
+        )
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def save_mindmap_changes(self, node_rows=(), deleted_edge_ids=(), deleted_node_ids=()):
+        """
+        Writes a batch of mindmap edits in a single transaction.
+
+        :param node_rows: (label, x, y, color, node_id) tuples of changed nodes
+        :param deleted_edge_ids: Edges to remove
+        :param deleted_node_ids: Nodes to remove (their edges cascade)
+        """
+        with self.conn:
+            self.cursor.executemany(
+                "UPDATE mindmap_nodes SET label = ?, x = ?, y = ?, color = ? WHERE id = ?",
+                node_rows
+            )
+            self.cursor.executemany(
+                "DELETE FROM mindmap_edges WHERE id = ?", [(edge_id,) for edge_id in deleted_edge_ids]
+            )
+            self.cursor.executemany(
+                "DELETE FROM mindmap_nodes WHERE id = ?", [(node_id,) for node_id in deleted_node_ids]
+            )
+
+    # --- Assignments ---
+
+    def update_assignment_status(self, item_id, is_assignment):
+        """
+        Marks a project as an assignment (or not). Turning it off keeps the
+        assignment details, so turning it back on restores them; queries
+        over assignments skip projects whose flag is off.
+        """
+        self.cursor.execute("UPDATE items SET is_assignment = ? WHERE id = ?", (is_assignment, item_id))
+        if is_assignment:
+            self.cursor.execute("INSERT OR IGNORE INTO assignments (project_id) VALUES (?)", (item_id,))
+        self.conn.commit()
+
+    def get_or_create_assignment(self, project_id):
+        """Gets a project's assignment details, creating an empty row if needed."""
+        self.cursor.execute("INSERT OR IGNORE INTO assignments (project_id) VALUES (?)", (project_id,))
+        self.conn.commit()
+        self.cursor.execute("SELECT * FROM assignments WHERE project_id = ?", (project_id,))
+        return self.cursor.fetchone()
+
+    def get_assignment(self, project_id):
+        """The assignment row joined with its project name, or None."""
+        self.cursor.execute("""
+            SELECT a.*, i.name FROM assignments a JOIN items i ON i.id = a.project_id
+            WHERE a.project_id = ?
+        """, (project_id,))
+        return self.cursor.fetchone()
+
+    def update_assignment(self, project_id, **fields):
+        """
+        Updates the given assignment fields (see ASSIGNMENT_FIELDS).
+        Changing the due date or reminder offset re-arms the reminder.
+        """
+        fields = {name: value for name, value in fields.items() if name in ASSIGNMENT_FIELDS}
+        if not fields:
+            return
+        assignments = ", ".join(f"{name} = :{name}" for name in fields)
+        timing = [f"{name} IS :{name}" for name in ("due_at", "remind_minutes_before") if name in fields]
+        if timing:
+            # SET expressions see the old values, so this only clears reminded_at on a real change
+            assignments += f", reminded_at = CASE WHEN {' AND '.join(timing)} THEN reminded_at ELSE NULL END"
+        fields["project_id"] = project_id
+        self.cursor.execute(f"UPDATE assignments SET {assignments} WHERE project_id = :project_id", fields)
+        self.conn.commit()
+
+    def get_pending_reminders(self, project_id=None):
+        """
+        Assignments whose reminder has not fired yet: rows of
+        (project_id, name, due_at, remind_at), earliest first.
+        Pass project_id to check a single assignment.
+        """
+        project_filter = "" if project_id is None else "AND a.project_id = ?"
+        self.cursor.execute(f"""
+            SELECT a.project_id, i.name, a.due_at,
+                   datetime(a.due_at, '-' || a.remind_minutes_before || ' minutes') AS remind_at
+            FROM assignments a JOIN items i ON i.id = a.project_id
+            WHERE i.is_assignment = 1
+              AND a.due_at IS NOT NULL AND a.remind_minutes_before IS NOT NULL
+              AND a.reminded_at IS NULL AND a.status IN ('Not Started', 'In Progress')
+              AND a.due_at > datetime('now', 'localtime') AND i.deleted_at IS NULL {project_filter}
+            ORDER BY remind_at
+        """, () if project_id is None else (project_id,))
+        return self.cursor.fetchall()
+
+    def get_assignments_between(self, start, end):
+        """
+        Assignments due in [start, end) ('YYYY-MM-DD HH:MM:SS' strings), served
+        by the due_at index: rows of (project_id, name, class_name, due_at, status).
+        """
+        self.cursor.execute("""
+            SELECT a.project_id, i.name, c.name AS class_name, a.due_at, a.status
+            FROM assignments a
+            JOIN items i ON i.id = a.project_id
+            LEFT JOIN items c ON c.id = i.parent_id
+            WHERE a.due_at >= ? AND a.due_at < ? AND i.is_assignment = 1 AND i.deleted_at IS NULL
+            ORDER BY a.due_at
+        """, (start, end))
+        return self.cursor.fetchall()
+
+    def get_assignment_date_range(self):
+        """(earliest, latest) due_at over all assignments, or (None, None)."""
+        self.cursor.execute("""
+            SELECT MIN(a.due_at) AS first, MAX(a.due_at) AS last
+            FROM assignments a JOIN items i ON i.id = a.project_id
+            WHERE i.is_assignment = 1 AND i.deleted_at IS NULL
+        """)
+        row = self.cursor.fetchone()
+        return row['first'], row['last']
+
+    def mark_assignment_reminded(self, project_id, reminded_at):
+        self.cursor.execute(
+            "UPDATE assignments SET reminded_at = ? WHERE project_id = ?", (reminded_at, project_id)
+        )
+        self.conn.commit()
+
+    # --- Connections ---
+
+    def add_connection(self, key_a, key_b, label=""):
+        """Links two nodes (in either order). Returns the connection id, or None for a self-link."""
+        if key_a == key_b:
+            return None
+        source_key, target_key = sorted((key_a, key_b))
+        self.cursor.execute("""
+            INSERT INTO connections (source_key, target_key, label) VALUES (?, ?, ?)
+            ON CONFLICT (source_key, target_key) DO UPDATE SET label = excluded.label
+        """, (source_key, target_key, label))
+        self.conn.commit()
+        self.cursor.execute(
+            "SELECT id FROM connections WHERE source_key = ? AND target_key = ?", (source_key, target_key)
+        )
+        return self.cursor.fetchone()['id']
+
+    def delete_connection(self, connection_id):
+        self.cursor.execute("DELETE FROM connections WHERE id = ?", (connection_id,))
+        self.conn.commit()
+
+    def get_connection_neighbors(self, node_key):
+        """Every node directly linked to node_key (outside the Trash): rows of (id, neighbor_key, label)."""
+        self.cursor.execute(f"""
+            SELECT id, target_key AS neighbor_key, label FROM connections
+            WHERE source_key = ? AND {live_node_sql('target_key')}
+            UNION ALL
+            SELECT id, source_key AS neighbor_key, label FROM connections
+            WHERE target_key = ? AND {live_node_sql('source_key')}
+        """, (node_key, node_key))
+        return self.cursor.fetchall()
+
+    def get_reachable_nodes(self, node_key, max_hops=2):
+        """
+        Every node within max_hops links of node_key (including itself at 0),
+        as rows of (node_key, hops) with the shortest hop count. Trashed nodes
+        are neither listed nor walked through.
+        """
+        self.cursor.execute(f"""
+            WITH RECURSIVE reach(node_key, hops) AS (
+                SELECT ?, 0
+                UNION
+                SELECT c.target_key, r.hops + 1
+                FROM reach r JOIN connections c ON c.source_key = r.node_key
+                WHERE r.hops < ? AND {live_node_sql('c.target_key')}
+                UNION
+                SELECT c.source_key, r.hops + 1
+                FROM reach r JOIN connections c ON c.target_key = r.node_key
+                WHERE r.hops < ? AND {live_node_sql('c.source_key')}
+            )
+            SELECT node_key, MIN(hops) AS hops FROM reach GROUP BY node_key ORDER BY hops, node_key
+        """, (node_key, max_hops, max_hops))
+        return self.cursor.fetchall()
+
+    def get_connections_among(self, node_keys):
+        """Connections with both endpoints in node_keys: rows of (id, source_key, target_key, label)."""
+        node_keys = list(node_keys)
+        if not node_keys:
+            return []
+        placeholders = ", ".join("?" for _ in node_keys)
+        self.cursor.execute(f"""
+            SELECT id, source_key, target_key, label FROM connections
+            WHERE source_key IN ({placeholders}) AND target_key IN ({placeholders})
+        """, node_keys + node_keys)
+        return self.cursor.fetchall()
+
+    def _neighbor_keys(self, node_keys):
+        """Maps each of node_keys to the set of its neighbours outside the Trash, in batched lookups."""
+        neighbors = {key: set() for key in node_keys}
+        node_keys = list(node_keys)
+        for start in range(0, len(node_keys), 400):
+            batch = node_keys[start:start + 400]
+            placeholders = ", ".join("?" for _ in batch)
+            self.cursor.execute(f"""
+                SELECT source_key, target_key FROM connections
+                WHERE source_key IN ({placeholders}) AND {live_node_sql('target_key')}
+                UNION ALL
+                SELECT target_key, source_key FROM connections
+                WHERE target_key IN ({placeholders}) AND {live_node_sql('source_key')}
+            """, batch + batch)
+            for key, neighbor in self.cursor.fetchall():
+                neighbors[key].add(neighbor)
+        return neighbors
+
+    def find_connection_path(self, start_key, end_key, max_hops=8):
+        """
+        Shortest chain of links from start_key to end_key, as a list of node keys,
+        or None if they are not connected within max_hops.
+
+        Runs a breadth-first search from both ends at once, always expanding the
+        smaller frontier with one batched query.
+        """
+        if start_key == end_key:
+            return [start_key]
+        parents = ({start_key: None}, {end_key: None})
+        frontiers = ({start_key}, {end_key})
+
+        for _ in range(max_hops):
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            if not frontiers[side]:
+                return None
+            seen, other = parents[side], parents[1 - side]
+            next_frontier = set()
+            for key, neighbors in self._neighbor_keys(frontiers[side]).items():
+                for neighbor in neighbors:
+                    if neighbor in seen:
+                        continue
+                    seen[neighbor] = key
+                    if neighbor in other:
+                        return self._join_paths(parents, neighbor, side)
+                    next_frontier.add(neighbor)
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        return None
+
+    @staticmethod
+    def _join_paths(parents, meeting_key, side):
+        """Builds start -> end from the two BFS parent maps meeting at meeting_key."""
+        forward, backward = parents
+        path = []
+        key = meeting_key
+        while key is not None:
+            path.append(key)
+            key = forward[key]
+        path.reverse()
+        key = backward[meeting_key]
+        while key is not None:
+            path.append(key)
+            key = backward[key]
+        return path
+
+    def get_node_labels(self, node_keys):
+        """Human-readable names for node keys: {key: label}. Unknown and trashed keys are left out."""
+        project_ids, reading_ids = set(), set()
+        for key in node_keys:
+            kind, item_id, _ = parse_node_key(key)
+            (reading_ids if kind == "reading" else project_ids).add(item_id)
+
+        names = {}
+        queries = (
+            ("items", project_ids, "SELECT id, name FROM items WHERE deleted_at IS NULL AND id IN ({})"),
+            ("readings", reading_ids, """
+                SELECT r.id, r.title FROM readings r JOIN items p ON p.id = r.project_id
+                WHERE p.deleted_at IS NULL AND r.id IN ({})
+            """),
+        )
+        for table, ids, query in queries:
+            ids = list(ids)
+            for start in range(0, len(ids), 400):
+                batch = ids[start:start + 400]
+                self.cursor.execute(query.format(", ".join("?" for _ in batch)), batch)
+                names.update({(table, row[0]): row[1] for row in self.cursor.fetchall()})
+
+        labels = {}
+        for key in node_keys:
+            kind, item_id, field = parse_node_key(key)
+            name = names.get(("readings" if kind == "reading" else "items", item_id))
+            if name is None:
+                continue
+            labels[key] = f"{name}: {NOTE_FIELDS.get(field, field)}" if kind == "note" else name
+        return labels
+
+    def get_all_projects(self):
+        """Every project with its class name (None for standalone projects), for pickers."""
+        self.cursor.execute("""
+            SELECT p.id, p.name, c.name AS class_name
+            FROM items p LEFT JOIN items c ON c.id = p.parent_id
+            WHERE p.type = 'project' AND p.deleted_at IS NULL
+            ORDER BY COALESCE(c.name, ''), p.name
+        """)
+        return self.cursor.fetchall()
+
+    def get_project_node_options(self, project_id):
+        """The connectable nodes of one project: [(node_key, label)] for it, its notes and its readings."""
+        options = [(make_node_key("project", project_id), "(Project)")]
+        options += [(make_node_key("note", project_id, field), f"Note: {label}") for field, label in NOTE_FIELDS.items()]
+        self.cursor.execute(
+            "SELECT id, title FROM readings WHERE project_id = ? ORDER BY display_order, id", (project_id,)
+        )
+        options += [(make_node_key("reading", row['id']), f"Reading: {row['title']}") for row in self.cursor.fetchall()]
+        return options
+
+    # --- Graph analytics snapshot ---
+
+    def get_graph_version(self):
+        self.cursor.execute("SELECT graph_version FROM graph_state WHERE id = 1")
+        return self.cursor.fetchone()['graph_version']
+
+    def get_graph_snapshot(self):
+        """
+        Bulk-exports everything the graph analytics need, as lists of plain tuples:
+        connections (source_key, target_key), readings (id, project_id, title)
+        and projects (id, name, class_id or 0, class_name or ''). Whatever is in
+        the Trash is left out.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT source_key, target_key FROM connections
+            WHERE {live_node_sql('source_key')} AND {live_node_sql('target_key')}
+        """)
+        connections = cursor.fetchall()
+        cursor.execute("""
+            SELECT r.id, r.project_id, r.title
+            FROM readings r JOIN items p ON p.id = r.project_id
+            WHERE p.deleted_at IS NULL
+        """)
+        readings = cursor.fetchall()
+        cursor.execute("""
+            SELECT p.id, p.name, COALESCE(c.id, 0), COALESCE(c.name, '')
+            FROM items p LEFT JOIN items c ON c.id = p.parent_id
+            WHERE p.type = 'project' AND p.deleted_at IS NULL
+        """)
+        projects = cursor.fetchall()
+        return connections, readings, projects
+
+    def get_analytics_cache(self, name):
+        """Returns (graph_version, payload) of a cached result, or None."""
+        self.cursor.execute("SELECT graph_version, payload FROM analytics_cache WHERE name = ?", (name,))
+        row = self.cursor.fetchone()
+        return (row['graph_version'], row['payload']) if row else None
+
+    def save_analytics_cache(self, name, graph_version, payload):
+        self.cursor.execute("""
+            INSERT INTO analytics_cache (name, graph_version, payload) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET graph_version = excluded.graph_version, payload = excluded.payload
+        """, (name, graph_version, payload))
+        self.conn.commit()
+
+    # --- Idle maintenance ---
+
+    def maintenance_due(self):
+        """True if no maintenance pass ran in the last MAINTENANCE_INTERVAL_HOURS."""
+        self.cursor.execute("SELECT MAX(ran_at) FROM maintenance_log WHERE step = 'optimize'")
+        last = self.cursor.fetchone()[0]
+        self.cursor.execute(
+            "SELECT ? IS NULL OR ? < datetime('now', 'localtime', ?)",
+            (last, last, f"-{MAINTENANCE_INTERVAL_HOURS} hours")
+        )
+        return bool(self.cursor.fetchone()[0])
+
+    def plan_maintenance(self):
+        """The steps of one maintenance pass, cheapest first."""
+        steps = ["optimize"]
+        self.cursor.execute("SELECT MAX(ran_at) FROM maintenance_log WHERE step LIKE 'analyze %'")
+        last_analyze = self.cursor.fetchone()[0]
+        self.cursor.execute(
+            "SELECT ? IS NULL OR ? < datetime('now', 'localtime', ?)",
+            (last_analyze, last_analyze, f"-{ANALYZE_INTERVAL_DAYS} days")
+        )
+        if self.cursor.fetchone()[0]:
+            self.cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )
+            steps += [f"analyze {row['name']}" for row in self.cursor.fetchall()]
+        steps += ["compress_notes", "prune_change_log", "incremental_vacuum", "checkpoint"]
+        return steps
+
+    def run_maintenance(self, budget_ms=MAINTENANCE_BUDGET_MS, force=False):
+        """
+        Runs maintenance steps until about budget_ms has been spent, and returns
+        True if more are pending (call again on the next idle moment). With
+        force, a new pass is planned even if the last one was recent.
+
+        A pass (planned at most every MAINTENANCE_INTERVAL_HOURS) is PRAGMA
+        optimize, a sampled ANALYZE of one table per step (weekly), compression
+        of large notes, pruning of old change_log rows, incremental vacuum
+        slices sized to fit the time box, and a WAL checkpoint.
+        Steps never wait for locks: if another connection is writing, the
+        step is simply retried later. Each step is logged in maintenance_log.
+        """
+        queue = self._maintenance_queue
+        if not queue:
+            if not force and not self.maintenance_due():
+                return False
+            queue.extend(self.plan_maintenance())
+
+        deadline = time.perf_counter() + budget_ms / 1000
+        self.maintenance_blocked = False
+        self.conn.execute("PRAGMA busy_timeout = 0")
+        try:
+            while queue and time.perf_counter() < deadline:
+                if self._run_maintenance_step(queue[0], budget_ms):
+                    queue.popleft()
+        except sqlite3.OperationalError as e:
+            # Drop the step's partial work, so the retry starts clean and the
+            # connection holds no locks meanwhile
+            self.conn.rollback()
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            self.maintenance_blocked = True
+        finally:
+            self.conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        return bool(queue)
+
+    def incremental_vacuum_pending(self):
+        """True if this file predates auto_vacuum=INCREMENTAL and still needs enable_incremental_vacuum()."""
+        # Reading the schema first makes this connection notice a conversion done by another one
+        self.conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        return self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2
+
+    def enable_incremental_vacuum(self, progress=None, should_stop=None):
+        """
+        One-time switch to auto_vacuum=INCREMENTAL, so free pages can later be
+        returned to the file system a few at a time (see run_maintenance).
+        The mode only takes effect through a full VACUUM, which rewrites the
+        whole file and holds the write lock until it is done, so run it off the
+        Tk thread while the user is away.
+
+        :param progress: Called with the seconds spent so far, about once a second
+        :param should_stop: Polled while the VACUUM runs; returning True abandons it
+            (sqlite3.OperationalError "interrupted") and leaves the file as it was
+        """
+        started = time.perf_counter()
+        reported = [started]
+
+        def check():
+            now = time.perf_counter()
+            if progress is not None and now - reported[0] >= 1:
+                reported[0] = now
+                progress(round(now - started))
+            return bool(should_stop and should_stop())
+
+        self.conn.commit()  # VACUUM cannot run inside a transaction
+        self.conn.set_progress_handler(check, VACUUM_PROGRESS_OPCODES)
+        try:
+            self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self.conn.execute("VACUUM")
+        finally:
+            self.conn.set_progress_handler(None, 0)
+
+    def _run_maintenance_step(self, step, budget_ms):
+        """Runs (a slice of) one step and logs it. Returns True once the step is finished."""
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        free_before = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        finished = True
+        started = time.perf_counter()
+
+        self.conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        if step == "optimize":
+            self.conn.execute("PRAGMA optimize")
+        elif step.startswith("analyze "):
+            self.conn.execute(f'ANALYZE "{step.split(" ", 1)[1]}"')
+        elif step == "compress_notes":
+            finished = self._compress_large_notes()
+        elif step == "prune_change_log":
+            finished = self._prune_change_log()
+        elif step == "incremental_vacuum":
+            if free_before < VACUUM_MIN_FREE_PAGES:
+                return True
+            # Grow or shrink the slice so one fits comfortably in the time box
+            pages = self._vacuum_slice_pages
+            # Each step of this pragma frees one page and it returns no rows, so it has to be
+            # run to completion with executescript rather than execute
+            self.conn.executescript(f"PRAGMA incremental_vacuum({pages});")
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._vacuum_slice_pages = max(16, min(4096, pages * 2 if elapsed_ms < budget_ms / 2 else pages // 2))
+            finished = self.conn.execute("PRAGMA freelist_count").fetchone()[0] < VACUUM_MIN_FREE_PAGES
+        elif step == "checkpoint":
+            # Copies the WAL back and shrinks it; gives up at once if a reader is busy
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        self.conn.commit()
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        free_after = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        self.cursor.execute("""
+            INSERT INTO maintenance_log (ran_at, step, duration_ms, bytes_reclaimed)
+            VALUES (datetime('now', 'localtime'), ?, ?, ?)
+        """, (step, round(duration_ms, 2), max(0, free_before - free_after) * page_size))
+        self.cursor.execute(
+            "DELETE FROM maintenance_log WHERE id <= (SELECT MAX(id) FROM maintenance_log) - ?",
+            (MAINTENANCE_LOG_ROWS,)
+        )
+        self.conn.commit()
+        return finished
+
+    def _compress_large_notes(self):
+        """
+        Compresses the large notes of up to NOTE_COMPRESS_BATCH projects that were
+        saved as plain text (before compression existed). Works through the items
+        by id across calls; returns True once it has reached the end.
+        """
+        large = " OR ".join(
+            f"(typeof({field}) = 'text' AND length(CAST({field} AS BLOB)) >= {NOTE_COMPRESS_MIN_BYTES})"
+            for field in NOTE_FIELDS
+        )
+        self.cursor.execute(
+            f"SELECT id, {', '.join(NOTE_FIELDS)} FROM items WHERE id > ? AND ({large}) ORDER BY id LIMIT ?",
+            (self._compress_after_id, NOTE_COMPRESS_BATCH)
+        )
+        rows = self.cursor.fetchall()
+        # Same text, new encoding: not an edit as far as sync is concerned
+        self.cursor.execute("UPDATE sync_state SET applying = 1")
+        try:
+            for row in rows:
+                encoded = {field: encode_note(row[field]) for field in NOTE_FIELDS if isinstance(row[field], str)}
+                # Values that don't shrink stay as text
+                changed = {field: value for field, value in encoded.items() if isinstance(value, bytes)}
+                if changed:
+                    assignments = ", ".join(f"{field} = ?" for field in changed)
+                    self.cursor.execute(f"UPDATE items SET {assignments} WHERE id = ?", (*changed.values(), row['id']))
+        finally:
+            # Left set, the triggers would stop recording the user's own edits
+            self.cursor.execute("UPDATE sync_state SET applying = 0")
+
+        if len(rows) < NOTE_COMPRESS_BATCH:
+            self._compress_after_id = 0
+            return True
+        self._compress_after_id = rows[-1]['id']
+        return False
+
+    def _prune_change_log(self):
+        """
+        Deletes up to CHANGE_LOG_PRUNE_ROWS change_log rows written before the
+        newest mark older than CHANGE_LOG_RETENTION_HOURS. A ChangeWatcher only
+        asks for the rows since its last check, seconds ago, so these are never
+        read again. Once they are gone, marks the current end of the log and
+        returns True.
+        """
+        cutoff = f"-{CHANGE_LOG_RETENTION_HOURS} hours"
+        self.cursor.execute(
+            "SELECT MAX(version) FROM change_log_marks WHERE marked_at < datetime('now', 'localtime', ?)",
+            (cutoff,)
+        )
+        expired = self.cursor.fetchone()[0]
+        if expired is not None:
+            self.cursor.execute("""
+                DELETE FROM change_log WHERE version IN (
+                    SELECT version FROM change_log WHERE version <= ? ORDER BY version LIMIT ?
+                )
+            """, (expired, CHANGE_LOG_PRUNE_ROWS))
+            if self.cursor.rowcount == CHANGE_LOG_PRUNE_ROWS:
+                return False
+            self.cursor.execute(
+                "DELETE FROM change_log_marks WHERE marked_at < datetime('now', 'localtime', ?)", (cutoff,)
+            )
+        self.cursor.execute("""
+            INSERT INTO change_log_marks (marked_at, version)
+            SELECT datetime('now', 'localtime'), COALESCE(MAX(version), 0) FROM change_log
+        """)
+        return True
+
+    def get_maintenance_log(self, limit=50):
+        """The most recent maintenance steps, newest first."""
+        self.cursor.execute("SELECT * FROM maintenance_log ORDER BY id DESC LIMIT ?", (limit,))
+        return self.cursor.fetchall()
+
+    # --- Sync ---
+
+    def get_sync_site(self):
+        """This database's sync identity (see _check_sync_site)."""
+        self.cursor.execute("SELECT site_id FROM sync_state WHERE id = 1")
+        return self.cursor.fetchone()[0]
+
+    def get_sync_watermark(self):
+        """
+        The version local changes need exporting after: everything up to it has
+        been imported by every known peer (0 until a peer has confirmed anything).
+        """
+        self.cursor.execute("SELECT COALESCE(MIN(acked_version), 0) FROM sync_peers")
+        return self.cursor.fetchone()[0]
+
+    def get_sync_acks(self):
+        """{peer site id: the highest of its versions imported here}, sent back with each export."""
+        self.cursor.execute("SELECT site_id, imported_version FROM sync_peers")
+        return {row['site_id']: row['imported_version'] for row in self.cursor.fetchall()}
+
+    def get_sync_version(self):
+        """The local change counter: every logged change so far has a version up to this."""
+        self.cursor.execute("SELECT version FROM sync_state WHERE id = 1")
+        return self.cursor.fetchone()[0]
+
+    def _sync_uid(self, table, row_id):
+        self.cursor.execute("SELECT uid FROM sync_ids WHERE table_name = ? AND row_id = ?", (table, row_id))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def _sync_row_id(self, table, uid):
+        self.cursor.execute("SELECT row_id FROM sync_ids WHERE table_name = ? AND uid = ?", (table, uid))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _node_key_table(kind):
+        return "readings" if kind == "reading" else "items"
+
+    def _sync_export_value(self, target, value):
+        """A field value as sent to another database: references become uids, notes plain text."""
+        if value is None or target is None:
+            return decode_note(value)
+        if target == SYNC_NODE_KEY:
+            kind, item_id, field = parse_node_key(value)
+            uid = self._sync_uid(self._node_key_table(kind), item_id)
+            return f"{kind}:{uid}:{field}" if field else f"{kind}:{uid}"
+        return self._sync_uid(target, value)
+
+    def _sync_local_value(self, target, value):
+        """The reverse of _sync_export_value; raises LookupError for a reference to a row not here (yet)."""
+        if value is None or target is None:
+            return value
+        if target == SYNC_NODE_KEY:
+            parts = value.split(":")
+            local_id = self._sync_row_id(self._node_key_table(parts[0]), parts[1])
+            if local_id is None:
+                raise LookupError(value)
+            return make_node_key(parts[0], local_id, parts[2] if len(parts) > 2 else None)
+        local_id = self._sync_row_id(target, value)
+        if local_id is None:
+            raise LookupError(value)
+        return local_id
+
+    def iter_sync_changes(self, since_version, until_version):
+        """
+        Yields this database's own changes with a version in (since_version,
+        until_version], one dict per row and table order (parents first):
+        {'table', 'uid', 'fields': {column: [value, changed_at]}, 'deleted': changed_at or None}.
+        Field values are read as they are now; a row changed many times is sent once.
+        """
+        table_order = " ".join(f"WHEN '{table}' THEN {index}" for index, table in enumerate(SYNC_TABLES))
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT l.table_name, l.row_id, l.field, l.changed_at, s.uid
+            FROM sync_log l
+            JOIN sync_ids s ON s.table_name = l.table_name AND s.row_id = l.row_id
+            WHERE l.version > ? AND l.version <= ? AND l.origin = ?
+            ORDER BY CASE l.table_name {table_order} END, l.row_id
+        """, (since_version, until_version, self.get_sync_site()))
+        try:
+            current = None
+            for table, row_id, field, changed_at, uid in cursor:
+                if current is None or (current['table'], current['row_id']) != (table, row_id):
+                    if current is not None:
+                        yield self._finish_sync_change(current)
+                    current = {'table': table, 'row_id': row_id, 'uid': uid, 'changed': {}, 'deleted': None}
+                if field == SYNC_TOMBSTONE:
+                    current['deleted'] = changed_at
+                else:
+                    current['changed'][field] = changed_at
+            if current is not None:
+                yield self._finish_sync_change(current)
+        finally:
+            cursor.close()
+
+    def _finish_sync_change(self, change):
+        table, row_id = change.pop('table'), change.pop('row_id')
+        changed = change.pop('changed')
+        key, columns = SYNC_TABLES[table]
+        change['table'] = table
+        change['fields'] = {}
+        if changed and change['deleted'] is None:
+            self.cursor.execute(f"SELECT {', '.join(changed)} FROM {table} WHERE {key} = ?", (row_id,))
+            row = self.cursor.fetchone()
+            for column in changed:
+                change['fields'][column] = [self._sync_export_value(columns[column], row[column]), changed[column]]
+        return change
+
+    def apply_sync_changes(self, header, changes, progress=None):
+        """
+        Applies the changes exported by another copy of this database, in one
+        transaction. Each field is resolved on its own, last writer wins: the
+        incoming value is taken if it was written later than the local one
+        (ties broken by site id). A deleted row stays deleted unless it was
+        fully re-created after the delete. Rows referring to rows that aren't
+        here, or that conflict with a constraint, are skipped. progress, if
+        given, is called with the number of rows handled so far. Returns counts
+        by outcome.
+        """
+        site = header['site']
+        stats = {'inserted': 0, 'updated': 0, 'deleted': 0, 'kept_local': 0, 'skipped': 0}
+        with self.conn:
+            self.cursor.execute("UPDATE sync_state SET applying = 1")
+            deferred = []  # Rows referring to rows that come later in the file
+            for count, change in enumerate(changes, 1):
+                if not self._try_apply_sync_change(site, change, stats):
+                    deferred.append(change)
+                if progress:
+                    progress(count)
+            while deferred:
+                waiting = deferred
+                deferred = [change for change in waiting if not self._try_apply_sync_change(site, change, stats)]
+                if len(deferred) == len(waiting):
+                    stats['skipped'] += len(deferred)
+                    break
+
+            self.cursor.execute("""
+                INSERT INTO sync_peers (site_id, imported_version, acked_version, last_import_at)
+                VALUES (?, ?, ?, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'))
+                ON CONFLICT (site_id) DO UPDATE SET
+                    imported_version = MAX(imported_version, excluded.imported_version),
+                    acked_version = MAX(acked_version, excluded.acked_version),
+                    last_import_at = excluded.last_import_at
+            """, (site, header['version'], header['acks'].get(self.get_sync_site(), 0)))
+            self.cursor.execute("UPDATE sync_state SET applying = 0")
+        return stats
+
+    def _try_apply_sync_change(self, site, change, stats):
+        """Applies one row; returns False if it refers to a row that isn't here yet."""
+        try:
+            self._apply_sync_change(site, change, stats)
+        except LookupError:
+            return False
+        except sqlite3.IntegrityError as e:
+            print(f"Sync: skipped {change['table']} {change['uid']}: {e}")
+            stats['skipped'] += 1
+        return True
+
+    def _sync_clock(self, table, row_id):
+        """{field: (changed_at, origin)} of a local row, including any tombstone."""
+        self.cursor.execute(
+            "SELECT field, changed_at, origin FROM sync_log WHERE table_name = ? AND row_id = ?", (table, row_id)
+        )
+        return {row['field']: (row['changed_at'], row['origin']) for row in self.cursor.fetchall()}
+
+    def _set_sync_clock(self, table, row_id, field, changed_at, origin):
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO sync_log (table_name, row_id, field, version, changed_at, origin)
+            VALUES (?, ?, ?, 0, ?, ?)
+        """, (table, row_id, field, changed_at, origin))
+
+    def _apply_sync_change(self, site, change, stats):
+        table, uid = change['table'], change['uid']
+        key, columns = SYNC_TABLES[table]
+        row_id = self._sync_row_id(table, uid)
+        exists = False
+        if row_id is not None:
+            self.cursor.execute(f"SELECT 1 FROM {table} WHERE {key} = ?", (row_id,))
+            exists = self.cursor.fetchone() is not None
+        clock = self._sync_clock(table, row_id) if row_id is not None else {}
+
+        if change['deleted'] is not None:
+            if exists:
+                # Kept only if it was re-created here after the delete
+                local_times = [clock[column][0] for column in columns if column in clock]
+                if len(local_times) == len(columns) and min(local_times) > change['deleted']:
+                    stats['kept_local'] += 1
+                    return
+                self.cursor.execute(f"DELETE FROM {table} WHERE {key} = ?", (row_id,))
+                stats['deleted'] += 1
+            if row_id is not None:
+                self._set_sync_clock(table, row_id, SYNC_TOMBSTONE, change['deleted'], site)
+            return
+
+        fields = change['fields']
+        if not exists:
+            if SYNC_TOMBSTONE in clock and not (
+                    len(fields) == len(columns) and min(at for _, at in fields.values()) > clock[SYNC_TOMBSTONE][0]):
+                stats['kept_local'] += 1  # Deleted here, and not re-created there since
+                return
+            self._insert_sync_row(site, table, uid, row_id, fields)
+            stats['inserted'] += 1
+            return
+
+        winners = {}
+        for column, (value, changed_at) in fields.items():
+            local = clock.get(column)
+            if local is None or (changed_at, site) > local:
+                winners[column] = self._sync_local_value(columns[column], value)
+            elif (changed_at, site) != local:  # Equal: already imported from an earlier file
+                stats['kept_local'] += 1
+        if not winners:
+            return
+        if table == "connections" and ("source_key" in winners or "target_key" in winners):
+            self.cursor.execute("SELECT source_key, target_key FROM connections WHERE id = ?", (row_id,))
+            current = self.cursor.fetchone()
+            ends = sorted((winners.get("source_key", current['source_key']),
+                           winners.get("target_key", current['target_key'])))
+            winners["source_key"], winners["target_key"] = ends
+        self.cursor.execute(
+            f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in winners)} WHERE {key} = ?",
+            (*(self._sync_stored_value(table, column, value) for column, value in winners.items()), row_id)
+        )
+        for column in winners:
+            if column in fields:
+                self._set_sync_clock(table, row_id, column, fields[column][1], site)
+        self._refresh_synced_note_links(table, row_id, winners)
+        stats['updated'] += 1
+
+    def _insert_sync_row(self, site, table, uid, old_row_id, fields):
+        key, columns = SYNC_TABLES[table]
+        values = {column: self._sync_local_value(columns[column], value) for column, (value, _) in fields.items()}
+        if key != "id":
+            values[key] = self._sync_local_value("items", uid)  # Keyed by its project, which shares the uid
+        if table == "connections" and "source_key" in values and "target_key" in values:
+            values["source_key"], values["target_key"] = sorted((values["source_key"], values["target_key"]))
+
+        self.cursor.execute(
+            f"INSERT INTO {table} ({', '.join(values)}) VALUES ({', '.join('?' for _ in values)})",
+            [self._sync_stored_value(table, column, value) for column, value in values.items()]
+        )
+        row_id = values[key] if key != "id" else self.cursor.lastrowid
+        if old_row_id is not None and old_row_id != row_id:
+            # Re-created after a delete: the uid moves to the new row
+            self.cursor.execute("DELETE FROM sync_ids WHERE table_name = ? AND row_id = ?", (table, old_row_id))
+        self.cursor.execute("UPDATE sync_ids SET uid = ? WHERE table_name = ? AND row_id = ?", (uid, table, row_id))
+        for column, (_, changed_at) in fields.items():
+            self._set_sync_clock(table, row_id, column, changed_at, site)
+        self._refresh_synced_note_links(table, row_id, values)
+
+    @staticmethod
+    def _sync_stored_value(table, column, value):
+        return encode_note(value) if table == "items" and column in NOTE_FIELDS else value
+
+    def _refresh_synced_note_links(self, table, row_id, values):
+        if table != "items":
+            return
+        for field in NOTE_FIELDS:
+            if field in values:
+                self._update_note_links(row_id, field, values[field])
+
+    # --- Change detection ---
+
+    def get_data_version(self):
+        """
+        SQLite's data_version: changes whenever another connection (another app
+        instance, a script or a worker thread) commits to the file.
+        """
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_last_change_version(self):
+        self.cursor.execute("SELECT COALESCE(MAX(version), 0) FROM change_log")
+        return self.cursor.fetchone()[0]
+
+    def get_changes_since(self, version):
+        """change_log rows (version, table_name, row_id, op, scope_id) after version, oldest first."""
+        self.cursor.execute(
+            "SELECT version, table_name, row_id, op, scope_id FROM change_log WHERE version > ? ORDER BY version",
+            (version,)
+        )
+        return self.cursor.fetchall()
 
     def __del__(self):
         """Close the database connection on object deletion."""
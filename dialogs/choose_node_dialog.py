@@ -0,0 +1,106 @@
+import tkinter as tk
+from tkinter import ttk, Toplevel, messagebox
+
+
+class ChooseNodeDialog(Toplevel):
+    """Dialog for picking a connectable node: a project, one of its notes or one of its readings."""
+
+    def __init__(self, parent, db_manager, title="Choose", ask_label=False):
+        """
+        :param parent: The parent window
+        :param db_manager: The shared DatabaseManager instance
+        :param title: Window title
+        :param ask_label: Also ask for a connection label
+        """
+        super().__init__(parent)
+        self.title(title)
+        self.parent = parent
+        self.db = db_manager
+        self.result = None  # (node_key, label) once chosen
+
+        self.project_options = {}
+        for row in self.db.get_all_projects():
+            name = f"{row['class_name']} / {row['name']}" if row['class_name'] else row['name']
+            self.project_options[name] = row['id']
+        self.node_options = {}
+
+        main_frame = ttk.Frame(self, padding="10 10 10 10")
+        main_frame.pack(fill='both', expand=True)
+        main_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(main_frame, text="Project:").grid(row=0, column=0, sticky="w", pady=2)
+        self.project_combo = ttk.Combobox(
+            main_frame,
+            values=list(self.project_options.keys()),
+            state="readonly",
+            width=40
+        )
+        self.project_combo.grid(row=0, column=1, sticky="ew", pady=2)
+        self.project_combo.bind("<<ComboboxSelected>>", self.on_project_selected)
+
+        ttk.Label(main_frame, text="Item:").grid(row=1, column=0, sticky="w", pady=2)
+        self.node_combo = ttk.Combobox(main_frame, state="readonly", width=40)
+        self.node_combo.grid(row=1, column=1, sticky="ew", pady=2)
+
+        self.label_entry = None
+        if ask_label:
+            ttk.Label(main_frame, text="Label:").grid(row=2, column=0, sticky="w", pady=2)
+            self.label_entry = ttk.Entry(main_frame, width=40)
+            self.label_entry.grid(row=2, column=1, sticky="ew", pady=2)
+
+        # --- Button Frame ---
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+
+        ok_btn = ttk.Button(button_frame, text="OK", command=self.on_ok)
+        ok_btn.grid(row=0, column=0, padx=5, sticky="ew")
+
+        cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.destroy)
+        cancel_btn.grid(row=0, column=1, padx=5, sticky="ew")
+
+        if self.project_options:
+            self.project_combo.current(0)
+            self.on_project_selected()
+
+        self.bind("<Return>", self.on_ok)
+
+        self.center_window()
+        self.transient(parent)
+        self.grab_set()
+
+    def on_project_selected(self, event=None):
+        """Lists the selected project's own node, notes and readings."""
+        project_id = self.project_options.get(self.project_combo.get())
+        if project_id is None:
+            return
+        self.node_options = {label: key for key, label in self.db.get_project_node_options(project_id)}
+        self.node_combo.config(values=list(self.node_options.keys()))
+        self.node_combo.current(0)
+
+    def on_ok(self, event=None):
+        node_key = self.node_options.get(self.node_combo.get())
+        if node_key is None:
+            messagebox.showwarning("Nothing Selected", "Please choose a project and item.", parent=self)
+            return
+        label = self.label_entry.get().strip() if self.label_entry else ""
+        self.result = (node_key, label)
+        self.destroy()
+
+    def center_window(self):
+        """Centers the dialog on the parent window."""
+        self.update_idletasks()
+
+        parent_x = self.parent.winfo_x()
+        parent_y = self.parent.winfo_y()
+        parent_w = self.parent.winfo_width()
+        parent_h = self.parent.winfo_height()
+
+        width = self.winfo_reqwidth()
+        height = self.winfo_reqheight()
+
+        x = parent_x + (parent_w // 2) - (width // 2)
+        y = parent_y + (parent_h // 2) - (height // 2)
+
+        self.geometry(f'{width}x{height}+{x}+{y}')
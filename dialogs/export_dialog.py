@@ -0,0 +1,75 @@
+import tkinter as tk
+from tkinter import ttk, Toplevel, filedialog
+
+
+class ExportDialog(Toplevel):
+    def __init__(self, parent, scope_name):
+        super().__init__(parent)
+        self.title("Export")
+        self.parent = parent
+        self.result = None  # (format, folder) once Export is clicked
+
+        main_frame = ttk.Frame(self, padding="10 10 10 10")
+        main_frame.pack(fill='both', expand=True)
+        main_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(main_frame, text=f"Export {scope_name}").grid(row=0, column=0, columnspan=3, sticky="w", pady=5)
+
+        ttk.Label(main_frame, text="Format:").grid(row=1, column=0, sticky="w", padx=(0, 5))
+        self.format_var = tk.StringVar(value="markdown")
+        format_frame = ttk.Frame(main_frame)
+        format_frame.grid(row=1, column=1, columnspan=2, sticky="w")
+        ttk.Radiobutton(format_frame, text="Markdown", variable=self.format_var, value="markdown").pack(side="left")
+        ttk.Radiobutton(format_frame, text="HTML", variable=self.format_var, value="html").pack(side="left", padx=10)
+
+        ttk.Label(main_frame, text="Folder:").grid(row=2, column=0, sticky="w", padx=(0, 5), pady=5)
+        self.folder_entry = ttk.Entry(main_frame, width=45)
+        self.folder_entry.grid(row=2, column=1, sticky="ew", pady=5)
+        ttk.Button(main_frame, text="Browse...", command=self.browse).grid(row=2, column=2, padx=(5, 0))
+
+        # --- Button Frame ---
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=3, column=0, columnspan=3, sticky="ew", pady=(10, 0))
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+
+        export_btn = ttk.Button(button_frame, text="Export", command=self.on_export)
+        export_btn.grid(row=0, column=0, padx=5, sticky="ew")
+
+        cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.destroy)
+        cancel_btn.grid(row=0, column=1, padx=5, sticky="ew")
+
+        self.bind("<Return>", self.on_export)
+
+        self.center_window()
+        self.transient(parent)
+        self.grab_set()
+
+    def browse(self):
+        folder = filedialog.askdirectory(parent=self, title="Export To Folder", mustexist=False)
+        if folder:
+            self.folder_entry.delete(0, 'end')
+            self.folder_entry.insert(0, folder)
+
+    def on_export(self, event=None):
+        folder = self.folder_entry.get().strip()
+        if folder:  # Only close once a folder is chosen
+            self.result = (self.format_var.get(), folder)
+            self.destroy()
+
+    def center_window(self):
+        """Centers the dialog on the parent window."""
+        self.update_idletasks()
+
+        parent_x = self.parent.winfo_x()
+        parent_y = self.parent.winfo_y()
+        parent_w = self.parent.winfo_width()
+        parent_h = self.parent.winfo_height()
+
+        width = self.winfo_reqwidth()
+        height = self.winfo_reqheight()
+
+        x = parent_x + (parent_w // 2) - (width // 2)
+        y = parent_y + (parent_h // 2) - (height // 2)
+
+        self.geometry(f'{width}x{height}+{x}+{y}')
@@ -0,0 +1,128 @@
+import tkinter as tk
+from tkinter import ttk, Toplevel, messagebox
+from datetime import datetime
+
+
+class LogSessionDialog(Toplevel):
+    """Dialog for logging a reading session against one of a project's readings."""
+
+    def __init__(self, parent, readings, selected_reading_id=None):
+        """
+        :param parent: The parent window
+        :param readings: List of reading rows (id, title) to choose from
+        :param selected_reading_id: The reading to pre-select, if any
+        """
+        super().__init__(parent)
+        self.title("Log Reading Session")
+        self.parent = parent
+        self.result = None  # This will store the entered session
+
+        self.reading_options = {row['title']: row['id'] for row in readings}
+
+        main_frame = ttk.Frame(self, padding="10 10 10 10")
+        main_frame.pack(fill='both', expand=True)
+        main_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(main_frame, text="Reading:").grid(row=0, column=0, sticky="w", pady=2)
+        self.reading_combo = ttk.Combobox(
+            main_frame,
+            values=list(self.reading_options.keys()),
+            state="readonly",
+            width=40
+        )
+        self.reading_combo.grid(row=0, column=1, sticky="ew", pady=2)
+        for index, row in enumerate(readings):
+            if row['id'] == selected_reading_id:
+                self.reading_combo.current(index)
+                break
+        else:
+            if readings:
+                self.reading_combo.current(0)
+
+        now = datetime.now()
+
+        ttk.Label(main_frame, text="Date (YYYY-MM-DD):").grid(row=1, column=0, sticky="w", pady=2)
+        self.date_entry = ttk.Entry(main_frame, width=12)
+        self.date_entry.grid(row=1, column=1, sticky="w", pady=2)
+        self.date_entry.insert(0, now.strftime("%Y-%m-%d"))
+
+        ttk.Label(main_frame, text="Start (HH:MM):").grid(row=2, column=0, sticky="w", pady=2)
+        self.start_entry = ttk.Entry(main_frame, width=8)
+        self.start_entry.grid(row=2, column=1, sticky="w", pady=2)
+
+        ttk.Label(main_frame, text="End (HH:MM):").grid(row=3, column=0, sticky="w", pady=2)
+        self.end_entry = ttk.Entry(main_frame, width=8)
+        self.end_entry.grid(row=3, column=1, sticky="w", pady=2)
+        self.end_entry.insert(0, now.strftime("%H:%M"))
+
+        ttk.Label(main_frame, text="Pages read:").grid(row=4, column=0, sticky="w", pady=2)
+        self.pages_entry = ttk.Entry(main_frame, width=8)
+        self.pages_entry.grid(row=4, column=1, sticky="w", pady=2)
+
+        # --- Button Frame ---
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=5, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+
+        save_btn = ttk.Button(button_frame, text="Save", command=self.on_save)
+        save_btn.grid(row=0, column=0, padx=5, sticky="ew")
+
+        cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.destroy)
+        cancel_btn.grid(row=0, column=1, padx=5, sticky="ew")
+
+        self.bind("<Return>", self.on_save)
+
+        self.center_window()
+        self.transient(parent)
+        self.grab_set()
+        self.start_entry.focus_set()
+
+    def on_save(self, event=None):
+        """Validates the entries, stores them in 'result' and closes."""
+        reading_id = self.reading_options.get(self.reading_combo.get())
+        if reading_id is None:
+            messagebox.showwarning("No Reading", "Please choose a reading.", parent=self)
+            return
+
+        try:
+            day = self.date_entry.get().strip()
+            started = datetime.strptime(f"{day} {self.start_entry.get().strip()}", "%Y-%m-%d %H:%M")
+            ended = datetime.strptime(f"{day} {self.end_entry.get().strip()}", "%Y-%m-%d %H:%M")
+            pages_read = int(self.pages_entry.get() or 0)
+        except ValueError:
+            messagebox.showwarning(
+                "Invalid Session",
+                "Please enter the date as YYYY-MM-DD, times as HH:MM and pages as a whole number.",
+                parent=self
+            )
+            return
+
+        if ended < started:
+            messagebox.showwarning("Invalid Session", "The end time is before the start time.", parent=self)
+            return
+
+        self.result = {
+            "reading_id": reading_id,
+            "started_at": started.strftime("%Y-%m-%d %H:%M:%S"),
+            "ended_at": ended.strftime("%Y-%m-%d %H:%M:%S"),
+            "pages_read": pages_read
+        }
+        self.destroy()
+
+    def center_window(self):
+        """Centers the dialog on the parent window."""
+        self.update_idletasks()
+
+        parent_x = self.parent.winfo_x()
+        parent_y = self.parent.winfo_y()
+        parent_w = self.parent.winfo_width()
+        parent_h = self.parent.winfo_height()
+
+        width = self.winfo_reqwidth()
+        height = self.winfo_reqheight()
+
+        x = parent_x + (parent_w // 2) - (width // 2)
+        y = parent_y + (parent_h // 2) - (height // 2)
+
+        self.geometry(f'{width}x{height}+{x}+{y}')
@@ -0,0 +1,112 @@
+import tkinter as tk
+from tkinter import ttk, Toplevel, messagebox
+
+
+class ReadingDialog(Toplevel):
+    """Dialog for adding a new reading or editing an existing one."""
+
+    def __init__(self, parent, statuses, reading=None):
+        """
+        :param parent: The parent window
+        :param statuses: The allowed reading statuses
+        :param reading: An existing reading row to edit, or None to add a new one
+        """
+        super().__init__(parent)
+        self.title("Edit Reading" if reading else "Add Reading")
+        self.parent = parent
+        self.result = None  # This will store the entered values
+
+        main_frame = ttk.Frame(self, padding="10 10 10 10")
+        main_frame.pack(fill='both', expand=True)
+        main_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(main_frame, text="Title:").grid(row=0, column=0, sticky="w", pady=2)
+        self.title_entry = ttk.Entry(main_frame, width=50)
+        self.title_entry.grid(row=0, column=1, sticky="ew", pady=2)
+
+        ttk.Label(main_frame, text="Author(s):").grid(row=1, column=0, sticky="w", pady=2)
+        self.authors_entry = ttk.Entry(main_frame, width=50)
+        self.authors_entry.grid(row=1, column=1, sticky="ew", pady=2)
+
+        ttk.Label(main_frame, text="Total pages:").grid(row=2, column=0, sticky="w", pady=2)
+        self.pages_entry = ttk.Entry(main_frame, width=10)
+        self.pages_entry.grid(row=2, column=1, sticky="w", pady=2)
+
+        ttk.Label(main_frame, text="Pages read:").grid(row=3, column=0, sticky="w", pady=2)
+        self.pages_read_entry = ttk.Entry(main_frame, width=10)
+        self.pages_read_entry.grid(row=3, column=1, sticky="w", pady=2)
+
+        ttk.Label(main_frame, text="Status:").grid(row=4, column=0, sticky="w", pady=2)
+        self.status_combo = ttk.Combobox(main_frame, values=list(statuses), state="readonly", width=20)
+        self.status_combo.grid(row=4, column=1, sticky="w", pady=2)
+        self.status_combo.current(0)
+
+        if reading:
+            self.title_entry.insert(0, reading['title'])
+            self.authors_entry.insert(0, reading['authors'] or "")
+            if reading['total_pages'] is not None:
+                self.pages_entry.insert(0, str(reading['total_pages']))
+            self.pages_read_entry.insert(0, str(reading['pages_read'] or 0))
+            if reading['status'] in statuses:
+                self.status_combo.current(list(statuses).index(reading['status']))
+        else:
+            self.pages_read_entry.insert(0, "0")
+
+        # --- Button Frame ---
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=5, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+
+        save_btn = ttk.Button(button_frame, text="Save", command=self.on_save)
+        save_btn.grid(row=0, column=0, padx=5, sticky="ew")
+
+        cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.destroy)
+        cancel_btn.grid(row=0, column=1, padx=5, sticky="ew")
+
+        self.bind("<Return>", self.on_save)
+
+        self.center_window()
+        self.transient(parent)
+        self.grab_set()
+        self.title_entry.focus_set()
+
+    def on_save(self, event=None):
+        """Validates the entries, stores them in 'result' and closes."""
+        title = self.title_entry.get().strip()
+        if not title:
+            messagebox.showwarning("Missing Title", "Please enter a title.", parent=self)
+            return
+
+        try:
+            total_pages = int(self.pages_entry.get()) if self.pages_entry.get().strip() else None
+            pages_read = int(self.pages_read_entry.get() or 0)
+        except ValueError:
+            messagebox.showwarning("Invalid Pages", "Page counts must be whole numbers.", parent=self)
+            return
+
+        self.result = {
+            "title": title,
+            "authors": self.authors_entry.get().strip(),
+            "total_pages": total_pages,
+            "pages_read": pages_read,
+            "status": self.status_combo.get()
+        }
+        self.destroy()
+
+    def center_window(self):
+        """Centers the dialog on the parent window."""
+        self.update_idletasks()
+
+        parent_x = self.parent.winfo_x()
+        parent_y = self.parent.winfo_y()
+        parent_w = self.parent.winfo_width()
+        parent_h = self.parent.winfo_height()
+
+        width = self.winfo_reqwidth()
+        height = self.winfo_reqheight()
+
+        x = parent_x + (parent_w // 2) - (width // 2)
+        y = parent_y + (parent_h // 2) - (height // 2)
+
+        self.geometry(f'{width}x{height}+{x}+{y}')
@@ -12,14 +12,28 @@ from dialogs.reorder_dialog import ReorderDialog
 from dialogs.move_project_dialog import MoveProjectDialog
 from dialogs.rename_dialog import RenameDialog
 from dialogs.edit_assignment_dialog import EditAssignmentDialog
+from dialogs.export_dialog import ExportDialog
+from project_views.connections_window import ConnectionsWindow
+from project_views.timeline_window import TimelineWindow
+from project_views.trash_window import TrashWindow
+from project_views.source_search_window import SourceSearchWindow
+from project_views.attachments_window import format_size
+from utils.library_exporter import export_projects
+
+FULL_RELOAD_CHANGES = 500  # Past this many outside item changes, rebuilding the tree is cheaper
 
 
 class HomeScreen(ttk.Frame):
     # --- UPDATED __init__ ---
     # It now receives the db_manager from MainApplication
-    def __init__(self, parent, base_dir, db_manager):
+    def __init__(self, parent, base_dir, db_manager, executor, change_watcher, journal, extraction_queue):
         super().__init__(parent)
         self.db = db_manager  # Use the passed-in db manager
+        self.executor = executor  # Background database work
+        self.journal = journal  # Undo/redo of tree edits
+        self.change_watcher = change_watcher  # Reports rows changed by other connections
+        self.extraction_queue = extraction_queue  # Background text indexing of attached files
+        self._tree_load = None  # The tree load in flight, if any
         self.base_dir = base_dir
         self.selected_item_id = None
         self.expanded_ids = set()  # For restoring tree state
@@ -29,6 +43,8 @@ class HomeScreen(ttk.Frame):
 
         self.create_widgets()
         self.load_data_to_tree()
+        self.change_watcher.subscribe(self.on_external_changes, owner=self)
+        self.extraction_queue.subscribe(self.on_extraction_progress, owner=self)
 
     def create_widgets(self):
         # Configure grid
@@ -41,12 +57,21 @@ class HomeScreen(ttk.Frame):
         left_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         left_frame.grid_rowconfigure(0, weight=1)  # Treeview
         left_frame.grid_rowconfigure(1, weight=0)  # Buttons
+        left_frame.grid_rowconfigure(2, weight=0)  # Status
         left_frame.grid_columnconfigure(0, weight=1)
         left_frame.grid_columnconfigure(1, weight=0)  # Scrollbar
 
         # The Treeview
-        self.tree = ttk.Treeview(left_frame, columns=("db_id",), displaycolumns=())
+        # Class rows show their trigger-maintained counters (see item_counters)
+        self.tree = ttk.Treeview(left_frame, columns=("db_id", "projects", "assignments", "notes"),
+                                 displaycolumns=("projects", "assignments", "notes"))
         self.tree.heading("#0", text="Name")
+        self.tree.heading("projects", text="Projects")
+        self.tree.heading("assignments", text="Assignments")
+        self.tree.heading("notes", text="Notes")
+        self.tree.column("projects", width=65, anchor="e", stretch=False)
+        self.tree.column("assignments", width=85, anchor="e", stretch=False)
+        self.tree.column("notes", width=70, anchor="e", stretch=False)
         self.tree.grid(row=0, column=0, sticky="nsew")
 
         # Scrollbar
@@ -80,10 +105,35 @@ class HomeScreen(ttk.Frame):
             text="Connections",
             command=self.open_connections_window
         )
-        # Place it on the row below the other buttons, spanning both columns
-        btn_connections.grid(row=1, column=0, columnspan=2, pady=(5, 0), sticky="ew")
+        # Place it on the row below the other buttons
+        btn_connections.grid(row=1, column=0, padx=(0, 2), pady=(5, 0), sticky="ew")
         # --- END NEW Button ---
 
+        btn_timeline = ttk.Button(
+            button_frame,
+            text="Timeline",
+            command=self.open_timeline_window
+        )
+        btn_timeline.grid(row=1, column=1, padx=(2, 0), pady=(5, 0), sticky="ew")
+
+        btn_trash = ttk.Button(
+            button_frame,
+            text="Trash",
+            command=self.open_trash_window
+        )
+        btn_trash.grid(row=2, column=0, padx=(0, 2), pady=(5, 0), sticky="ew")
+
+        btn_search = ttk.Button(
+            button_frame,
+            text="Search Files",
+            command=self.open_source_search_window
+        )
+        btn_search.grid(row=2, column=1, padx=(2, 0), pady=(5, 0), sticky="ew")
+
+        # Progress of background operations (loading, duplicating, deleting)
+        self.status_label = ttk.Label(left_frame, text="")
+        self.status_label.grid(row=2, column=0, columnspan=2, sticky="w", pady=(5, 0))
+
         # --- Right Side: Icon ---
         right_frame = ttk.Frame(self)
         right_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
@@ -115,16 +165,31 @@ class HomeScreen(ttk.Frame):
         self.tree.bind("<Double-1>", self.on_double_click)
 
     def load_data_to_tree(self):
-        """Clear and reload all items from the database into the tree."""
+        """
+        Reload all items from the database into the tree.
+        The items are fetched on a worker thread; a newer reload supersedes an older one.
+        """
+        if self._tree_load is not None:
+            self._tree_load.cancel()
+        self._tree_load = self.executor.submit(
+            lambda ctx: ctx.db.get_item_tree(),
+            on_done=self._populate_tree,
+            on_error=self._on_task_error,
+            owner=self
+        )
+
+    def _populate_tree(self, children):
+        """Rebuilds the tree from get_item_tree()'s {parent_id: [items]} map."""
+        self._tree_load = None
+
         # --- Save expanded state ---
         expanded_ids = set()
-        if hasattr(self, 'tree'):  # Check if tree exists
-            self._find_expanded_children(self.tree.get_children(), expanded_ids)
+        self._find_expanded_children(self.tree.get_children(), expanded_ids)
 
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        self._load_children(parent_iid='', parent_db_id=None, expanded_ids=expanded_ids)
+        self._load_children(parent_iid='', parent_db_id=None, children=children)
 
         # Restore expanded state
         for iid in self.tree.get_children():
@@ -156,25 +221,106 @@ class HomeScreen(ttk.Frame):
         for child_iid in self.tree.get_children(iid):
             self._restore_expanded_state(child_iid, expanded_ids)
 
-    def _load_children(self, parent_iid, parent_db_id, expanded_ids):  # Added expanded_ids
-        """Recursive helper function to load items."""
-        items = self.db.get_items(parent_db_id)
-        for item in items:
+    def _load_children(self, parent_iid, parent_db_id, children):
+        """Recursive helper function to insert items from the prefetched children map."""
+        for item in children.get(parent_db_id, []):
+            # Tree rows are keyed by DB id so single rows can be found and updated later
             item_iid = self.tree.insert(
                 parent_iid,
                 'end',
+                iid=str(item['id']),
                 text=item['name'],
-                values=(item['id'],),
+                values=self._row_values(item['id'], item['type'], item),
                 tags=(item['type'],)
             )
             if item['type'] == 'class':
-                # Pass the set in the recursive call
                 self._load_children(
                     parent_iid=item_iid,
                     parent_db_id=item['id'],
-                    expanded_ids=expanded_ids  # Pass it down
+                    children=children
                 )
 
+    @staticmethod
+    def _row_values(db_id, item_type, counters=None):
+        """Tree values for a row: the DB id, then (for classes) project/assignment counts and notes size."""
+        if item_type != 'class':
+            return (db_id, "", "", "")
+        if counters is None or counters['project_count'] is None:
+            return (db_id, 0, 0, format_size(0))
+        return (db_id, counters['project_count'], counters['assignment_count'],
+                format_size(counters['notes_bytes']))
+
+    def _refresh_counters(self, class_ids):
+        """Re-reads the counters of the given classes into their tree rows."""
+        class_ids = [db_id for db_id in class_ids if db_id is not None and self.tree.exists(str(db_id))]
+        counters = self.db.get_item_counters(class_ids)
+        for db_id in class_ids:
+            if 'class' in self.tree.item(str(db_id), 'tags'):
+                self.tree.item(str(db_id), values=self._row_values(db_id, 'class', counters.get(db_id)))
+
+    # --- Incremental refresh ---
+
+    def on_external_changes(self, changes):
+        """
+        Applies change_log rows written by other connections to the tree,
+        touching only the rows that changed and the lists they moved between.
+        """
+        item_changes = [change for change in changes if change['table_name'] == 'items']
+        if not item_changes:
+            return
+        if self._tree_load is not None or len(item_changes) > FULL_RELOAD_CHANGES:
+            self.load_data_to_tree()  # Rebuild (again) so the pending load can't miss these
+            return
+
+        deleted_ids = {change['row_id'] for change in item_changes if change['op'] == 'delete'}
+        changed_parents = {change['scope_id'] for change in item_changes
+                           if change['op'] != 'delete' and change['scope_id'] not in deleted_ids}
+
+        # Re-list each affected parent; rows that left a list are removed only if
+        # no other list claimed them (i.e. they were deleted, not moved)
+        left_behind = []
+        for parent_db_id in changed_parents:
+            left_behind.extend(self._sync_children(parent_db_id))
+        # Classes whose projects changed, including the ones projects moved out of
+        touched_classes = set(changed_parents)
+        for iid, old_parent_iid in left_behind:
+            if old_parent_iid:
+                touched_classes.add(int(old_parent_iid))
+            if self.tree.exists(iid) and self.tree.parent(iid) == old_parent_iid:
+                self.tree.delete(iid)
+
+        for db_id in deleted_ids:
+            if self.tree.exists(str(db_id)):
+                if self.tree.parent(str(db_id)):
+                    touched_classes.add(int(self.tree.parent(str(db_id))))
+                self.tree.delete(str(db_id))
+        self._refresh_counters(touched_classes)
+
+    def _sync_children(self, parent_db_id):
+        """
+        Makes one parent's tree rows match its children in the database.
+        Returns (iid, parent_iid) of rows that are no longer among them.
+        """
+        parent_iid = '' if parent_db_id is None else str(parent_db_id)
+        if parent_iid and not self.tree.exists(parent_iid):
+            return []  # Not shown yet; it is loaded with its children when it appears
+
+        wanted = set()
+        for index, item in enumerate(self.db.get_items(parent_db_id)):
+            iid = str(item['id'])
+            wanted.add(iid)
+            if self.tree.exists(iid):
+                self.tree.move(iid, parent_iid, index)
+                self.tree.item(iid, text=item['name'])
+            else:
+                self.tree.insert(parent_iid, index, iid=iid, text=item['name'],
+                                 values=self._row_values(item['id'], item['type']), tags=(item['type'],))
+                if item['type'] == 'class':
+                    self._sync_children(item['id'])
+                    self._refresh_counters([item['id']])
+
+        return [(iid, parent_iid) for iid in self.tree.get_children(parent_iid) if iid not in wanted]
+
     def show_context_menu(self, event):
         """Display the right-click context menu."""
         self.selected_item_id = self.tree.identify_row(event.y)
@@ -203,6 +349,7 @@ class HomeScreen(ttk.Frame):
             menu.add_command(label="Rename", command=self.rename_item)
             menu.add_command(label="Delete", command=self.delete_item)
             menu.add_command(label="Duplicate", command=self.duplicate_item)
+            menu.add_command(label="Export...", command=lambda: self.export_items(db_id, item_details['name']))
             menu.add_separator()
 
             if item_type == 'class':
@@ -219,6 +366,8 @@ class HomeScreen(ttk.Frame):
                              command=lambda: self.handle_create_item('project', from_button=True))
             menu.add_command(label="Add New Class (Standalone)",
                              command=lambda: self.handle_create_item('class', from_button=True))
+            menu.add_separator()
+            menu.add_command(label="Export Library...", command=lambda: self.export_items(None, None))
 
         try:
             menu.tk_popup(event.x_root, event.y_root)
@@ -267,15 +416,16 @@ class HomeScreen(ttk.Frame):
             name = dialog.result['name']
             is_assignment = dialog.result['is_assignment']
 
-            self.db.create_item(name, item_type, parent_db_id, is_assignment)
+            new_id = self.db.create_item(name, item_type, parent_db_id, is_assignment)
+            self.journal.record(f"Create '{name}'", ("delete", new_id))
             self.load_data_to_tree()  # Refresh the tree
 
-    def handle_create_item(self, item_type, from_button=False):
-        # --- UPDATED: Call app's db ---
-        item_details = self.db.get_item_details(db_id)
-        current_status = item_details['is_assignment']
+    def rename_item(self):
+        """Rename the selected item."""
+        if not self.selected_item_id:
+            return
 
-        db_id = self.tree.item(self.selected_item_id, 'values')[0]
+        db_id = int(self.tree.item(self.selected_item_id, 'values')[0])
         old_name = self.tree.item(self.selected_item_id, 'text')
 
         dialog = RenameDialog(self, old_name)
@@ -285,6 +435,7 @@ class HomeScreen(ttk.Frame):
         if hasattr(dialog, 'new_name') and dialog.new_name:
             if dialog.new_name != old_name:
                 self.db.rename_item(db_id, dialog.new_name)
+                self.journal.record(f"Rename '{old_name}'", ("rename", db_id, old_name))
                 self.load_data_to_tree()
 
     # --- NEW METHODS ---
@@ -309,7 +460,7 @@ class HomeScreen(ttk.Frame):
         # --- Confirmation ---
         if item_type == 'class':
             msg = f"Are you sure you want to delete the class '{item_name}'?\n\n" \
-                  "ALL projects inside this class will also be permanently deleted."
+                  "All projects inside this class will be moved to the Trash with it."
             if not messagebox.askyesno("Delete Class?", msg):
                 return
         else:
@@ -317,8 +468,10 @@ class HomeScreen(ttk.Frame):
             if not messagebox.askyesno("Delete Project?", msg):
                 return
 
+        # Only flags the rows, so this is instant; the Trash purges them later
         self.db.delete_item(db_id)
-        self.load_data_to_tree()
+        self.journal.record(f"Delete '{item_name}'", ("undelete", db_id))
+        self._on_task_finished(f"Moved '{item_name}' to the Trash.")
 
     def duplicate_item(self):
         """Duplicate the selected item."""
@@ -329,9 +482,59 @@ class HomeScreen(ttk.Frame):
         if not db_id_val: return
 
         db_id = int(db_id_val[0])
-        self.db.duplicate_item(db_id)
+        item_name = self.tree.item(self.selected_item_id, 'text')
+        copied = []
+
+        def on_progress(name):
+            copied.append(name)
+            self.status_label.config(text=f"Duplicating... {len(copied)} copied ({name})")
+
+        def on_done(new_id):
+            self.journal.record(f"Duplicate '{item_name}'", ("delete", new_id))
+            self._on_task_finished(f"Duplicated {len(copied)} item(s).")
+
+        self.status_label.config(text="Duplicating...")
+        self.executor.submit(
+            lambda ctx: ctx.db.duplicate_item(db_id, progress=ctx.report_progress),
+            on_done=on_done,
+            on_error=self._on_task_error,
+            on_progress=on_progress,
+            owner=self
+        )
+
+    def export_items(self, db_id, name):
+        """Exports a project, a class or (db_id None) the whole library to Markdown or HTML files."""
+        dialog = ExportDialog(self, f"'{name}'" if name else "the whole library")
+        self.wait_window(dialog)
+        if not dialog.result:
+            return
+        fmt, folder = dialog.result
+
+        def on_progress(progress):
+            done, total, project_name = progress
+            self.status_label.config(text=f"Exporting... {done} of {total} ({project_name})")
+
+        def on_done(result):
+            count, index_path = result
+            self.status_label.config(text=f"Exported {count} project(s) to {os.path.dirname(index_path)}.")
+
+        self.status_label.config(text="Exporting...")
+        self.executor.submit(
+            export_projects, db_id, fmt, folder,
+            on_done=on_done,
+            on_error=self._on_task_error,
+            on_progress=on_progress,
+            owner=self
+        )
+
+    def _on_task_finished(self, message):
+        self.status_label.config(text=message)
         self.load_data_to_tree()
 
+    def _on_task_error(self, error):
+        self.status_label.config(text="")
+        messagebox.showerror("Error", f"The operation failed:\n{error}")
+
     def move_project(self):
         """Move the selected project to a new parent (or root)."""
         if not self.selected_item_id:
@@ -351,9 +554,13 @@ class HomeScreen(ttk.Frame):
         # The dialog sets 'new_parent_id' (could be None for root)
         if hasattr(dialog, 'new_parent_id'):
             # Only move if the ID is different
-            current_parent = self.db.get_item_details(db_id)['parent_id']
-            if dialog.new_parent_id != current_parent:
+            item_details = self.db.get_item_details(db_id)
+            if dialog.new_parent_id != item_details['parent_id']:
                 self.db.move_item(db_id, dialog.new_parent_id)
+                self.journal.record(
+                    f"Move '{item_details['name']}'",
+                    ("position", db_id, item_details['parent_id'], item_details['display_order'])
+                )
                 self.load_data_to_tree()
 
     def edit_assignment_status(self):
@@ -386,29 +593,42 @@ class HomeScreen(ttk.Frame):
                 # Show warning if changing from Yes to No
                 if current_status == 1 and new_status_val == 0:
                     if not messagebox.askyesno("Warning",
-                                               "By selecting no, the existing assignment in the project will be deleted permanently.\nAre you sure you want to continue?"):
+                                               "By selecting no, the project will no longer appear on the timeline or send reminders.\nIts assignment details are kept and come back if you select yes again.\nAre you sure you want to continue?"):
                         return  # User cancelled
 
                 # --- UPDATED: Call app's db ---
                 self.db.update_assignment_status(db_id, new_status_val)
+                self.app_root.reschedule_reminder(db_id)
+                self._refresh_counters([item_details['parent_id']])
                 print(f"Updated assignment status for item {db_id} to {new_status_val}")
 
-    def connections_placeholder(self):
-        self.db.update_assignment_status(db_id, new_status)
-        # No tree reload is needed since this data isn't visible
-        print(f"Updated assignment status for item {db_id} to {new_status}")
-
-    # --- NEW PLACEHOLDER METHOD ---
     def open_connections_window(self):
-        """Placeholder for opening the connections management window."""
-        print("Opening connections window (placeholder)...")
-        messagebox.showinfo(
-            "Connections",
-            "This feature is not yet implemented.\n\n"
-            "This will open the connections management window."
-        )
-
-
-
-
+        """Opens the connections browser, centred on the selected project if there is one."""
+        project_id = None
+        selection = self.tree.selection()
+        if selection and 'project' in self.tree.item(selection[0], 'tags'):
+            project_id = int(self.tree.item(selection[0], 'values')[0])
+        ConnectionsWindow(self, self.db, project_id)
+
+    def open_timeline_window(self):
+        """Opens the timeline of assignments across all classes."""
+        TimelineWindow(self, self.db, self.executor, on_open_project=self.app_root.show_project_window)
+
+    def open_trash_window(self):
+        """Opens the Trash, where deleted classes and projects can be restored or purged."""
+        TrashWindow(self, self.db, self.executor, on_restored=self.on_item_restored)
+
+    def open_source_search_window(self):
+        """Opens the full-text search over the readings' attached files."""
+        SourceSearchWindow(self, self.db, on_open_project=self.app_root.show_project_window)
+
+    def on_extraction_progress(self, progress):
+        if progress is None:
+            self.status_label.config(text="Attached files indexed.")
+        else:
+            done, left = progress
+            self.status_label.config(text=f"Indexing attached files... {done} done, {left} left")
 
+    def on_item_restored(self, db_id, name):
+        self.journal.record(f"Restore '{name}'", ("delete", db_id))
+        self._on_task_finished(f"Restored '{name}'.")
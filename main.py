@@ -1,10 +1,26 @@
 import tkinter as tk
-from tkinter import ttk, PhotoImage
+from tkinter import ttk, PhotoImage, messagebox, filedialog
 import os
+import sqlite3
+import time
+from datetime import datetime
 from home_screen import HomeScreen
 # --- NEW IMPORTS ---
 from project_views.project_homepage import open_project_window
 from database_manager import DatabaseManager
+from utils.reminder_scheduler import ReminderScheduler
+from utils.task_executor import TaskExecutor
+from utils.change_watcher import ChangeWatcher
+from utils.operation_journal import OperationJournal
+from utils.attachment_store import AttachmentStore, ATTACHMENT_SERIAL, collect_garbage, verify_blobs
+from utils.extraction_queue import ExtractionQueue
+from utils.thumbnail_cache import ThumbnailCache
+from utils.sync_manager import SYNC_FILE_EXTENSION, SYNC_FILE_TYPES, export_changes, import_changes
+from project_views.attachments_window import format_size
+
+MAINTENANCE_CHECK_MS = 30 * 1000  # How often idle maintenance is considered
+MAINTENANCE_SLICE_GAP_MS = 250  # Pause between time-boxed steps while a pass is running
+IDLE_BEFORE_MAINTENANCE_S = 60  # Seconds without keyboard/mouse input before maintenance runs
 
 
 class MainApplication(tk.Tk):
@@ -17,6 +33,20 @@ class MainApplication(tk.Tk):
         # --- Store base_dir and db on the app itself ---
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.db = DatabaseManager()  # One DB manager for the whole app
+        # Slow database work runs here, each worker with its own connection
+        self.executor = TaskExecutor(self, self.db.db_file)
+        # Picks up writes from other instances/scripts so open views can refresh just those rows
+        self.change_watcher = ChangeWatcher(self, self.db)
+        self.journal = OperationJournal(self.db)  # Undo/redo of class and project edits
+        # Reading source files, stored by content hash next to the database
+        self.attachment_store = AttachmentStore.for_database(self.db.db_file)
+        self.check_attachments()
+        # Text of attached files is extracted in worker processes and indexed for search
+        self.extraction_queue = ExtractionQueue(self.executor, self.db, self.attachment_store)
+        self.extraction_queue.resume()
+        # Cover thumbnails of attached files, rendered in worker processes and cached on disk
+        self.thumbnail_cache = ThumbnailCache.for_database(self, self.db.db_file, self.attachment_store)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.current_frame = None
         self.current_project_window = None
@@ -32,6 +62,35 @@ class MainApplication(tk.Tk):
 
         self.center_window()
 
+        # --- Edit menu (undo/redo of tree edits) ---
+        menubar = tk.Menu(self)
+        self.config(menu=menubar)
+        self.edit_menu = tk.Menu(menubar, tearoff=0, postcommand=self.update_edit_menu)
+        menubar.add_cascade(label="Edit", menu=self.edit_menu)
+        self.edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        self.edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
+        # Bound on this window only, so text boxes in project windows keep their own undo
+        self.bind("<Control-z>", lambda e: self.undo())
+        self.bind("<Control-y>", lambda e: self.redo())
+        self.bind("<Control-Z>", lambda e: self.redo())  # Ctrl+Shift+Z
+
+        # --- Sync menu (exchanging edits with a copy of the database on another machine) ---
+        sync_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Sync", menu=sync_menu)
+        sync_menu.add_command(label="Export Changes...", command=self.export_sync_changes)
+        sync_menu.add_command(label="Import Changes...", command=self.import_sync_changes)
+
+        # --- Assignment reminders ---
+        self.reminders = ReminderScheduler(self, self.on_assignment_reminder)
+        self.load_reminders()
+
+        # --- Idle database maintenance ---
+        self._last_input = time.monotonic()
+        self._vacuum_task = None  # One-time conversion to incremental vacuum, while it runs
+        self.bind_all("<KeyPress>", self._note_input, add="+")
+        self.bind_all("<ButtonPress>", self._note_input, add="+")
+        self._maintenance_job = self.after(MAINTENANCE_CHECK_MS, self._maybe_run_maintenance)
+
         # --- NEW: Start by showing the home screen ---
         self.show_home_screen()
 
@@ -44,6 +103,193 @@ class MainApplication(tk.Tk):
         y = (self.winfo_screenheight() // 2) - (height // 2)
         self.geometry(f'{width}x{height}+{x}+{y}')
 
+    def on_close(self):
+        """Lets queued saves finish before the app exits."""
+        self.change_watcher.stop()
+        self.extraction_queue.stop()  # Unfinished files stay queued for the next start
+        self.thumbnail_cache.shutdown()
+        self.after_cancel(self._maintenance_job)
+        self.executor.shutdown(wait=True)
+        self.destroy()
+
+    # --- Attachment store ---
+
+    def check_attachments(self):
+        """
+        Deletes the files of attachments removed since last time (e.g. with
+        purged readings), then re-hashes blobs not checked for a while, all in
+        the background.
+        """
+        self.executor.submit(collect_garbage, self.attachment_store, serial=ATTACHMENT_SERIAL)
+        self.executor.submit(verify_blobs, self.attachment_store, serial=ATTACHMENT_SERIAL,
+                             on_done=self.on_attachments_verified)
+
+    def on_attachments_verified(self, result):
+        checked, damaged = result
+        if damaged:
+            print(f"Attachment check: {len(damaged)} of {checked} stored files are missing or corrupt.")
+
+    # --- Idle maintenance ---
+
+    def _note_input(self, event):
+        self._last_input = time.monotonic()
+        if self._vacuum_task is not None:
+            # The VACUUM holds the write lock; give the database back to the user
+            self._vacuum_task.cancel()
+            self._vacuum_task = None
+            self._show_status("Database compaction paused; it continues the next time you are away.")
+
+    def _maybe_run_maintenance(self):
+        """
+        Gives the database one time-boxed maintenance step when the user has
+        been away for a while and no background work is running. A database
+        from before incremental vacuum is first converted on a worker thread.
+        """
+        delay = MAINTENANCE_CHECK_MS
+        if time.monotonic() - self._last_input >= IDLE_BEFORE_MAINTENANCE_S and self.executor.idle():
+            if self.db.incremental_vacuum_pending():
+                self._start_vacuum_conversion()
+            elif self.db.run_maintenance():
+                delay = MAINTENANCE_SLICE_GAP_MS
+        self._maintenance_job = self.after(delay, self._maybe_run_maintenance)
+
+    def _start_vacuum_conversion(self):
+        self._show_status("Compacting the database (one time only, stops when you return)...")
+        self._vacuum_task = self.executor.submit(
+            lambda ctx: ctx.db.enable_incremental_vacuum(
+                progress=ctx.report_progress, should_stop=lambda: ctx.cancelled
+            ),
+            on_progress=lambda seconds: self._show_status(
+                f"Compacting the database (one time only, stops when you return)... {seconds}s"
+            ),
+            on_done=self._on_vacuum_converted,
+            on_error=self._on_vacuum_failed
+        )
+
+    def _on_vacuum_converted(self, _):
+        self._vacuum_task = None
+        self._show_status("Database compacted.")
+
+    def _on_vacuum_failed(self, error):
+        # Usually another instance was writing; it is tried again on the next idle check
+        self._vacuum_task = None
+        self._show_status("")
+        print(f"Database compaction did not finish: {error!r}")
+
+    def _show_status(self, text):
+        if self.current_frame is self.home_frame:
+            self.home_frame.status_label.config(text=text)
+
+    # --- Undo / redo ---
+
+    def update_edit_menu(self):
+        """Shows what Undo/Redo would do, and greys them out when there is nothing to do."""
+        undo_label, redo_label = self.journal.undo_label(), self.journal.redo_label()
+        self.edit_menu.entryconfig(0, label=f"Undo {undo_label}" if undo_label else "Undo",
+                                   state="normal" if undo_label else "disabled")
+        self.edit_menu.entryconfig(1, label=f"Redo {redo_label}" if redo_label else "Redo",
+                                   state="normal" if redo_label else "disabled")
+
+    def undo(self):
+        self._run_journal_step(self.journal.undo, "Undid")
+
+    def redo(self):
+        self._run_journal_step(self.journal.redo, "Redid")
+
+    def _run_journal_step(self, step, verb):
+        if self.current_frame is not self.home_frame:
+            return
+        try:
+            label = step()
+        except (LookupError, sqlite3.Error) as e:
+            messagebox.showerror("Undo", f"That step could not be applied and was dropped:\n{e}")
+            return
+        if label is None:
+            return
+        self.home_frame.status_label.config(text=f"{verb}: {label}")
+        self.home_frame.load_data_to_tree()
+        self.load_reminders()  # Deleted/restored assignments
+
+    # --- Sync ---
+
+    def _show_status(self, message):
+        if self.current_frame is self.home_frame:
+            self.home_frame.status_label.config(text=message)
+
+    def export_sync_changes(self):
+        """Writes the edits the other machine hasn't confirmed yet to a change file."""
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export Changes", defaultextension=SYNC_FILE_EXTENSION, filetypes=SYNC_FILE_TYPES,
+            initialfile=f"reading-tracker-{datetime.now():%Y%m%d-%H%M}{SYNC_FILE_EXTENSION}"
+        )
+        if not path:
+            return
+        self._show_status("Exporting changes...")
+        self.executor.submit(
+            export_changes, path,
+            on_done=self.on_sync_exported,
+            on_error=self.on_sync_error,
+            on_progress=lambda rows: self._show_status(f"Exporting changes... {rows} row(s)")
+        )
+
+    def on_sync_exported(self, result):
+        rows, size = result
+        self._show_status(f"Exported {rows} changed row(s) ({format_size(size)}).")
+
+    def import_sync_changes(self):
+        """Applies a change file exported on the other machine."""
+        path = filedialog.askopenfilename(parent=self, title="Import Changes", filetypes=SYNC_FILE_TYPES)
+        if not path:
+            return
+        self._show_status("Importing changes...")
+        self.executor.submit(
+            import_changes, path,
+            on_done=self.on_sync_imported,
+            on_error=self.on_sync_error,
+            on_progress=lambda rows: self._show_status(f"Importing changes... {rows} row(s)")
+        )
+
+    def on_sync_imported(self, stats):
+        # Open views refresh themselves through the change watcher
+        self._show_status(f"Imported changes: {stats['inserted']} added, {stats['updated']} updated, "
+                          f"{stats['deleted']} deleted, {stats['kept_local']} newer here, "
+                          f"{stats['skipped']} skipped.")
+        self.load_reminders()
+
+    def on_sync_error(self, error):
+        self._show_status("")
+        messagebox.showerror("Sync", f"Syncing failed:\n{error}")
+
+    # --- Assignment reminders ---
+
+    def load_reminders(self):
+        """Queues every pending assignment reminder (one query at startup)."""
+        self.reminders.clear()
+        for row in self.db.get_pending_reminders():
+            self.reminders.schedule(row['project_id'], self._to_epoch(row['remind_at']))
+
+    def reschedule_reminder(self, project_id):
+        """Re-arms (or drops) one assignment's reminder after it was edited."""
+        self.reminders.cancel(project_id)
+        for row in self.db.get_pending_reminders(project_id):
+            self.reminders.schedule(project_id, self._to_epoch(row['remind_at']))
+
+    def on_assignment_reminder(self, project_id):
+        assignment = self.db.get_assignment(project_id)
+        if assignment is None or assignment['due_at'] is None:
+            return
+        self.db.mark_assignment_reminded(project_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        due = datetime.strptime(assignment['due_at'], "%Y-%m-%d %H:%M:%S")
+        messagebox.showinfo(
+            "Assignment Reminder",
+            f"'{assignment['name']}' is due {due.strftime('%A %d %B at %H:%M')}.\n"
+            f"Status: {assignment['status']}"
+        )
+
+    @staticmethod
+    def _to_epoch(timestamp):
+        return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").timestamp()
+
     # --- NEW: Main window flow control functions ---
 
     def show_home_screen(self):
@@ -55,7 +301,9 @@ class MainApplication(tk.Tk):
             self.current_project_window.destroy()
             self.current_project_window = None
 
-        self.home_frame = HomeScreen(self, base_dir=self.base_dir, db_manager=self.db)
+        self.home_frame = HomeScreen(self, base_dir=self.base_dir, db_manager=self.db,
+                                     executor=self.executor, change_watcher=self.change_watcher,
+                                     journal=self.journal, extraction_queue=self.extraction_queue)
         self.home_frame.pack(fill="both", expand=True)
         self.current_frame = self.home_frame
 
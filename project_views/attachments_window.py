@@ -0,0 +1,161 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import subprocess
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+from utils.attachment_store import ATTACHMENT_SERIAL, attach_files, collect_garbage
+
+SOURCE_FILE_TYPES = [
+    ("Reading sources", "*.pdf *.epub *.txt *.md"),
+    ("All files", "*.*"),
+]
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def open_with_system(path):
+    """Opens a file in the program the OS associates with it."""
+    if sys.platform.startswith("win"):
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+
+class AttachmentsWindow(tk.Toplevel):
+    """
+    The source files (PDF, EPUB, text) attached to one reading.
+    Files are copied into the attachment store on the task executor, so
+    attaching a large book never blocks the window.
+    """
+
+    def __init__(self, parent, db_manager, store, executor, extraction_queue, reading, on_changed=None):
+        """
+        :param on_changed: Called with the reading id after files are attached or removed
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.db = db_manager
+        self.store = store
+        self.executor = executor
+        self.extraction_queue = extraction_queue
+        self.on_changed = on_changed
+        self.reading_id = reading['id']
+        self.attach_task = None
+        self.title(f"Attachments - {reading['title']}")
+        self.geometry("560x300")
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=("size", "status", "added"), selectmode="browse")
+        self.tree.heading("#0", text="File")
+        self.tree.heading("size", text="Size")
+        self.tree.heading("status", text="Status")
+        self.tree.heading("added", text="Added")
+        self.tree.column("size", width=80, anchor="e", stretch=False)
+        self.tree.column("status", width=70, stretch=False)
+        self.tree.column("added", width=130, stretch=False)
+        self.tree.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
+
+        button_frame = ttk.Frame(self)
+        button_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0, 5))
+        ttk.Button(button_frame, text="Attach Files...", command=self.attach).pack(side="left", padx=2)
+        ttk.Button(button_frame, text="Open", command=self.open_selected).pack(side="left", padx=2)
+        ttk.Button(button_frame, text="Remove", command=self.remove_selected).pack(side="left", padx=2)
+
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side="left", padx=10)
+
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in self.db.get_attachments(self.reading_id):
+            self.tree.insert(
+                "", "end", iid=str(row['id']), text=row['filename'],
+                values=(format_size(row['size']), row['status'].capitalize(), row['added_at'][:16])
+            )
+
+    def get_selected(self):
+        selection = self.tree.selection()
+        return self.db.get_attachment(int(selection[0])) if selection else None
+
+    def attach(self):
+        if self.attach_task is not None:
+            return
+        paths = filedialog.askopenfilenames(parent=self, title="Attach Files", filetypes=SOURCE_FILE_TYPES)
+        if not paths:
+            return
+        self.status_label.config(text="Copying...")
+        self.attach_task = self.executor.submit(
+            attach_files, self.store, self.reading_id, list(paths),
+            on_done=self.on_attach_done,
+            on_error=self.on_attach_error,
+            on_progress=lambda value: self.status_label.config(
+                text=f"Copying {value[0]}... {format_size(value[1])}"),
+            owner=self,
+            serial=ATTACHMENT_SERIAL
+        )
+
+    def on_attach_done(self, attachment_ids):
+        self.attach_task = None
+        self.status_label.config(text=f"Attached {len(attachment_ids)} file(s).")
+        self.refresh()
+        self.extraction_queue.start()  # Index their text for search
+        if self.on_changed:
+            self.on_changed(self.reading_id)
+
+    def on_attach_error(self, error):
+        self.attach_task = None
+        self.status_label.config(text="")
+        messagebox.showerror("Error", f"Attaching failed:\n{error}", parent=self)
+        self.refresh()
+
+    def open_selected(self):
+        attachment = self.get_selected()
+        if attachment is None:
+            return
+        if not self.store.exists(attachment['sha256']):
+            messagebox.showerror("Missing File", f"'{attachment['filename']}' is missing from the attachment store.",
+                                 parent=self)
+            return
+        try:
+            open_with_system(self.store.export_copy(attachment['sha256'], attachment['filename']))
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not open the file:\n{e}", parent=self)
+
+    def remove_selected(self):
+        attachment = self.get_selected()
+        if attachment is None:
+            return
+        if not messagebox.askyesno("Remove Attachment?", f"Remove '{attachment['filename']}' from this reading?",
+                                   parent=self):
+            return
+        self.db.delete_attachment(attachment['id'])
+        self.refresh()
+        if self.on_changed:
+            self.on_changed(self.reading_id)
+        # The file itself goes once no other reading uses it
+        self.executor.submit(collect_garbage, self.store, serial=ATTACHMENT_SERIAL)
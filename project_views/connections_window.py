@@ -0,0 +1,348 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import math
+import time
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+from database_manager import make_node_key, parse_node_key
+from dialogs.choose_node_dialog import ChooseNodeDialog
+from utils.graph_analytics import load_graph_analytics
+
+NODE_COLORS = {"project": "#4A6FA5", "reading": "#5CB85C", "note": "#F0AD4E"}
+PATH_COLOR = "#D9534F"
+EDGE_COLOR = "#B0B8C4"
+NODE_RADIUS = 7
+MAX_DRAWN_NODES = 300  # Rings beyond this many nodes are summarised instead of drawn
+LABEL_LENGTH = 24
+
+
+class ConnectionsWindow(tk.Toplevel):
+    """
+    Browses the connections between projects, notes and readings.
+
+    The graph is centred on one node and drawn radially: ring n holds the
+    nodes n links away. Every view is a handful of indexed queries, so it
+    stays fast regardless of how large the library is.
+    """
+
+    def __init__(self, parent, db_manager, project_id=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.db = db_manager
+        self.title("Connections")
+        self.geometry("1000x650")
+
+        self.center_key = None
+        self.path_keys = []
+        self.node_positions = {}  # node_key -> (x, y) on the canvas
+        self.item_keys = {}  # canvas item -> node_key
+
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # --- Toolbar ---
+        toolbar = ttk.Frame(self)
+        toolbar.grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+
+        ttk.Button(toolbar, text="Centre On...", command=self.choose_center).pack(side="left", padx=2)
+
+        ttk.Label(toolbar, text="Hops:").pack(side="left", padx=(10, 2))
+        self.hops_var = tk.IntVar(value=2)
+        hops_spin = ttk.Spinbox(toolbar, from_=1, to=8, width=3, textvariable=self.hops_var,
+                                command=self.refresh_graph)
+        hops_spin.pack(side="left")
+
+        self.center_label = ttk.Label(toolbar, text="", font=("Arial", 10, "bold"))
+        self.center_label.pack(side="left", padx=10)
+
+        # --- Graph canvas ---
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew", padx=5)
+        self.canvas.bind("<Configure>", lambda e: self.draw_graph())
+        self.canvas.tag_bind("node", "<Button-1>", self.on_node_click)
+
+        # --- Side panel: direct connections and library-wide analytics ---
+        side_notebook = ttk.Notebook(self)
+        side_notebook.grid(row=1, column=1, sticky="nsew", padx=5)
+        side_frame = ttk.Frame(side_notebook)
+        side_notebook.add(side_frame, text="Connected To")
+        side_frame.grid_rowconfigure(0, weight=1)
+        side_frame.grid_columnconfigure(0, weight=1)
+
+        self.neighbor_tree = ttk.Treeview(side_frame, columns=("label",), selectmode="browse")
+        self.neighbor_tree.heading("#0", text="Item")
+        self.neighbor_tree.heading("label", text="Label")
+        self.neighbor_tree.column("#0", width=200)
+        self.neighbor_tree.column("label", width=100)
+        self.neighbor_tree.grid(row=0, column=0, sticky="nsew")
+        self.neighbor_tree.bind("<Double-1>", self.on_neighbor_double_click)
+
+        neighbor_scroll = ttk.Scrollbar(side_frame, orient="vertical", command=self.neighbor_tree.yview)
+        self.neighbor_tree.configure(yscrollcommand=neighbor_scroll.set)
+        neighbor_scroll.grid(row=0, column=1, sticky="ns")
+
+        button_frame = ttk.Frame(side_frame)
+        button_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=5)
+        button_frame.columnconfigure(0, weight=1)
+        button_frame.columnconfigure(1, weight=1)
+
+        ttk.Button(button_frame, text="Add Connection...", command=self.add_connection).grid(
+            row=0, column=0, padx=2, sticky="ew")
+        ttk.Button(button_frame, text="Remove", command=self.remove_connection).grid(
+            row=0, column=1, padx=2, sticky="ew")
+        ttk.Button(button_frame, text="Find Path To...", command=self.find_path).grid(
+            row=1, column=0, columnspan=2, padx=2, pady=(5, 0), sticky="ew")
+
+        analytics_frame = ttk.Frame(side_notebook)
+        side_notebook.add(analytics_frame, text="Analytics")
+        analytics_frame.grid_rowconfigure(0, weight=1)
+        analytics_frame.grid_columnconfigure(0, weight=1)
+
+        self.analytics_tree = ttk.Treeview(analytics_frame, columns=("detail",), selectmode="browse")
+        self.analytics_tree.heading("#0", text="Item")
+        self.analytics_tree.heading("detail", text="")
+        self.analytics_tree.column("#0", width=220)
+        self.analytics_tree.column("detail", width=80)
+        self.analytics_tree.grid(row=0, column=0, sticky="nsew")
+        self.analytics_tree.bind("<Double-1>", self.on_analytics_double_click)
+
+        analytics_scroll = ttk.Scrollbar(analytics_frame, orient="vertical", command=self.analytics_tree.yview)
+        self.analytics_tree.configure(yscrollcommand=analytics_scroll.set)
+        analytics_scroll.grid(row=0, column=1, sticky="ns")
+
+        side_notebook.bind("<<NotebookTabChanged>>", self.on_side_tab_changed)
+
+        self.status_label = ttk.Label(self, text="Choose an item to centre the graph on.")
+        self.status_label.grid(row=2, column=0, columnspan=2, sticky="w", padx=5, pady=(0, 5))
+
+        self.graph = None
+        if project_id is not None:
+            self.set_center(make_node_key("project", project_id))
+
+    # --- Choosing the centre ---
+
+    def choose_center(self):
+        dialog = ChooseNodeDialog(self, self.db, title="Centre Graph On")
+        self.wait_window(dialog)
+        if dialog.result:
+            self.set_center(dialog.result[0])
+
+    def set_center(self, node_key):
+        self.center_key = node_key
+        self.path_keys = []
+        self.refresh_graph()
+
+    def on_node_click(self, event):
+        item = self.canvas.find_withtag("current")
+        node_key = self.item_keys.get(item[0]) if item else None
+        if node_key and node_key != self.center_key:
+            self.set_center(node_key)
+
+    def on_neighbor_double_click(self, event):
+        iid = self.neighbor_tree.identify_row(event.y)
+        if iid:
+            self.set_center(self.neighbor_tree.item(iid, "values")[1])
+
+    # --- Loading ---
+
+    def refresh_graph(self):
+        """Queries the neighbourhood of the centre node and redraws."""
+        if self.center_key is None:
+            return
+        try:
+            max_hops = int(self.hops_var.get())
+        except (tk.TclError, ValueError):
+            max_hops = 2
+
+        started = time.perf_counter()
+        reachable = self.db.get_reachable_nodes(self.center_key, max_hops)
+        hops = {row['node_key']: row['hops'] for row in reachable}
+        drawn = [row['node_key'] for row in reachable[:MAX_DRAWN_NODES]]
+        drawn += [key for key in self.path_keys if key in hops and key not in drawn]
+        edges = self.db.get_connections_among(drawn)
+        neighbors = self.db.get_connection_neighbors(self.center_key)
+        labels = self.db.get_node_labels(set(drawn) | {row['neighbor_key'] for row in neighbors} | set(self.path_keys))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.graph = {'hops': hops, 'drawn': drawn, 'edges': edges, 'labels': labels, 'max_hops': max_hops}
+        self.center_label.config(text=labels.get(self.center_key, self.center_key))
+
+        # --- Side panel ---
+        self.neighbor_tree.delete(*self.neighbor_tree.get_children())
+        for row in sorted(neighbors, key=lambda r: labels.get(r['neighbor_key'], "").lower()):
+            key = row['neighbor_key']
+            self.neighbor_tree.insert(
+                "", "end", iid=str(row['id']),
+                text=labels.get(key, key),
+                values=(row['label'], key),
+                tags=(parse_node_key(key)[0],)
+            )
+
+        status = (f"{len(neighbors)} direct connections, {len(hops) - 1} items within "
+                  f"{max_hops} hops ({elapsed_ms:.1f} ms)")
+        if len(hops) > len(drawn):
+            status += f" - showing the nearest {len(drawn)}"
+        self.status_label.config(text=status)
+        self.draw_graph()
+
+    # --- Drawing ---
+
+    def draw_graph(self):
+        """Lays the loaded nodes out in rings around the centre and draws them."""
+        self.canvas.delete("all")
+        self.item_keys.clear()
+        self.node_positions.clear()
+        if not self.graph:
+            return
+
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        center_x, center_y = width / 2, height / 2
+        ring_gap = min(width, height) / (2 * self.graph['max_hops'] + 1)
+        hops = self.graph['hops']
+
+        rings = {}
+        for key in self.graph['drawn']:
+            rings.setdefault(hops[key], []).append(key)
+
+        # Order each ring by the angle of the node it was reached through,
+        # so branches stay together and edges don't criss-cross the centre
+        inner_neighbor = {}
+        for row in self.graph['edges']:
+            a, b = row['source_key'], row['target_key']
+            if hops[a] > hops[b]:
+                a, b = b, a
+            if hops[b] == hops[a] + 1:
+                inner_neighbor.setdefault(b, a)
+
+        angles = {self.center_key: 0.0}
+        self.node_positions[self.center_key] = (center_x, center_y)
+        for ring in sorted(r for r in rings if r > 0):
+            keys = sorted(rings[ring], key=lambda k: (angles.get(inner_neighbor.get(k), 0.0), k))
+            radius = ring * ring_gap
+            for index, key in enumerate(keys):
+                angle = 2 * math.pi * index / len(keys)
+                angles[key] = angle
+                self.node_positions[key] = (center_x + radius * math.cos(angle),
+                                            center_y + radius * math.sin(angle))
+
+        path_edges = {frozenset(pair) for pair in zip(self.path_keys, self.path_keys[1:])}
+        for row in self.graph['edges']:
+            a = self.node_positions.get(row['source_key'])
+            b = self.node_positions.get(row['target_key'])
+            if a and b:
+                on_path = frozenset((row['source_key'], row['target_key'])) in path_edges
+                self.canvas.create_line(*a, *b, fill=PATH_COLOR if on_path else EDGE_COLOR,
+                                        width=3 if on_path else 1)
+
+        labels = self.graph['labels']
+        show_labels = len(self.node_positions) <= 80
+        for key, (x, y) in self.node_positions.items():
+            kind = parse_node_key(key)[0]
+            radius = NODE_RADIUS * (1.6 if key == self.center_key else 1)
+            outline = PATH_COLOR if key in self.path_keys else "white"
+            item = self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                           fill=NODE_COLORS.get(kind, "gray"), outline=outline,
+                                           width=2, tags=("node",))
+            self.item_keys[item] = key
+            if show_labels or key == self.center_key or hops.get(key) == 1:
+                text = labels.get(key, key)
+                if len(text) > LABEL_LENGTH:
+                    text = text[:LABEL_LENGTH - 1] + "…"
+                label_item = self.canvas.create_text(x, y + radius + 8, text=text, font=("Arial", 8), tags=("node",))
+                self.item_keys[label_item] = key
+
+    # --- Analytics ---
+
+    def on_side_tab_changed(self, event):
+        if event.widget.index("current") == 1:
+            self.refresh_analytics()
+
+    def refresh_analytics(self):
+        """Fills the analytics tab (cached until the connections change)."""
+        analytics = load_graph_analytics(self.db)
+        project_keys = [make_node_key("project", project_id) for cluster in analytics['clusters'] for project_id in cluster]
+        labels = self.db.get_node_labels([key for key, _ in analytics['central']] + project_keys)
+
+        tree = self.analytics_tree
+        tree.delete(*tree.get_children())
+
+        central = tree.insert("", "end", text="Most Central", values=("Score",), open=True)
+        for key, score in analytics['central']:
+            if key in labels:
+                tree.insert(central, "end", text=labels[key], values=(f"{score * 100:.2f}", key))
+
+        clusters = tree.insert("", "end", text=f"Clusters ({len(analytics['clusters'])})", values=("Projects",))
+        for number, cluster in enumerate(analytics['clusters'], start=1):
+            cluster_iid = tree.insert(clusters, "end", text=f"Cluster {number}", values=(len(cluster),))
+            for project_id in cluster:
+                key = make_node_key("project", project_id)
+                tree.insert(cluster_iid, "end", text=labels.get(key, key), values=("", key))
+
+        shared = tree.insert("", "end", text=f"Readings Shared Across Classes ({len(analytics['shared_readings'])})",
+                             values=("Classes",))
+        for title, class_names in analytics['shared_readings']:
+            reading_iid = tree.insert(shared, "end", text=title, values=(len(class_names),))
+            for class_name in class_names:
+                tree.insert(reading_iid, "end", text=class_name)
+
+    def on_analytics_double_click(self, event):
+        iid = self.analytics_tree.identify_row(event.y)
+        values = self.analytics_tree.item(iid, "values") if iid else ()
+        if len(values) > 1 and values[1]:
+            self.set_center(values[1])
+
+    # --- Editing ---
+
+    def add_connection(self):
+        if self.center_key is None:
+            messagebox.showinfo("Connections", "Choose an item to connect from first.", parent=self)
+            return
+        dialog = ChooseNodeDialog(self, self.db, title="Add Connection", ask_label=True)
+        self.wait_window(dialog)
+        if not dialog.result:
+            return
+        target_key, label = dialog.result
+        if target_key == self.center_key:
+            messagebox.showwarning("Connections", "An item cannot be connected to itself.", parent=self)
+            return
+        self.db.add_connection(self.center_key, target_key, label)
+        self.refresh_graph()
+
+    def remove_connection(self):
+        selection = self.neighbor_tree.selection()
+        if not selection:
+            return
+        name = self.neighbor_tree.item(selection[0], "text")
+        if messagebox.askyesno("Remove Connection?", f"Remove the connection to '{name}'?", parent=self):
+            self.db.delete_connection(int(selection[0]))
+            self.refresh_graph()
+
+    def find_path(self):
+        if self.center_key is None:
+            return
+        dialog = ChooseNodeDialog(self, self.db, title="Find Path To")
+        self.wait_window(dialog)
+        if not dialog.result:
+            return
+
+        path = self.db.find_connection_path(self.center_key, dialog.result[0])
+        if path is None:
+            messagebox.showinfo("Find Path", "These items are not connected.", parent=self)
+            return
+
+        self.path_keys = path
+        # Make sure the whole path is within the drawn rings
+        self.hops_var.set(max(int(self.hops_var.get()), len(path) - 1))
+        self.refresh_graph()
+        labels = self.graph['labels']
+        self.status_label.config(text="Path: " + "  →  ".join(labels.get(key, key) for key in path))
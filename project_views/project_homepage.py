@@ -90,10 +90,18 @@ class ProjectWindow(tk.Toplevel):
         btn_add_reading = ttk.Button(
             button_bar_frame,
             text="Add Reading",
-            command=self.add_reading_placeholder
+            command=self.add_reading
         )
         btn_add_reading.pack(side="left", padx=10, pady=5)
 
+        # --- (1c) "Log Session" Button ---
+        btn_log_session = ttk.Button(
+            button_bar_frame,
+            text="Log Session",
+            command=self.log_session
+        )
+        btn_log_session.pack(side="left", padx=10, pady=5)
+
         # --- Content Frame (Tabs + Logo) ---
         content_frame = ttk.Frame(main_frame)
         content_frame.grid(row=1, column=0, sticky="nsew")
@@ -128,16 +136,21 @@ class ProjectWindow(tk.Toplevel):
 
         # --- Tab 1: Project Dashboard (Permanent) ---
         # Pass the db manager to the tab
-        self.dashboard_tab = ProjectDashboardTab(self.notebook, self.project_details, self.db)
+        self.dashboard_tab = ProjectDashboardTab(
+            self.notebook, self.project_details, self.db, self.parent.executor, self.parent.change_watcher,
+            self.parent.attachment_store, self.parent.extraction_queue, self.parent.thumbnail_cache
+        )
         self.notebook.add(self.dashboard_tab, text="Project Dashboard")
 
         # --- Tab 2: Mindmaps (Permanent) ---
-        self.mindmap_tab = MindmapTab(self.notebook, self.project_details)
+        self.mindmap_tab = MindmapTab(self.notebook, self.project_details, self.db, self.parent.executor)
         self.notebook.add(self.mindmap_tab, text="Mindmaps")
 
         # --- Tab 3: Assignment (Conditional) ---
         if self.project_details['is_assignment'] == 1:
-            self.assignment_tab = AssignmentTab(self.notebook, self.project_details)
+            self.assignment_tab = AssignmentTab(
+                self.notebook, self.project_details, self.db, on_change=self.parent.reschedule_reminder
+            )
             self.notebook.add(self.assignment_tab, text="Assignment")
 
         # Make sure the window gets focus
@@ -150,7 +163,8 @@ class ProjectWindow(tk.Toplevel):
         Saves any pending data (optional) and
         calls the callback to show the home screen.
         """
-        # NOTE: Add any "auto-save" logic here if needed
+        # Write any mindmap edits that are still waiting for an idle moment
+        self.mindmap_tab.flush_changes()
 
         # Call the callback function provided by MainApplication
         self.on_close_callback()
@@ -158,12 +172,13 @@ class ProjectWindow(tk.Toplevel):
         # Destroy this project window
         self.destroy()
 
-    def add_reading_placeholder(self):
-        """Placeholder for the 'Add Reading' button."""
-        messagebox.showinfo(
-            "Add Reading",
-            "This will open the 'Add Reading' dialog for this project."
-        )
+    def add_reading(self):
+        """Opens the 'Add Reading' dialog for this project."""
+        self.dashboard_tab.add_reading()
+
+    def log_session(self):
+        """Opens the 'Log Reading Session' dialog for this project."""
+        self.dashboard_tab.log_session()
 
     # --- NEW FUNCTION for Settings Menu ---
     def open_edit_instructions_dialog(self):
@@ -0,0 +1,102 @@
+import tkinter as tk
+from tkinter import ttk
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+SEARCH_DELAY_MS = 300  # Typing pause before the search runs
+MAX_RESULTS = 100
+
+
+class SourceSearchWindow(tk.Toplevel):
+    """
+    Full-text search over the attached files of every reading (their text
+    is extracted in the background into an FTS5 index). Each hit shows the
+    reading, its project and a snippet of the best-matching passage.
+    """
+
+    def __init__(self, parent, db_manager, on_open_project=None):
+        """
+        :param on_open_project: Called with the project row when a result is double-clicked
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.db = db_manager
+        self.on_open_project = on_open_project
+        self._search_job = None
+        self.title("Search Attached Files")
+        self.geometry("750x420")
+
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        search_frame = ttk.Frame(self)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+        search_frame.columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="Search:").grid(row=0, column=0, padx=(0, 5))
+        self.query_entry = ttk.Entry(search_frame)
+        self.query_entry.grid(row=0, column=1, sticky="ew")
+        self.query_entry.bind("<KeyRelease>", self.schedule_search)
+        self.query_entry.bind("<Return>", lambda e: self.run_search())
+        self.query_entry.focus_set()
+
+        self.tree = ttk.Treeview(self, columns=("project", "file", "snippet"), selectmode="browse")
+        self.tree.heading("#0", text="Reading")
+        self.tree.heading("project", text="Project")
+        self.tree.heading("file", text="File")
+        self.tree.heading("snippet", text="Match")
+        self.tree.column("#0", width=160)
+        self.tree.column("project", width=120)
+        self.tree.column("file", width=130)
+        self.tree.column("snippet", width=320)
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=(5, 0), pady=(0, 5))
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=1, column=1, sticky="ns", pady=(0, 5))
+
+        self.status_label = ttk.Label(self, text="")
+        self.status_label.grid(row=2, column=0, columnspan=2, sticky="w", padx=5, pady=(0, 5))
+
+        self.project_ids = {}  # tree iid -> project id
+
+    def schedule_search(self, event=None):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self._search_job = None
+        self.tree.delete(*self.tree.get_children())
+        self.project_ids.clear()
+        query = self.query_entry.get().strip()
+        if not query:
+            self.status_label.config(text="")
+            return
+
+        results = self.db.search_attachment_text(query, MAX_RESULTS)
+        for row in results:
+            iid = str(row['attachment_id'])
+            snippet = " ".join(row['snippet'].split())
+            self.tree.insert("", "end", iid=iid, text=row['title'],
+                             values=(row['project_name'], row['filename'], snippet))
+            self.project_ids[iid] = row['project_id']
+        pending = self.db.count_open_extraction_jobs()
+        note = f" ({pending} file(s) still being indexed)" if pending else ""
+        self.status_label.config(text=f"{len(results)} match(es){note}")
+
+    def open_selected(self):
+        selection = self.tree.selection()
+        if not selection or self.on_open_project is None:
+            return
+        project = self.db.get_item_details(self.project_ids[selection[0]])
+        if project is not None:
+            self.on_open_project(project)
@@ -0,0 +1,266 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+STATUS_COLORS = {
+    "Not Started": "#F8D7DA",
+    "In Progress": "#FFF3CD",
+    "Submitted": "#D1E7DD",
+    "Graded": "#CFE2FF",
+}
+CACHE_WINDOWS = 16  # Most recently used windows kept in memory
+HEADER_HEIGHT = 40
+CARD_HEIGHT = 38
+CARD_GAP = 4
+
+
+def window_start(day, mode):
+    """First day of the week (Monday) or month containing day."""
+    if mode == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def shift_window(start, mode, steps):
+    """The start of the window steps windows before/after start."""
+    if mode == "week":
+        return start + timedelta(weeks=steps)
+    month_index = start.year * 12 + start.month - 1 + steps
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def fetch_windows(ctx, windows):
+    """Background task: the assignments of each (key, start, end) window, as {key: rows}."""
+    return {key: ctx.db.get_assignments_between(start_at, end_at) for key, start_at, end_at in windows}
+
+
+class TimelineWindow(tk.Toplevel):
+    """
+    Timeline of every assignment across all classes, one week or month at a time.
+
+    Each window is fetched with a single due-date range query on the
+    assignments index. Windows are kept in a small LRU cache, and the
+    windows either side of the visible one are prefetched on a worker
+    thread, so stepping through the timeline rarely waits on the database.
+    """
+
+    def __init__(self, parent, db_manager, executor, on_open_project=None):
+        """
+        :param on_open_project: Called with the project row when an assignment is double-clicked
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.db = db_manager
+        self.executor = executor
+        self.on_open_project = on_open_project
+        self.title("Assignment Timeline")
+        self.geometry("1000x550")
+
+        self.mode = tk.StringVar(value="week")
+        self.start = window_start(date.today(), "week")
+        self.cache = OrderedDict()  # (mode, start) -> rows
+        self.rows = []  # Assignments of the visible window
+        self._prefetch_task = None
+        self.card_projects = {}  # canvas item -> project id
+
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # --- Toolbar ---
+        toolbar = ttk.Frame(self)
+        toolbar.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+
+        ttk.Button(toolbar, text="|<", width=3, command=lambda: self.go_to_end(first=True)).pack(side="left", padx=2)
+        ttk.Button(toolbar, text="<", width=3, command=lambda: self.step(-1)).pack(side="left", padx=2)
+        ttk.Button(toolbar, text="Today", command=self.go_to_today).pack(side="left", padx=2)
+        ttk.Button(toolbar, text=">", width=3, command=lambda: self.step(1)).pack(side="left", padx=2)
+        ttk.Button(toolbar, text=">|", width=3, command=lambda: self.go_to_end(first=False)).pack(side="left", padx=2)
+
+        ttk.Radiobutton(toolbar, text="Week", variable=self.mode, value="week",
+                        command=self.on_mode_changed).pack(side="left", padx=(15, 2))
+        ttk.Radiobutton(toolbar, text="Month", variable=self.mode, value="month",
+                        command=self.on_mode_changed).pack(side="left", padx=2)
+
+        self.range_label = ttk.Label(toolbar, text="", font=("Arial", 11, "bold"))
+        self.range_label.pack(side="left", padx=15)
+
+        ttk.Button(toolbar, text="Refresh", command=self.refresh).pack(side="right", padx=2)
+
+        # --- Canvas ---
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew", padx=5)
+        self.canvas.bind("<Configure>", lambda e: self.draw())
+        self.canvas.bind("<MouseWheel>", lambda e: self.step(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self.step(-1))
+        self.canvas.bind("<Button-5>", lambda e: self.step(1))
+        self.canvas.tag_bind("card", "<Double-1>", self.on_card_double_click)
+        self.bind("<Left>", lambda e: self.step(-1))
+        self.bind("<Right>", lambda e: self.step(1))
+
+        self.status_label = ttk.Label(self, text="")
+        self.status_label.grid(row=2, column=0, sticky="w", padx=5, pady=(0, 5))
+
+        self.show_window()
+
+    # --- Navigation ---
+
+    def step(self, steps):
+        self.start = shift_window(self.start, self.mode.get(), steps)
+        self.show_window()
+
+    def go_to_today(self):
+        self.start = window_start(date.today(), self.mode.get())
+        self.show_window()
+
+    def go_to_end(self, first):
+        """Jumps to the window holding the earliest or latest assignment."""
+        earliest, latest = self.db.get_assignment_date_range()
+        target = earliest if first else latest
+        if target is None:
+            return
+        self.start = window_start(datetime.strptime(target, "%Y-%m-%d %H:%M:%S").date(), self.mode.get())
+        self.show_window()
+
+    def on_mode_changed(self):
+        self.start = window_start(self.start, self.mode.get())
+        self.show_window()
+
+    def refresh(self):
+        """Drops every cached window (e.g. after editing assignments) and reloads."""
+        self.cache.clear()
+        self.show_window()
+
+    # --- Data ---
+
+    def window_bounds(self, start, mode):
+        end = shift_window(start, mode, 1)
+        return f"{start.isoformat()} 00:00:00", f"{end.isoformat()} 00:00:00"
+
+    def get_window(self, start, mode):
+        """Rows of one window, from the LRU cache or a single range query."""
+        key = (mode, start)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        rows = self.db.get_assignments_between(*self.window_bounds(start, mode))
+        self.store_window(key, rows)
+        return rows
+
+    def store_window(self, key, rows):
+        self.cache[key] = rows
+        while len(self.cache) > CACHE_WINDOWS:
+            self.cache.popitem(last=False)
+
+    def schedule_prefetch(self):
+        """Loads the neighbouring windows on a worker thread once the current one is on screen."""
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+        mode = self.mode.get()
+        windows = []
+        for steps in (1, -1):
+            neighbor = shift_window(self.start, mode, steps)
+            if (mode, neighbor) not in self.cache:
+                windows.append(((mode, neighbor), *self.window_bounds(neighbor, mode)))
+        if windows:
+            self._prefetch_task = self.executor.submit(
+                fetch_windows, windows,
+                on_done=self.on_prefetched,
+                owner=self
+            )
+
+    def on_prefetched(self, windows):
+        self._prefetch_task = None
+        for key, rows in windows.items():
+            if key not in self.cache:
+                self.store_window(key, rows)
+        # Keep the visible window the most recently used one
+        visible = (self.mode.get(), self.start)
+        if visible in self.cache:
+            self.cache.move_to_end(visible)
+
+    # --- Drawing ---
+
+    def show_window(self):
+        mode = self.mode.get()
+        end = shift_window(self.start, mode, 1) - timedelta(days=1)
+        if mode == "week":
+            self.range_label.config(text=f"{self.start.strftime('%d %b %Y')} - {end.strftime('%d %b %Y')}")
+        else:
+            self.range_label.config(text=self.start.strftime("%B %Y"))
+
+        self.rows = self.get_window(self.start, mode)
+        self.status_label.config(text=f"{len(self.rows)} assignment{'s' if len(self.rows) != 1 else ''} due")
+        self.draw()
+        self.schedule_prefetch()
+
+    def draw(self):
+        """Draws one column per day with the assignments due that day as cards."""
+        self.canvas.delete("all")
+        self.card_projects.clear()
+
+        mode = self.mode.get()
+        days = (shift_window(self.start, mode, 1) - self.start).days
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        column_width = width / days
+        today = date.today()
+
+        by_day = {}
+        for row in self.rows:
+            due = datetime.strptime(row['due_at'], "%Y-%m-%d %H:%M:%S")
+            by_day.setdefault((due.date() - self.start).days, []).append((due, row))
+
+        for index in range(days):
+            day = self.start + timedelta(days=index)
+            x0 = index * column_width
+            fill = "#EEF4FB" if day == today else ("#FAFAFA" if day.weekday() >= 5 else "white")
+            self.canvas.create_rectangle(x0, 0, x0 + column_width, height, fill=fill, outline="#E0E0E0")
+            header = day.strftime("%a %d") if mode == "week" else day.strftime("%d")
+            self.canvas.create_text(x0 + column_width / 2, HEADER_HEIGHT / 2, text=header,
+                                    font=("Arial", 9, "bold" if day == today else "normal"))
+
+            y = HEADER_HEIGHT
+            cards = by_day.get(index, [])
+            for shown, (due, row) in enumerate(cards):
+                if y + CARD_HEIGHT > height - CARD_HEIGHT and shown < len(cards) - 1:
+                    self.canvas.create_text(x0 + column_width / 2, y + 8, text=f"+{len(cards) - shown} more",
+                                            font=("Arial", 8), fill="gray")
+                    break
+                self.draw_card(x0 + 2, y, column_width - 4, due, row, compact=(mode == "month"))
+                y += CARD_HEIGHT + CARD_GAP
+
+    def draw_card(self, x, y, width, due, row, compact):
+        rect = self.canvas.create_rectangle(
+            x, y, x + width, y + CARD_HEIGHT,
+            fill=STATUS_COLORS.get(row['status'], "#EEEEEE"), outline="#B0B8C4", tags=("card",)
+        )
+        text = row['name'] if compact else f"{due.strftime('%H:%M')} {row['name']}\n{row['class_name'] or ''}"
+        label = self.canvas.create_text(
+            x + 4, y + CARD_HEIGHT / 2, text=text, anchor="w", width=width - 8,
+            font=("Arial", 8), tags=("card",)
+        )
+        self.card_projects[rect] = row['project_id']
+        self.card_projects[label] = row['project_id']
+
+    def on_card_double_click(self, event):
+        item = self.canvas.find_withtag("current")
+        project_id = self.card_projects.get(item[0]) if item else None
+        if project_id is None or self.on_open_project is None:
+            return
+        project_details = self.db.get_item_details(project_id)
+        if project_details:
+            self.on_open_project(project_details)
+        else:
+            messagebox.showerror("Error", f"Could not load project with ID {project_id}", parent=self)
@@ -0,0 +1,142 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+
+def purge_trash(ctx, item_id=None):
+    """
+    Background task: empties the Trash (or one trashed item) a chunk at a time.
+    Each chunk is its own short transaction, so other writers are never held up.
+    """
+    total = 0
+    while True:
+        ctx.check_cancelled()
+        removed = ctx.db.purge_trash_chunk(item_id)
+        if not removed:
+            return total
+        total += removed
+        ctx.report_progress(total)
+
+
+class TrashWindow(tk.Toplevel):
+    """
+    Lists deleted classes and projects. They can be restored, or purged for
+    good on the task executor while the app stays responsive.
+    """
+
+    def __init__(self, parent, db_manager, executor, on_restored=None):
+        """
+        :param on_restored: Called with (item_id, name) after an item is restored
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.db = db_manager
+        self.executor = executor
+        self.on_restored = on_restored
+        self.purge_task = None
+        self.title("Trash")
+        self.geometry("600x400")
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=("type", "items", "deleted"), selectmode="browse")
+        self.tree.heading("#0", text="Name")
+        self.tree.heading("type", text="Type")
+        self.tree.heading("items", text="Items")
+        self.tree.heading("deleted", text="Deleted")
+        self.tree.column("type", width=70, stretch=False)
+        self.tree.column("items", width=50, anchor="e", stretch=False)
+        self.tree.column("deleted", width=140, stretch=False)
+        self.tree.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.tree.bind("<Double-1>", lambda e: self.restore_selected())
+
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
+
+        button_frame = ttk.Frame(self)
+        button_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=(0, 5))
+        ttk.Button(button_frame, text="Restore", command=self.restore_selected).pack(side="left", padx=2)
+        ttk.Button(button_frame, text="Delete Permanently",
+                   command=self.purge_selected).pack(side="left", padx=2)
+        ttk.Button(button_frame, text="Empty Trash", command=self.empty_trash).pack(side="left", padx=2)
+
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side="left", padx=10)
+
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in self.db.get_trash_items():
+            self.tree.insert(
+                "", "end", iid=str(row['id']), text=row['name'],
+                values=(row['type'].capitalize(), row['item_count'], row['deleted_at'][:16])
+            )
+        if not self.tree.get_children() and self.purge_task is None:
+            self.status_label.config(text="The Trash is empty.")
+
+    def get_selected(self):
+        selection = self.tree.selection()
+        if not selection:
+            return None, None
+        return int(selection[0]), self.tree.item(selection[0], 'text')
+
+    def restore_selected(self):
+        item_id, name = self.get_selected()
+        if item_id is None or self.purge_task is not None:
+            return
+        self.db.restore_item(item_id)
+        self.status_label.config(text=f"Restored '{name}'.")
+        self.refresh()
+        if self.on_restored:
+            self.on_restored(item_id, name)
+
+    def purge_selected(self):
+        item_id, name = self.get_selected()
+        if item_id is None:
+            return
+        if messagebox.askyesno("Delete Permanently?",
+                               f"'{name}' and everything in it will be deleted for good. Continue?", parent=self):
+            self.start_purge(item_id)
+
+    def empty_trash(self):
+        if not self.tree.get_children():
+            return
+        if messagebox.askyesno("Empty Trash?",
+                               "Everything in the Trash will be deleted for good. Continue?", parent=self):
+            self.start_purge(None)
+
+    def start_purge(self, item_id):
+        if self.purge_task is not None:
+            return
+        self.status_label.config(text="Deleting...")
+        self.purge_task = self.executor.submit(
+            purge_trash, item_id,
+            on_done=self.on_purge_done,
+            on_error=self.on_purge_error,
+            on_progress=lambda total: self.status_label.config(text=f"Deleting... {total} rows removed"),
+            owner=self,
+            serial=("trash",)
+        )
+
+    def on_purge_done(self, total):
+        self.purge_task = None
+        self.status_label.config(text=f"Deleted permanently ({total} rows removed).")
+        self.refresh()
+
+    def on_purge_error(self, error):
+        self.purge_task = None
+        self.status_label.config(text="")
+        messagebox.showerror("Error", f"Emptying the Trash failed:\n{error}", parent=self)
+        self.refresh()
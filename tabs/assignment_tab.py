@@ -1,36 +1,150 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+from datetime import datetime
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+from database_manager import ASSIGNMENT_STATUSES
+
+# Reminder choices -> minutes before the due time (None = no reminder)
+REMINDER_OPTIONS = {
+    "No reminder": None,
+    "1 hour before": 60,
+    "1 day before": 24 * 60,
+    "2 days before": 2 * 24 * 60,
+    "1 week before": 7 * 24 * 60,
+}
 
 
 class AssignmentTab(ttk.Frame):
     """
-    This is the placeholder frame for the "Assignment" tab.
+    The "Assignment" tab: due date, status, reminder and rubric.
     It only appears if the project is marked as an assignment.
     """
 
-    def __init__(self, parent, project_details):
+    def __init__(self, parent, project_details, db_manager, on_change=None):
+        """
+        :param on_change: Called with the project id after the assignment is saved
+                          (used to re-arm its reminder)
+        """
         super().__init__(parent)
 
         self.project_details = project_details
+        self.project_id = project_details['id']
+        self.db = db_manager
+        self.on_change = on_change
+
+        assignment = self.db.get_or_create_assignment(self.project_id)
 
         # Configure grid for this frame
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
 
-        # --- Placeholder Content ---
         main_frame = ttk.Frame(self)
         main_frame.grid(sticky="nsew", padx=10, pady=10)
+        main_frame.grid_columnconfigure(1, weight=1)
+        main_frame.grid_rowconfigure(6, weight=1)
 
         label_title = ttk.Label(
             main_frame,
             text="Assignment Details",
             font=("Arial", 18, "bold")
         )
-        label_title.pack(pady=10)
+        label_title.grid(row=0, column=0, columnspan=2, sticky="w", pady=10)
 
-        label_placeholder = ttk.Label(
-            main_frame,
-            text="This tab will hold assignment-specific details like due dates, "
-                 "rubrics, and submission status."
+        due = datetime.strptime(assignment['due_at'], "%Y-%m-%d %H:%M:%S") if assignment['due_at'] else None
+
+        ttk.Label(main_frame, text="Due date (YYYY-MM-DD):").grid(row=1, column=0, sticky="w", pady=2)
+        self.date_entry = ttk.Entry(main_frame, width=12)
+        self.date_entry.grid(row=1, column=1, sticky="w", pady=2)
+
+        ttk.Label(main_frame, text="Due time (HH:MM):").grid(row=2, column=0, sticky="w", pady=2)
+        self.time_entry = ttk.Entry(main_frame, width=8)
+        self.time_entry.grid(row=2, column=1, sticky="w", pady=2)
+
+        if due:
+            self.date_entry.insert(0, due.strftime("%Y-%m-%d"))
+            self.time_entry.insert(0, due.strftime("%H:%M"))
+        else:
+            self.time_entry.insert(0, "23:59")
+
+        ttk.Label(main_frame, text="Status:").grid(row=3, column=0, sticky="w", pady=2)
+        self.status_combo = ttk.Combobox(main_frame, values=ASSIGNMENT_STATUSES, state="readonly", width=15)
+        self.status_combo.grid(row=3, column=1, sticky="w", pady=2)
+        self.status_combo.set(assignment['status'])
+
+        ttk.Label(main_frame, text="Reminder:").grid(row=4, column=0, sticky="w", pady=2)
+        self.reminder_combo = ttk.Combobox(
+            main_frame, values=list(REMINDER_OPTIONS.keys()), state="readonly", width=15
+        )
+        self.reminder_combo.grid(row=4, column=1, sticky="w", pady=2)
+        reminder_label = next(
+            (label for label, minutes in REMINDER_OPTIONS.items() if minutes == assignment['remind_minutes_before']),
+            f"{assignment['remind_minutes_before']} minutes before"
         )
-        label_placeholder.pack(pady=5)
+        self.reminder_combo.set(reminder_label)
+
+        ttk.Label(main_frame, text="Rubric:").grid(row=5, column=0, sticky="nw", pady=(10, 2))
+        self.rubric_text = tk.Text(main_frame, height=10, wrap="word", undo=True)
+        self.rubric_text.grid(row=6, column=0, columnspan=2, sticky="nsew")
+        self.rubric_text.insert("1.0", assignment['rubric'])
+
+        bottom_frame = ttk.Frame(main_frame)
+        bottom_frame.grid(row=7, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+
+        save_btn = ttk.Button(bottom_frame, text="Save Assignment", command=self.save)
+        save_btn.pack(side="left")
+
+        self.countdown_label = ttk.Label(bottom_frame, text="")
+        self.countdown_label.pack(side="left", padx=10)
+        self.update_countdown(due)
+
+    def update_countdown(self, due):
+        if due is None:
+            self.countdown_label.config(text="No due date set.")
+            return
+        days = (due.date() - datetime.now().date()).days
+        if days > 1:
+            text = f"Due in {days} days"
+        elif days == 1:
+            text = "Due tomorrow"
+        elif days == 0:
+            text = "Due today"
+        else:
+            text = f"Overdue by {-days} day{'s' if days < -1 else ''}"
+        self.countdown_label.config(text=text)
+
+    def save(self):
+        """Validates and stores the assignment, then notifies on_change."""
+        day = self.date_entry.get().strip()
+        due = None
+        if day:
+            try:
+                due = datetime.strptime(f"{day} {self.time_entry.get().strip() or '23:59'}", "%Y-%m-%d %H:%M")
+            except ValueError:
+                messagebox.showwarning(
+                    "Invalid Date", "Please enter the date as YYYY-MM-DD and the time as HH:MM.", parent=self
+                )
+                return
+
+        reminder = self.reminder_combo.get()
+        fields = {
+            "due_at": due.strftime("%Y-%m-%d %H:%M:%S") if due else None,
+            "status": self.status_combo.get(),
+            "rubric": self.rubric_text.get("1.0", "end-1c"),
+        }
+        if reminder in REMINDER_OPTIONS:
+            fields["remind_minutes_before"] = REMINDER_OPTIONS[reminder]
+        self.db.update_assignment(self.project_id, **fields)
+
+        self.update_countdown(due)
+        if self.on_change:
+            self.on_change(self.project_id)
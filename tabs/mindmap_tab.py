@@ -1,34 +1,712 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, simpledialog, messagebox, font
+import math
+import multiprocessing
+import queue
+
+import numpy as np
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+from utils.spatial_index import GridIndex
+from utils.mindmap_layout import run_layout_job
+
+NODE_HEIGHT = 32
+NODE_MIN_WIDTH = 80
+NODE_PADDING = 20
+NODE_FILL = "#E8F0FE"
+NODE_OUTLINE = "#4A6FA5"
+SELECTED_OUTLINE = "#D9534F"
+EDGE_COLOR = "#7A869A"
+
+MIN_SCALE = 0.05
+MAX_SCALE = 4.0
+LABEL_MIN_SCALE = 0.35  # Labels are not drawn when zoomed out further than this
+EDGE_HIT_TOLERANCE = 6  # Screen pixels
+BASE_FONT_SIZE = 10
+LAYOUT_POLL_MS = 40  # How often streamed layout frames are picked up
+FLUSH_DELAY_MS = 1500  # Edits are written this long after the last change
 
 
 class MindmapTab(ttk.Frame):
     """
-    This is the placeholder frame for the "Mindmaps" tab.
+    The "Mindmaps" tab: a pannable, zoomable mindmap editor on a Canvas.
+
+    Nodes and edges are kept in grid spatial indexes (in world coordinates).
+    Hit-testing goes through the indexes, and only the nodes and edges that
+    intersect the viewport have canvas items at all.
     """
 
-    def __init__(self, parent, project_details):
+    def __init__(self, parent, project_details, db_manager, executor):
         super().__init__(parent)
 
         self.project_details = project_details
+        self.project_id = project_details['id']
+        self.db = db_manager
+        self.executor = executor
+
+        # --- Map model (world coordinates, node x/y is the centre) ---
+        self.nodes = {}  # node_id -> {'label', 'x', 'y', 'w', 'h', 'color'}
+        self.edges = {}  # edge_id -> (source_id, target_id)
+        self.node_edges = {}  # node_id -> set of edge ids
+        self.node_index = GridIndex(cell_size=250)
+        self.edge_index = GridIndex(cell_size=250)
+
+        # --- View state ---
+        self.scale = 1.0
+        self.view_x = 0.0  # World coordinate at the canvas's left edge
+        self.view_y = 0.0  # World coordinate at the canvas's top edge
+        self.node_items = {}  # node_id -> (rect item, text item or None)
+        self.edge_items = {}  # edge_id -> line item
+        self.labels_shown = True
+        self._redraw_pending = None  # None, 'cull' or 'full'
+        self._has_been_fitted = False
+
+        # --- Interaction state ---
+        self.selected_node = None
+        self.connect_from = None
+        self._drag = None
+
+        # --- Auto-arrange state ---
+        self.new_nodes = set()  # Nodes added since the last auto-arrange
+        self._layout_process = None
+        self._layout_queue = None
+        self._layout_node_ids = []
+
+        # --- Unsaved edits (flushed in one transaction) ---
+        self.dirty_nodes = set()
+        self.deleted_nodes = set()
+        self.deleted_edges = set()
+        self._flush_job = None
+
+        self.measure_font = font.Font(family="Arial", size=BASE_FONT_SIZE)
+        self.label_font = font.Font(family="Arial", size=BASE_FONT_SIZE)
 
         # Configure grid for this frame
-        self.grid_rowconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
 
-        # --- Placeholder Content ---
-        main_frame = ttk.Frame(self)
-        main_frame.grid(sticky="nsew", padx=10, pady=10)
+        # --- Toolbar ---
+        toolbar = ttk.Frame(self)
+        toolbar.grid(row=0, column=0, sticky="ew", padx=5, pady=(5, 0))
+
+        btn_add = ttk.Button(toolbar, text="Add Node", command=self.add_node_at_center)
+        btn_add.pack(side="left", padx=2)
+
+        btn_fit = ttk.Button(toolbar, text="Fit to View", command=self.fit_to_view)
+        btn_fit.pack(side="left", padx=2)
+
+        btn_reset = ttk.Button(toolbar, text="100%", width=5, command=lambda: self.zoom_to(1.0))
+        btn_reset.pack(side="left", padx=2)
+
+        arrange_button = ttk.Menubutton(toolbar, text="Auto-Arrange")
+        arrange_menu = tk.Menu(arrange_button, tearoff=0)
+        arrange_menu.add_command(label="Force-Directed", command=lambda: self.auto_arrange('force'))
+        arrange_menu.add_command(label="Tree", command=lambda: self.auto_arrange('tree'))
+        arrange_menu.add_command(label="Around New Nodes", command=lambda: self.auto_arrange('force', incremental=True))
+        arrange_menu.add_separator()
+        arrange_menu.add_command(label="Stop", command=self.stop_layout)
+        arrange_button["menu"] = arrange_menu
+        arrange_button.pack(side="left", padx=2)
+
+        self.status_label = ttk.Label(toolbar, text="")
+        self.status_label.pack(side="right", padx=5)
+
+        # --- Canvas ---
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+
+        # --- Bindings ---
+        self.canvas.bind("<Configure>", self.on_canvas_configure)
+        self.canvas.bind("<ButtonPress-1>", self.on_press)
+        self.canvas.bind("<B1-Motion>", self.on_motion)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
+        self.canvas.bind("<Double-1>", self.on_double_click)
+        self.canvas.bind("<Button-3>", self.show_context_menu)
+        self.canvas.bind("<ButtonPress-2>", self.on_pan_start)
+        self.canvas.bind("<B2-Motion>", self.on_pan_motion)
+        self.canvas.bind("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_at(e.x, e.y, 1.1))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_at(e.x, e.y, 1 / 1.1))
+        self.canvas.bind("<Delete>", lambda e: self.delete_selected_node())
+        self.canvas.bind("<Escape>", lambda e: self.cancel_connect())
+        self.bind("<Destroy>", self.on_destroy)
+
+        self.load_map()
+
+    # --- Loading ---
+
+    def load_map(self):
+        """Loads every node and edge of this project's map."""
+        self.nodes.clear()
+        self.edges.clear()
+        self.node_edges.clear()
+        self.node_index.clear()
+        self.edge_index.clear()
+
+        for row in self.db.get_mindmap_nodes(self.project_id):
+            self._add_node_to_model(row['id'], row['label'], row['x'], row['y'], row['color'])
+        for row in self.db.get_mindmap_edges(self.project_id):
+            self._add_edge_to_model(row['id'], row['source_id'], row['target_id'])
+
+        self.schedule_redraw(full=True)
+
+    def _add_node_to_model(self, node_id, label, x, y, color=None):
+        width = max(NODE_MIN_WIDTH, self.measure_font.measure(label) + NODE_PADDING)
+        self.nodes[node_id] = {'label': label, 'x': x, 'y': y, 'w': width, 'h': NODE_HEIGHT, 'color': color}
+        self.node_edges.setdefault(node_id, set())
+        self.node_index.insert(node_id, self._node_bbox(node_id))
+
+    def _add_edge_to_model(self, edge_id, source_id, target_id):
+        if source_id not in self.nodes or target_id not in self.nodes:
+            return
+        self.edges[edge_id] = (source_id, target_id)
+        self.node_edges[source_id].add(edge_id)
+        self.node_edges[target_id].add(edge_id)
+        self.edge_index.insert(edge_id, self._edge_bbox(edge_id))
 
-        label_title = ttk.Label(
-            main_frame,
-            text="Mindmaps",
-            font=("Arial", 18, "bold")
+    def _node_bbox(self, node_id):
+        node = self.nodes[node_id]
+        half_w = node['w'] / 2
+        half_h = node['h'] / 2
+        return node['x'] - half_w, node['y'] - half_h, node['x'] + half_w, node['y'] + half_h
+
+    def _edge_bbox(self, edge_id):
+        source, target = self.edges[edge_id]
+        a = self.nodes[source]
+        b = self.nodes[target]
+        return a['x'], a['y'], b['x'], b['y']
+
+    # --- Coordinates ---
+
+    def to_world(self, screen_x, screen_y):
+        return screen_x / self.scale + self.view_x, screen_y / self.scale + self.view_y
+
+    def to_screen(self, world_x, world_y):
+        return (world_x - self.view_x) * self.scale, (world_y - self.view_y) * self.scale
+
+    def viewport(self):
+        """The visible world rectangle (x0, y0, x1, y1)."""
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        x0, y0 = self.to_world(0, 0)
+        x1, y1 = self.to_world(width, height)
+        return x0, y0, x1, y1
+
+    # --- Drawing ---
+
+    def schedule_redraw(self, full=False):
+        """
+        Coalesces redraws into one idle callback.
+        A 'cull' pass only adds/removes items at the viewport edges;
+        a 'full' pass also repositions every visible item (after zooming).
+        """
+        if self._redraw_pending is None:
+            self.after_idle(self._redraw)
+        if full or self._redraw_pending == 'full':
+            self._redraw_pending = 'full'
+        else:
+            self._redraw_pending = 'cull'
+
+    def _redraw(self):
+        full = self._redraw_pending == 'full'
+        self._redraw_pending = None
+        if not self.winfo_exists():
+            return
+
+        labels_shown = self.scale >= LABEL_MIN_SCALE
+        if labels_shown != self.labels_shown:
+            self.labels_shown = labels_shown
+            for node_id in list(self.node_items):
+                self._erase_node(node_id)
+            full = True
+
+        viewport = self.viewport()
+        visible_nodes = self.node_index.query_rect(*viewport)
+        visible_edges = self.edge_index.query_rect(*viewport)
+
+        for node_id in [n for n in self.node_items if n not in visible_nodes]:
+            self._erase_node(node_id)
+        for edge_id in [e for e in self.edge_items if e not in visible_edges]:
+            self.canvas.delete(self.edge_items.pop(edge_id))
+
+        for edge_id in visible_edges:
+            if edge_id not in self.edge_items:
+                self._draw_edge(edge_id)
+            elif full:
+                self._place_edge(edge_id)
+        for node_id in visible_nodes:
+            if node_id not in self.node_items:
+                self._draw_node(node_id)
+            elif full:
+                self._place_node(node_id)
+
+        self.canvas.tag_lower("edge")
+        self.status_label.config(
+            text=f"{len(self.nodes)} nodes, {len(self.edges)} connections "
+                 f"({len(visible_nodes)} in view)  |  {self.scale:.0%}"
         )
-        label_title.pack(pady=10)
 
-        label_placeholder = ttk.Label(
-            main_frame,
-            text="This tab will contain tools for creating and viewing mindmaps."
+    def _draw_node(self, node_id):
+        node = self.nodes[node_id]
+        outline = SELECTED_OUTLINE if node_id == self.selected_node else NODE_OUTLINE
+        rect = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill=node['color'] or NODE_FILL, outline=outline, width=2, tags=("node",)
         )
-        label_placeholder.pack(pady=5)
+        text = None
+        if self.labels_shown:
+            text = self.canvas.create_text(0, 0, text=node['label'], font=self.label_font, tags=("node",))
+        self.node_items[node_id] = (rect, text)
+        self._place_node(node_id)
+
+    def _place_node(self, node_id):
+        rect, text = self.node_items[node_id]
+        x0, y0, x1, y1 = self._node_bbox(node_id)
+        sx0, sy0 = self.to_screen(x0, y0)
+        sx1, sy1 = self.to_screen(x1, y1)
+        self.canvas.coords(rect, sx0, sy0, sx1, sy1)
+        if text is not None:
+            self.canvas.coords(text, (sx0 + sx1) / 2, (sy0 + sy1) / 2)
+
+    def _erase_node(self, node_id):
+        for item in self.node_items.pop(node_id, ()):
+            if item is not None:
+                self.canvas.delete(item)
+
+    def _draw_edge(self, edge_id):
+        self.edge_items[edge_id] = self.canvas.create_line(0, 0, 0, 0, fill=EDGE_COLOR, width=1.5, tags=("edge",))
+        self._place_edge(edge_id)
+
+    def _place_edge(self, edge_id):
+        x0, y0, x1, y1 = self._edge_bbox(edge_id)
+        self.canvas.coords(self.edge_items[edge_id], *self.to_screen(x0, y0), *self.to_screen(x1, y1))
+
+    def _set_selected(self, node_id):
+        """Highlights the selected node."""
+        previous = self.selected_node
+        self.selected_node = node_id
+        for changed in (previous, node_id):
+            if changed in self.node_items:
+                outline = SELECTED_OUTLINE if changed == node_id else NODE_OUTLINE
+                self.canvas.itemconfigure(self.node_items[changed][0], outline=outline)
+
+    # --- View changes ---
+
+    def on_canvas_configure(self, event):
+        if not self._has_been_fitted and self.nodes:
+            self._has_been_fitted = True
+            self.fit_to_view()
+        else:
+            self.schedule_redraw()
+
+    def pan_by(self, dx, dy):
+        """Pans by a screen-space offset; existing items are just shifted."""
+        self.view_x -= dx / self.scale
+        self.view_y -= dy / self.scale
+        self.canvas.move("all", dx, dy)
+        self.schedule_redraw()
+
+    def zoom_at(self, screen_x, screen_y, factor):
+        """Zooms around a screen point, keeping the world point under it fixed."""
+        new_scale = min(MAX_SCALE, max(MIN_SCALE, self.scale * factor))
+        if new_scale == self.scale:
+            return
+        world_x, world_y = self.to_world(screen_x, screen_y)
+        self.scale = new_scale
+        self.view_x = world_x - screen_x / new_scale
+        self.view_y = world_y - screen_y / new_scale
+        self.label_font.configure(size=max(1, round(BASE_FONT_SIZE * new_scale)))
+        self.schedule_redraw(full=True)
+
+    def zoom_to(self, scale):
+        """Zooms around the centre of the canvas."""
+        self.zoom_at(self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2, scale / self.scale)
+
+    def fit_to_view(self):
+        """Zooms and pans so the whole map is visible."""
+        if not self.nodes:
+            return
+        bounds = self.node_index.bounds.values()
+        x0 = min(b[0] for b in bounds)
+        y0 = min(b[1] for b in bounds)
+        x1 = max(b[2] for b in bounds)
+        y1 = max(b[3] for b in bounds)
+
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        margin = 40
+        scale = min((width - margin) / max(x1 - x0, 1), (height - margin) / max(y1 - y0, 1))
+        self.scale = min(MAX_SCALE, max(MIN_SCALE, min(scale, 1.5)))
+        self.view_x = (x0 + x1) / 2 - width / 2 / self.scale
+        self.view_y = (y0 + y1) / 2 - height / 2 / self.scale
+        self.label_font.configure(size=max(1, round(BASE_FONT_SIZE * self.scale)))
+        self.schedule_redraw(full=True)
+
+    def on_mousewheel(self, event):
+        self.zoom_at(event.x, event.y, 1.1 if event.delta > 0 else 1 / 1.1)
+
+    def on_pan_start(self, event):
+        self._drag = ('pan', event.x, event.y)
+
+    def on_pan_motion(self, event):
+        if self._drag and self._drag[0] == 'pan':
+            _, last_x, last_y = self._drag
+            self.pan_by(event.x - last_x, event.y - last_y)
+            self._drag = ('pan', event.x, event.y)
+
+    # --- Hit-testing ---
+
+    def node_at(self, screen_x, screen_y):
+        """The node under a screen point, or None (answered by the spatial index)."""
+        hits = self.node_index.query_point(*self.to_world(screen_x, screen_y))
+        return max(hits) if hits else None
+
+    def edge_at(self, screen_x, screen_y):
+        """The edge closest to a screen point within the hit tolerance, or None."""
+        world_x, world_y = self.to_world(screen_x, screen_y)
+        tolerance = EDGE_HIT_TOLERANCE / self.scale
+        candidates = self.edge_index.query_rect(
+            world_x - tolerance, world_y - tolerance, world_x + tolerance, world_y + tolerance
+        )
+        best, best_distance = None, tolerance
+        for edge_id in candidates:
+            x0, y0, x1, y1 = self._edge_bbox(edge_id)
+            distance = _point_segment_distance(world_x, world_y, x0, y0, x1, y1)
+            if distance <= best_distance:
+                best, best_distance = edge_id, distance
+        return best
+
+    # --- Mouse interaction ---
+
+    def on_press(self, event):
+        self.canvas.focus_set()
+        node_id = self.node_at(event.x, event.y)
+
+        if self.connect_from is not None:
+            if node_id is not None and node_id != self.connect_from:
+                self.connect_nodes(self.connect_from, node_id)
+            self.cancel_connect()
+            return
+
+        self._set_selected(node_id)
+        if node_id is None:
+            self._drag = ('pan', event.x, event.y)
+        else:
+            world_x, world_y = self.to_world(event.x, event.y)
+            node = self.nodes[node_id]
+            self._drag = ('node', node_id, world_x - node['x'], world_y - node['y'])
+
+    def on_motion(self, event):
+        if not self._drag:
+            return
+        if self._drag[0] == 'pan':
+            _, last_x, last_y = self._drag
+            self.pan_by(event.x - last_x, event.y - last_y)
+            self._drag = ('pan', event.x, event.y)
+        else:
+            _, node_id, offset_x, offset_y = self._drag
+            world_x, world_y = self.to_world(event.x, event.y)
+            self.move_node(node_id, world_x - offset_x, world_y - offset_y)
+
+    def on_release(self, event):
+        if self._drag and self._drag[0] == 'node':
+            self.schedule_flush()
+        self._drag = None
+
+    def on_double_click(self, event):
+        node_id = self.node_at(event.x, event.y)
+        if node_id is None:
+            self.add_node_at(*self.to_world(event.x, event.y))
+        else:
+            self.rename_node(node_id)
+
+    def show_context_menu(self, event):
+        menu = tk.Menu(self, tearoff=0)
+        node_id = self.node_at(event.x, event.y)
+        edge_id = None if node_id is not None else self.edge_at(event.x, event.y)
+
+        if node_id is not None:
+            self._set_selected(node_id)
+            menu.add_command(label="Rename", command=lambda: self.rename_node(node_id))
+            menu.add_command(label="Connect To...", command=lambda: self.start_connect(node_id))
+            menu.add_separator()
+            menu.add_command(label="Delete Node", command=lambda: self.delete_node(node_id))
+        elif edge_id is not None:
+            menu.add_command(label="Delete Connection", command=lambda: self.delete_edge(edge_id))
+        else:
+            world_x, world_y = self.to_world(event.x, event.y)
+            menu.add_command(label="Add Node Here", command=lambda: self.add_node_at(world_x, world_y))
+            menu.add_command(label="Fit to View", command=self.fit_to_view)
+
+        try:
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            menu.grab_release()
+
+    # --- Editing ---
+
+    def move_node(self, node_id, x, y):
+        """Moves a node and its edges, updating only the items involved."""
+        node = self.nodes[node_id]
+        node['x'] = x
+        node['y'] = y
+        self.dirty_nodes.add(node_id)
+        self.node_index.update(node_id, self._node_bbox(node_id))
+        if node_id in self.node_items:
+            self._place_node(node_id)
+
+        for edge_id in self.node_edges[node_id]:
+            self.edge_index.update(edge_id, self._edge_bbox(edge_id))
+            if edge_id in self.edge_items:
+                self._place_edge(edge_id)
+        self.schedule_redraw()
+
+    def add_node_at_center(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        self.add_node_at(*self.to_world(width / 2, height / 2))
+
+    def add_node_at(self, x, y):
+        label = simpledialog.askstring("Add Node", "Node text:", parent=self)
+        if not label:
+            return
+        node_id = self.db.add_mindmap_node(self.project_id, label, x, y)
+        self._add_node_to_model(node_id, label, x, y)
+        self.new_nodes.add(node_id)
+        self._set_selected(node_id)
+        self.schedule_redraw()
+
+    def rename_node(self, node_id):
+        node = self.nodes[node_id]
+        label = simpledialog.askstring("Rename Node", "Node text:", initialvalue=node['label'], parent=self)
+        if not label or label == node['label']:
+            return
+        node['label'] = label
+        self.dirty_nodes.add(node_id)
+        self.schedule_flush()
+        node['w'] = max(NODE_MIN_WIDTH, self.measure_font.measure(label) + NODE_PADDING)
+        self.node_index.update(node_id, self._node_bbox(node_id))
+        if node_id in self.node_items:
+            self._erase_node(node_id)
+            self._draw_node(node_id)
+
+    def delete_selected_node(self):
+        if self.selected_node is not None:
+            self.delete_node(self.selected_node)
+
+    def delete_node(self, node_id):
+        node = self.nodes.get(node_id)
+        if not node:
+            return
+        if not messagebox.askyesno("Delete Node?", f"Delete '{node['label']}' and its connections?"):
+            return
+
+        for edge_id in list(self.node_edges[node_id]):
+            self._remove_edge_from_model(edge_id)
+        self.dirty_nodes.discard(node_id)
+        self.deleted_nodes.add(node_id)
+        self.schedule_flush()
+        self._erase_node(node_id)
+        self.node_index.remove(node_id)
+        del self.node_edges[node_id]
+        del self.nodes[node_id]
+        self.new_nodes.discard(node_id)
+        if self.selected_node == node_id:
+            self.selected_node = None
+        self.schedule_redraw()
+
+    def start_connect(self, node_id):
+        """The next node clicked will be connected to this one."""
+        self.connect_from = node_id
+        self.canvas.config(cursor="crosshair")
+
+    def cancel_connect(self):
+        self.connect_from = None
+        self.canvas.config(cursor="")
+
+    def connect_nodes(self, source_id, target_id):
+        for edge_id in self.node_edges[source_id]:
+            if set(self.edges[edge_id]) == {source_id, target_id}:
+                return  # Already connected
+        edge_id = self.db.add_mindmap_edge(self.project_id, source_id, target_id)
+        self._add_edge_to_model(edge_id, source_id, target_id)
+        self.schedule_redraw()
+
+    def delete_edge(self, edge_id):
+        self._remove_edge_from_model(edge_id)
+        self.deleted_edges.add(edge_id)
+        self.schedule_flush()
+        self.schedule_redraw()
+
+    def _remove_edge_from_model(self, edge_id):
+        source, target = self.edges.pop(edge_id)
+        self.node_edges[source].discard(edge_id)
+        self.node_edges[target].discard(edge_id)
+        self.edge_index.remove(edge_id)
+        if edge_id in self.edge_items:
+            self.canvas.delete(self.edge_items.pop(edge_id))
+
+
+    # --- Auto-arrange (runs in a worker process) ---
+
+    def auto_arrange(self, algorithm, incremental=False):
+        """
+        Starts a layout in a worker process; frames it streams back are applied
+        as they arrive so the nodes animate into place.
+
+        :param algorithm: 'force' or 'tree'
+        :param incremental: Only move the nodes added since the last arrange
+                            (and their direct neighbours); everything else is pinned
+        """
+        if not self.nodes:
+            return
+        self.stop_layout()
+
+        node_ids = list(self.nodes)
+        index_of = {node_id: index for index, node_id in enumerate(node_ids)}
+        positions = np.array([(self.nodes[n]['x'], self.nodes[n]['y']) for n in node_ids], dtype=np.float64)
+        edges = np.array([(index_of[s], index_of[t]) for s, t in self.edges.values()], dtype=np.int64).reshape(-1, 2)
+
+        job = {'algorithm': algorithm, 'positions': positions, 'edges': edges}
+        if incremental:
+            free = {n for n in self.new_nodes if n in self.nodes}
+            if not free:
+                messagebox.showinfo("Auto-Arrange", "No nodes have been added since the last arrange.")
+                return
+            for node_id in list(free):
+                for edge_id in self.node_edges[node_id]:
+                    free.update(self.edges[edge_id])
+            job['pinned'] = np.array([node_id not in free for node_id in node_ids])
+            job['iterations'] = 120
+            job['temperature'] = 60.0
+
+        context = multiprocessing.get_context("spawn")
+        self._layout_queue = context.Queue()
+        self._layout_process = context.Process(target=run_layout_job, args=(job, self._layout_queue), daemon=True)
+        self._layout_process.start()
+        self._layout_node_ids = node_ids
+        self.status_label.config(text="Arranging...")
+        self.after(LAYOUT_POLL_MS, self._poll_layout)
+
+    def _poll_layout(self):
+        """Drains the worker's queue, applying only the newest frame."""
+        if self._layout_queue is None:
+            return
+
+        latest = None
+        try:
+            while True:
+                message = self._layout_queue.get_nowait()
+                latest = message
+                if message[0] != 'frame':
+                    break
+        except queue.Empty:
+            pass
+
+        if latest is not None:
+            kind, payload = latest
+            if kind == 'error':
+                self.stop_layout()
+                messagebox.showerror("Auto-Arrange", f"Layout failed:\n{payload}")
+                return
+            self._apply_layout_positions(payload)
+            if kind == 'done':
+                self._finish_layout()
+                return
+
+        if self._layout_process is not None and not self._layout_process.is_alive() and latest is None:
+            self.stop_layout()  # Worker died without reporting
+            return
+        self.after(LAYOUT_POLL_MS, self._poll_layout)
+
+    def _apply_layout_positions(self, positions):
+        """Moves every still-existing node to its streamed position."""
+        dragged = self._drag[1] if self._drag and self._drag[0] == 'node' else None
+        moved_edges = set()
+        for node_id, (x, y) in zip(self._layout_node_ids, positions.tolist()):
+            node = self.nodes.get(node_id)
+            if node is None or node_id == dragged:
+                continue
+            node['x'] = x
+            node['y'] = y
+            self.dirty_nodes.add(node_id)
+            self.node_index.update(node_id, self._node_bbox(node_id))
+            moved_edges.update(self.node_edges[node_id])
+        for edge_id in moved_edges:
+            self.edge_index.update(edge_id, self._edge_bbox(edge_id))
+        self.schedule_redraw(full=True)
+
+    def _finish_layout(self):
+        """Saves the final positions and shuts the worker down."""
+        self.new_nodes.clear()
+        self.stop_layout()
+        self.flush_changes()
+
+    def stop_layout(self):
+        """Stops a running layout, keeping the positions reached so far on screen."""
+        if self._layout_process is not None and self._layout_process.is_alive():
+            self._layout_process.terminate()
+        self._layout_process = None
+        self._layout_queue = None
+        self.schedule_redraw()
+
+    def on_destroy(self, event):
+        if event.widget is self:
+            if self._layout_process is not None and self._layout_process.is_alive():
+                self._layout_process.terminate()
+            self._layout_process = None
+            self._layout_queue = None
+            self.flush_changes()
+
+    # --- Saving ---
+
+    def schedule_flush(self):
+        """Writes pending edits once editing has paused for FLUSH_DELAY_MS."""
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+        self._flush_job = self.after(FLUSH_DELAY_MS, lambda: self.after_idle(self.flush_changes))
+
+    def flush_changes(self):
+        """Writes every pending node change and deletion in one background transaction."""
+        if self._flush_job is not None:
+            try:
+                self.after_cancel(self._flush_job)
+            except tk.TclError:
+                pass  # Widget already destroyed
+            self._flush_job = None
+        if not (self.dirty_nodes or self.deleted_nodes or self.deleted_edges):
+            return
+
+        node_rows = [
+            (node['label'], node['x'], node['y'], node['color'], node_id)
+            for node_id, node in ((n, self.nodes.get(n)) for n in self.dirty_nodes)
+            if node is not None
+        ]
+        deleted_edges = list(self.deleted_edges)
+        deleted_nodes = list(self.deleted_nodes)
+        self.executor.submit(
+            lambda ctx: ctx.db.save_mindmap_changes(node_rows, deleted_edges, deleted_nodes),
+            serial=("mindmap", self.project_id)
+        )
+        self.dirty_nodes.clear()
+        self.deleted_nodes.clear()
+        self.deleted_edges.clear()
+
+
+def _point_segment_distance(px, py, x0, y0, x1, y1):
+    """Distance from a point to a line segment."""
+    dx = x1 - x0
+    dy = y1 - y0
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(px - x0, py - y0)
+    t = max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / length_sq))
+    return math.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
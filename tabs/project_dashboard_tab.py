@@ -1,5 +1,8 @@
 import tkinter as tk
-from tkinter import ttk, font
+from tkinter import ttk, font, messagebox, filedialog
+from PIL import Image, ImageTk
+import math
+from datetime import date
 
 # --- Add project root to sys.path ---
 import sys
@@ -12,6 +15,16 @@ if project_root not in sys.path:
 # --- END FIX ---
 
 from utils.text_toolbar import TextToolbar
+from utils.markdown_highlighter import MarkdownHighlighter
+from utils.paged_treeview import PagedTreeview
+from dialogs.reading_dialog import ReadingDialog
+from dialogs.reorder_dialog import ReorderDialog
+from dialogs.log_session_dialog import LogSessionDialog
+from project_views.attachments_window import AttachmentsWindow
+from database_manager import READING_STATUSES, NOTE_FIELDS, decode_note
+from utils.reading_analytics import load_pace_panel
+from utils.attachment_store import ATTACHMENT_SERIAL, collect_garbage, import_folder
+from utils.thumbnail_cache import THUMBNAIL_SIZES
 
 
 class ProjectDashboardTab(ttk.Frame):
@@ -20,15 +33,27 @@ class ProjectDashboardTab(ttk.Frame):
     Readings, Purpose, Goals, and the bottom text editor.
     """
 
-    def __init__(self, parent, project_details, db_manager):
+    def __init__(self, parent, project_details, db_manager, executor, change_watcher, attachment_store,
+                 extraction_queue, thumbnail_cache):
         super().__init__(parent)
 
         self.project_id = project_details['id']
         self.db = db_manager
+        self.executor = executor  # Saves and the pace stats run in the background
+        self._pace_task = None
+        self.attachment_store = attachment_store  # Source files attached to readings
+        self.extraction_queue = extraction_queue  # Indexes the text of attached files
+        self.thumbnail_cache = thumbnail_cache  # Cover thumbnails of attached files
+        self.import_task = None
+        # Thumbnails are decoded only for rows in view: iid -> PhotoImage (None = no cover)
+        self.row_images = {}
+        self._thumbnail_job = None
 
         # --- FIX: Convert sqlite3.Row to a mutable dict ---
         # This allows us to update the dictionary in memory
         self.project_details = dict(project_details)
+        # Note fields may be stored compressed; each is decoded the first time it is shown
+        self.note_cache = {}
 
         self.instructions = self.db.get_or_create_instructions(self.project_id)
 
@@ -59,18 +84,72 @@ class ProjectDashboardTab(ttk.Frame):
         readings_frame = ttk.LabelFrame(top_paned_window, text="Readings")
         top_paned_window.add(readings_frame, weight=1)  # 1/3 width
 
-        self.reading_tree = ttk.Treeview(readings_frame, columns=("author",), height=5)
+        readings_frame.grid_rowconfigure(0, weight=1)
+        readings_frame.grid_columnconfigure(0, weight=1)
+
+        # Rows are tall enough for a cover thumbnail
+        ttk.Style(self).configure("Readings.Treeview", rowheight=THUMBNAIL_SIZES["row"][1] + 4)
+        self.reading_tree = ttk.Treeview(readings_frame, columns=("author", "status", "progress"), height=5,
+                                         style="Readings.Treeview")
         self.reading_tree.heading("#0", text="Title")
         self.reading_tree.heading("author", text="Author")
-        self.reading_tree.pack(fill="both", expand=True, padx=5, pady=5)
-        # Add placeholder right-click menu
+        self.reading_tree.heading("status", text="Status")
+        self.reading_tree.heading("progress", text="Progress")
+        self.reading_tree.column("status", width=80, stretch=False)
+        self.reading_tree.column("progress", width=80, stretch=False)
+        self.reading_tree.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+
+        reading_scrollbar = ttk.Scrollbar(readings_frame, orient="vertical", command=self.reading_tree.yview)
+        reading_scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
+
+        # Rows are fetched page by page as the list is scrolled
+        self.reading_list = PagedTreeview(
+            self.reading_tree,
+            reading_scrollbar,
+            self.fetch_readings_page,
+            self.reading_row_to_item,
+            on_view_changed=self.schedule_thumbnail_refresh
+        )
+        self.reading_list.reload()
+
         self.reading_tree.bind("<Button-3>", self.show_reading_context_menu)
+        self.reading_tree.bind("<Double-1>", lambda e: self.edit_selected_reading())
+
+        # --- Reading activity totals ---
+        self.activity_label = ttk.Label(readings_frame, text="", justify="left")
+        self.activity_label.grid(row=1, column=0, columnspan=2, sticky="w", padx=5, pady=(0, 5))
+
+        # Folder imports and text indexing of attached files
+        self.source_status_label = ttk.Label(readings_frame, text="")
+        self.source_status_label.grid(row=2, column=0, columnspan=2, sticky="w", padx=5, pady=(0, 5))
+        self.extraction_queue.subscribe(self.on_extraction_progress, owner=self)
+
+        # --- (1B) Pace & Forecast ---
+        stats_frame = ttk.LabelFrame(top_paned_window, text="Pace & Forecast")
+        top_paned_window.add(stats_frame, weight=1)
+
+        self.stats_tree = ttk.Treeview(
+            stats_frame,
+            columns=("pace_hour", "pace_day", "remaining", "forecast"),
+            height=5
+        )
+        self.stats_tree.heading("#0", text="")
+        self.stats_tree.heading("pace_hour", text="pp/hour")
+        self.stats_tree.heading("pace_day", text="pp/day")
+        self.stats_tree.heading("remaining", text="Left")
+        self.stats_tree.heading("forecast", text="Done by")
+        self.stats_tree.column("#0", width=140)
+        for column in ("pace_hour", "pace_day", "remaining"):
+            self.stats_tree.column(column, width=60, anchor="e", stretch=False)
+        self.stats_tree.column("forecast", width=85, stretch=False)
+        self.stats_tree.pack(fill="both", expand=True, padx=5, pady=5)
 
         # --- Right Half of Top Frame ---
         top_right_frame = ttk.Frame(top_paned_window)
         top_paned_window.add(top_right_frame, weight=2)  # 2/3 width
         top_right_frame.grid_rowconfigure(0, weight=1)  # Purpose (1/4 height)
         top_right_frame.grid_rowconfigure(1, weight=1)  # Goals (1/4 height)
+        top_right_frame.grid_rowconfigure(2, weight=0)  # Backlinks
         top_right_frame.grid_columnconfigure(0, weight=1)
 
         # --- (2) Project Purpose ---
@@ -79,9 +158,7 @@ class ProjectDashboardTab(ttk.Frame):
         self.purpose_text = tk.Text(purpose_frame, height=5, wrap="word", undo=True)
         self.purpose_text.pack(fill="both", expand=True, padx=5, pady=5)
 
-        purpose_content = self.project_details[
-            "project_purpose_text"] if "project_purpose_text" in self.project_keys else ""
-        if purpose_content is None: purpose_content = ""  # Handle NULL from DB
+        purpose_content = self.get_note("project_purpose_text") if "project_purpose_text" in self.project_keys else ""
         self.purpose_text.insert("1.0", purpose_content)
 
         self.purpose_text.bind("<FocusOut>", lambda e: self.save_text_content(
@@ -97,8 +174,7 @@ class ProjectDashboardTab(ttk.Frame):
         self.goals_text = tk.Text(goals_frame, height=5, wrap="word", undo=True)
         self.goals_text.pack(fill="both", expand=True, padx=5, pady=5)
 
-        goals_content = self.project_details["project_goals_text"] if "project_goals_text" in self.project_keys else ""
-        if goals_content is None: goals_content = ""  # Handle NULL from DB
+        goals_content = self.get_note("project_goals_text") if "project_goals_text" in self.project_keys else ""
         self.goals_text.insert("1.0", goals_content)
 
         self.goals_text.bind("<FocusOut>", lambda e: self.save_text_content(
@@ -108,6 +184,13 @@ class ProjectDashboardTab(ttk.Frame):
         self.setup_manual_tags(self.goals_text)
         self.bind_text_shortcuts(self.goals_text)
 
+        # --- Backlinks: other projects whose notes mention [[this project]] ---
+        backlinks_frame = ttk.LabelFrame(top_right_frame, text="Backlinks")
+        backlinks_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=(5, 0))
+        self.backlinks_list = tk.Listbox(backlinks_frame, height=3, activestyle="none")
+        self.backlinks_list.pack(fill="both", expand=True, padx=5, pady=5)
+        self.refresh_backlinks()
+
         # --- (4) Bottom Half Container ---
         bottom_frame = ttk.Frame(self)
         bottom_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
@@ -141,6 +224,9 @@ class ProjectDashboardTab(ttk.Frame):
 
         # Grid the text editor *after* the toolbar
         self.main_text_editor.grid(row=3, column=0, sticky="nsew")
+
+        # --- Live markdown styling (uses the toolbar's tags) ---
+        self.highlighter = MarkdownHighlighter(self.main_text_editor)
         self.main_text_editor.bind("<FocusOut>", self.save_current_tab_text)
         # --- This one uses the toolbar, so no manual setup needed ---
         self.bind_text_shortcuts(self.main_text_editor)
@@ -151,6 +237,12 @@ class ProjectDashboardTab(ttk.Frame):
         # Load initial tab
         self.on_tab_changed(None)
 
+        # Fill the activity totals and the Pace & Forecast panel
+        self.refresh_activity()
+
+        # Refresh the parts of this tab that other connections change
+        change_watcher.subscribe(self.on_external_changes, owner=self)
+
         # --- FIXED: Restored function body ---
 
     def on_tab_changed(self, event):
@@ -169,8 +261,7 @@ class ProjectDashboardTab(ttk.Frame):
             # Load text from database
             self.main_text_editor.delete("1.0", "end")
 
-            tab_content = self.project_details[db_field] if db_field in self.project_keys else ""
-            if tab_content is None: tab_content = ""  # Handle NULL from DB
+            tab_content = self.get_note(db_field) if db_field in self.project_keys else ""
 
             self.main_text_editor.insert("1.0", tab_content)
 
@@ -184,15 +275,10 @@ class ProjectDashboardTab(ttk.Frame):
 
         if current_tab_name in self.tab_map:
             db_field, _ = self.tab_map[current_tab_name]
-            content = self.main_text_editor.get("1.0", "end-1c")
 
-            # Save to DB
+            # Save to DB (also updates the local copy)
             self.save_text_content(self.main_text_editor, db_field)
 
-            # Update local details if key exists
-            if db_field in self.project_keys:
-                self.project_details[db_field] = content
-
     # --- FIXED: Restored function body ---
     def save_text_content(self, text_widget, db_field_name):
         """Helper to save content of a text widget to the DB."""
@@ -201,11 +287,110 @@ class ProjectDashboardTab(ttk.Frame):
             return
 
         content = text_widget.get("1.0", "end-1c")
-        self.db.update_project_text_field(self.project_id, db_field_name, content)
+        if content == self.get_note(db_field_name):
+            return  # Unchanged since the last save
+
+        # Saves of the same field run in order, on a worker thread
+        project_id = self.project_id
+        self.executor.submit(
+            lambda ctx: ctx.db.update_project_text_field(project_id, db_field_name, content),
+            serial=("note", project_id, db_field_name),
+            on_done=lambda _: self.on_text_saved(db_field_name),
+            owner=self
+        )
 
         # Update local details
         self.project_details[db_field_name] = content
+        self.note_cache[db_field_name] = content
+
+    def get_note(self, field):
+        """A note field's text ('' for NULL), decompressed on first use and cached while the project is open."""
+        if field not in self.note_cache:
+            self.note_cache[field] = decode_note(self.project_details.get(field)) or ""
+        return self.note_cache[field]
+
+    def on_text_saved(self, db_field_name):
         print(f"Saved {db_field_name}")  # For debugging
+        # A project's notes can link to the project itself
+        self.refresh_backlinks()
+
+    def on_external_changes(self, changes):
+        """Refreshes only what the change_log rows touch: readings, activity, notes, backlinks."""
+        updated_readings = set()
+        reload_readings = refresh_activity = reload_notes = refresh_backlinks = False
+        for change in changes:
+            table, op = change['table_name'], change['op']
+            if table == 'items':
+                refresh_backlinks = True  # Any project's notes or name may link here
+                if change['row_id'] == self.project_id and op == 'update':
+                    reload_notes = True
+            elif change['scope_id'] != self.project_id:
+                continue
+            elif table == 'readings':
+                if op == 'update':
+                    updated_readings.add(change['row_id'])
+                else:
+                    reload_readings = True
+            elif table == 'reading_sessions':
+                refresh_activity = True
+
+        if reload_notes:
+            self.reload_project_details()
+        if reload_readings:
+            self.reading_list.reload()
+        else:
+            for reading_id in updated_readings:
+                reading = self.db.get_reading(reading_id)
+                if reading:
+                    self.reading_list.refresh_row(reading)
+        if refresh_activity or updated_readings or reload_readings:
+            self.refresh_activity()
+        if refresh_backlinks:
+            self.refresh_backlinks()
+
+    def reload_project_details(self):
+        """
+        Re-reads the project row and shows note fields that were changed elsewhere.
+        A text box the user is typing in keeps its content (their save wins).
+        """
+        details = self.db.get_item_details(self.project_id)
+        if details is None:
+            return  # Deleted elsewhere
+        focused = self.focus_get()
+        current_field = self.tab_map.get(self.bottom_notebook.tab(self.bottom_notebook.select(), "text"), (None,))[0]
+        widgets = {
+            "project_purpose_text": self.purpose_text,
+            "project_goals_text": self.goals_text,
+            current_field: self.main_text_editor,
+        }
+
+        self.project_details['name'] = details['name']
+        for field in NOTE_FIELDS:
+            stored = details[field]
+            if stored == self.project_details.get(field):
+                continue  # Compared as stored, so unchanged notes are never decompressed
+            widget = widgets.get(field)
+            if widget is focused:
+                continue
+            self.project_details[field] = stored
+            if field not in self.note_cache:
+                continue  # Not shown yet; decoded when it is
+            content = decode_note(stored) or ""
+            if content == self.note_cache[field]:
+                continue
+            self.note_cache[field] = content
+            if widget is not None:
+                widget.delete("1.0", "end")
+                widget.insert("1.0", content)
+
+    def refresh_backlinks(self):
+        """Lists the notes that link here with [[Project Name]]."""
+        self.backlinks_list.delete(0, "end")
+        rows = self.db.get_backlinks(self.project_details['name'])
+        for row in rows:
+            self.backlinks_list.insert("end", f"{row['name']}: {NOTE_FIELDS.get(row['field'], row['field'])}")
+        if not rows:
+            self.backlinks_list.insert("end", f"No notes link here yet. Use [[{self.project_details['name']}]] to link.")
 
     # --- FIXED: Restored function body ---
     def refresh_instructions(self):
@@ -214,13 +399,348 @@ class ProjectDashboardTab(ttk.Frame):
         # Trigger a tab change event to reload the label
         self.on_tab_changed(None)
 
-    # --- FIXED: Restored function body ---
+    # --- Reading List ---
+
+    def fetch_readings_page(self, last_row, limit):
+        """Page source for the reading list."""
+        if last_row is None:
+            return self.db.get_readings_page(self.project_id, limit=limit)
+        return self.db.get_readings_page(
+            self.project_id,
+            after_order=last_row['display_order'],
+            after_id=last_row['id'],
+            limit=limit
+        )
+
+    def reading_row_to_item(self, reading):
+        """Converts a reading row to (iid, text, values) for the reading tree."""
+        if reading['total_pages']:
+            progress = f"{reading['pages_read']}/{reading['total_pages']}"
+        else:
+            progress = str(reading['pages_read'])
+        values = (reading['authors'] or "", reading['status'], progress)
+        return str(reading['id']), reading['title'], values
+
+    def get_selected_reading_id(self):
+        """Returns the DB id of the selected reading, or None."""
+        selection = self.reading_tree.selection()
+        if not selection:
+            return None
+        return int(selection[0])
+
+    def add_reading(self):
+        """Opens the 'Add Reading' dialog and appends the new reading."""
+        dialog = ReadingDialog(self, READING_STATUSES)
+        self.wait_window(dialog)
+
+        if dialog.result:
+            self.db.add_reading(
+                self.project_id,
+                dialog.result['title'],
+                dialog.result['authors'],
+                dialog.result['total_pages'],
+                dialog.result['status'],
+                dialog.result['pages_read']
+            )
+            self.reading_list.reload()
+
+    def edit_selected_reading(self):
+        """Opens the selected reading in the edit dialog."""
+        reading_id = self.get_selected_reading_id()
+        if reading_id is None:
+            return
+
+        reading = self.db.get_reading(reading_id)
+        if not reading:
+            return
+
+        dialog = ReadingDialog(self, READING_STATUSES, reading)
+        self.wait_window(dialog)
+
+        if dialog.result:
+            self.db.update_reading(reading_id, **dialog.result)
+            self.reading_list.refresh_row(self.db.get_reading(reading_id))
+
+    def delete_selected_reading(self):
+        """Deletes the selected reading with confirmation."""
+        reading_id = self.get_selected_reading_id()
+        if reading_id is None:
+            return
+
+        title = self.reading_tree.item(str(reading_id), 'text')
+        if not messagebox.askyesno("Delete Reading?", f"Are you sure you want to delete '{title}'?"):
+            return
+
+        self.db.delete_reading(reading_id)
+        self.reading_tree.delete(str(reading_id))
+        # Attached files no other reading uses are removed from disk
+        self.executor.submit(collect_garbage, self.attachment_store, serial=ATTACHMENT_SERIAL)
+
+    def open_attachments(self):
+        """Shows the source files attached to the selected reading."""
+        reading_id = self.get_selected_reading_id()
+        if reading_id is None:
+            return
+        reading = self.db.get_reading(reading_id)
+        if reading:
+            AttachmentsWindow(self, self.db, self.attachment_store, self.executor, self.extraction_queue, reading,
+                              on_changed=self.forget_thumbnail)
+
+    def forget_thumbnail(self, reading_id):
+        """Looks up a reading's cover again (its attachments changed)."""
+        iid = str(reading_id)
+        if self.row_images.pop(iid, None) is not None and self.reading_tree.exists(iid):
+            self.reading_tree.item(iid, image="")
+        self.schedule_thumbnail_refresh()
+
+    # --- Cover thumbnails ---
+
+    def schedule_thumbnail_refresh(self):
+        if self._thumbnail_job is None:
+            self._thumbnail_job = self.after_idle(self.refresh_visible_thumbnails)
+
+    def visible_reading_iids(self):
+        """The reading rows currently in view (plus a couple either side)."""
+        children = self.reading_tree.get_children()
+        if not children:
+            return []
+        first, last = self.reading_tree.yview()
+        start = max(0, int(first * len(children)) - 2)
+        end = min(len(children), math.ceil(last * len(children)) + 2)
+        return children[start:end]
+
+    def refresh_visible_thumbnails(self):
+        """
+        Shows cover thumbnails on the rows in view and releases those of rows
+        scrolled out of view, so only a screenful of images is ever decoded.
+        """
+        self._thumbnail_job = None
+        visible = set(self.visible_reading_iids())
+        for iid, photo in list(self.row_images.items()):
+            if iid not in visible:
+                del self.row_images[iid]
+                if photo is not None and self.reading_tree.exists(iid):
+                    self.reading_tree.item(iid, image="")
+            elif photo is not None and not self.reading_tree.item(iid, 'image'):
+                del self.row_images[iid]  # The row was re-inserted by a reload
+
+        missing = [iid for iid in visible if iid not in self.row_images]
+        if not missing:
+            return
+        covers = self.db.get_cover_attachments([int(iid) for iid in missing])
+        for iid in missing:
+            self.row_images[iid] = None
+            cover = covers.get(int(iid))
+            if cover is not None:
+                self.thumbnail_cache.request(
+                    cover['sha256'], cover['media_type'],
+                    lambda path, iid=iid: self.show_thumbnail(iid, path),
+                    owner=self
+                )
+
+    def show_thumbnail(self, iid, path):
+        if path is None or iid not in self.row_images or not self.reading_tree.exists(iid):
+            return  # No cover, or scrolled away / deleted meanwhile
+        try:
+            photo = ImageTk.PhotoImage(Image.open(path))
+        except (OSError, tk.TclError):
+            return
+        self.row_images[iid] = photo  # The reference keeps Tk from freeing the image
+        self.reading_tree.item(iid, image=photo)
+
+    def import_reading_folder(self):
+        """Adds a reading for every PDF/EPUB/text file in a folder, with the file attached."""
+        if self.import_task is not None:
+            return
+        folder = filedialog.askdirectory(parent=self, title="Import Folder of Readings")
+        if not folder:
+            return
+        self.source_status_label.config(text="Importing...")
+        self.import_task = self.executor.submit(
+            import_folder, self.attachment_store, self.project_id, folder,
+            on_done=self.on_import_done,
+            on_error=self.on_import_error,
+            on_progress=self.on_import_progress,
+            owner=self,
+            serial=ATTACHMENT_SERIAL
+        )
+
+    def on_import_progress(self, progress):
+        imported, total = progress
+        self.source_status_label.config(text=f"Importing... {imported} of {total} files")
+        # Text extraction starts on the first files while the rest are still being copied
+        self.extraction_queue.start()
+
+    def on_import_done(self, imported):
+        self.import_task = None
+        self.source_status_label.config(text=f"Imported {imported} file(s).")
+        self.reading_list.reload()
+        self.extraction_queue.start()
+
+    def on_import_error(self, error):
+        self.import_task = None
+        self.source_status_label.config(text="")
+        messagebox.showerror("Error", f"Importing the folder failed:\n{error}")
+        self.reading_list.reload()
+
+    def on_extraction_progress(self, progress):
+        if self.import_task is not None:
+            return  # The import's own progress is showing
+        if progress is None:
+            self.source_status_label.config(text="")
+        else:
+            done, left = progress
+            self.source_status_label.config(text=f"Indexing attached files... {done} done, {left} left")
+
+    def reorder_readings(self):
+        """Opens the reorder dialog for this project's readings."""
+        items_to_reorder = [(row['title'], row['id']) for row in self.db.get_reading_titles(self.project_id)]
+        if not items_to_reorder:
+            return
+
+        dialog = ReorderDialog(self, items_to_reorder, self.get_selected_reading_id())
+        self.wait_window(dialog)
+
+        if dialog.ordered_db_ids:
+            self.db.update_reading_order(dialog.ordered_db_ids)
+            self.reading_list.reload()
+
+    def log_session(self):
+        """Opens the 'Log Reading Session' dialog."""
+        readings = self.db.get_reading_titles(self.project_id)
+        if not readings:
+            messagebox.showinfo("Log Session", "Add a reading to this project first.")
+            return
+
+        dialog = LogSessionDialog(self, readings, self.get_selected_reading_id())
+        self.wait_window(dialog)
+
+        if dialog.result:
+            reading_id = dialog.result['reading_id']
+            self.db.add_reading_session(
+                reading_id,
+                dialog.result['started_at'],
+                dialog.result['ended_at'],
+                dialog.result['pages_read']
+            )
+            self.reading_list.refresh_row(self.db.get_reading(reading_id))
+            self.refresh_activity()
+
+    def refresh_activity(self):
+        """Updates the reading activity totals under the reading list."""
+        totals = self.db.get_session_totals(self.project_id, date.today().isoformat())
+
+        def describe(total):
+            hours, remainder = divmod(total['seconds'], 3600)
+            return f"{total['pages']} pp in {hours}h{remainder // 60:02d}m"
+
+        lines = [
+            f"Today: {describe(totals['day'])}",
+            f"This week: {describe(totals['week'])}",
+            f"Project: {describe(totals['project'])}"
+        ]
+        if totals['class'] is not None:
+            lines.append(f"Class: {describe(totals['class'])}")
+        self.activity_label.config(text="   |   ".join(lines))
+
+        self.refresh_pace_stats()
+
+    def refresh_pace_stats(self):
+        """Recomputes the Pace & Forecast panel for this project and its class on a worker thread."""
+        if self._pace_task is not None:
+            self._pace_task.cancel()
+        project_id = self.project_id
+        class_id = self.project_details.get('parent_id')
+        today = date.today()
+        self._pace_task = self.executor.submit(
+            lambda ctx: load_pace_panel(ctx.db, project_id, class_id, today),
+            on_done=self.show_pace_stats,
+            owner=self
+        )
+
+    def show_pace_stats(self, panel):
+        self._pace_task = None
+        self.stats_tree.delete(*self.stats_tree.get_children())
+
+        def format_values(pages_per_hour, pages_per_day, remaining, forecast):
+            forecast_text = "" if str(forecast) == "NaT" else str(forecast)
+            return (f"{pages_per_hour:.1f}", f"{pages_per_day:.1f}", f"{remaining:.0f}", forecast_text)
+
+        stats = panel['stats']
+
+        # --- This project, with its active readings underneath ---
+        projects = stats['projects']
+        matches = (projects['id'] == self.project_id).nonzero()[0]
+        if not len(matches):
+            return  # No readings yet
+        project_row = matches[0]
+
+        project_iid = self.stats_tree.insert(
+            "", "end", text="This project", open=True,
+            values=format_values(
+                projects['pages_per_hour'][project_row],
+                projects['rolling_pages_per_day'][project_row],
+                projects['remaining'][project_row],
+                projects['forecast'][project_row]
+            )
+        )
+
+        readings = stats['readings']
+        titles = panel['titles']
+        active = (readings['project_id'] == self.project_id) & (readings['pages'] > 0)
+        for row in active.nonzero()[0]:
+            self.stats_tree.insert(
+                project_iid, "end", text=titles.get(int(readings['id'][row]), ""),
+                values=format_values(
+                    readings['pages_per_hour'][row],
+                    readings['pages_per_day'][row],
+                    readings['remaining'][row],
+                    readings['forecast'][row]
+                )
+            )
+
+        # --- The whole class, with each of its projects underneath ---
+        summary = panel['summary']
+        if summary is None:
+            return
+
+        class_iid = self.stats_tree.insert(
+            "", "end", text="Class",
+            values=format_values(
+                summary['pages_per_hour'],
+                summary['rolling_pages_per_day'],
+                summary['remaining'],
+                summary['forecast']
+            )
+        )
+        names = panel['names']
+        for row, project_id in enumerate(projects['id']):
+            self.stats_tree.insert(
+                class_iid, "end", text=names.get(int(project_id), ""),
+                values=format_values(
+                    projects['pages_per_hour'][row],
+                    projects['rolling_pages_per_day'][row],
+                    projects['remaining'][row],
+                    projects['forecast'][row]
+                )
+            )
+
     def show_reading_context_menu(self, event):
-        """Placeholder for reading viewer's right-click menu."""
+        """Right-click menu for the reading viewer."""
+        row_iid = self.reading_tree.identify_row(event.y)
+        if row_iid:
+            self.reading_tree.selection_set(row_iid)
+
         menu = tk.Menu(self, tearoff=0)
-        menu.add_command(label="Add Reading (Placeholder)")
-        menu.add_command(label="Delete Reading (Placeholder)")
-        menu.add_command(label="Reorder (Placeholder)")
+        menu.add_command(label="Add Reading", command=self.add_reading)
+        if row_iid:
+            menu.add_command(label="Edit Reading", command=self.edit_selected_reading)
+            menu.add_command(label="Delete Reading", command=self.delete_selected_reading)
+            menu.add_command(label="Log Reading Session", command=self.log_session)
+            menu.add_command(label="Attachments...", command=self.open_attachments)
+        menu.add_separator()
+        menu.add_command(label="Reorder Readings", command=self.reorder_readings)
+        menu.add_command(label="Import Folder...", command=self.import_reading_folder)
 
         try:
             menu.tk_popup(event.x_root, event.y_root)
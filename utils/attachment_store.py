@@ -0,0 +1,243 @@
+import hashlib
+import io
+import mimetypes
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+STORE_DIR_NAME = "attachments"  # Created next to the database file
+COPY_CHUNK_BYTES = 1024 * 1024  # Read size while hashing/copying a file into the store
+VERIFY_INTERVAL_DAYS = 30  # A blob is re-hashed by verify_blobs at most this often
+VERIFY_BATCH = 50  # Blobs fetched per query while verifying
+SOURCE_EXTENSIONS = (".pdf", ".epub", ".txt", ".md")  # Files picked up by import_folder
+# Attachment tasks share this executor serial key, so garbage collection can
+# never delete a file that an attach running at the same time has just reused
+ATTACHMENT_SERIAL = ("attachments",)
+
+
+class AttachmentStore:
+    """
+    Content-addressed storage for reading source files (PDF, EPUB, text).
+
+    Files live outside SQLite, named by the SHA-256 of their content and
+    sharded by its first two hex digits (attachments/ab/abcdef...), so
+    identical files are stored once however often they are attached.
+    Which readings use a file, and how many, is tracked in the database
+    (reading_attachments / attachment_blobs.ref_count); this class only
+    deals with the files.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    @classmethod
+    def for_database(cls, db_file):
+        """The store that belongs to a database file."""
+        return cls(os.path.join(os.path.dirname(os.path.abspath(db_file)), STORE_DIR_NAME))
+
+    def path_for(self, sha256):
+        return os.path.join(self.root_dir, sha256[:2], sha256)
+
+    def exists(self, sha256):
+        return os.path.exists(self.path_for(sha256))
+
+    def put_file(self, source_path, progress=None):
+        """
+        Copies a file into the store and returns (sha256, size).
+
+        The file is hashed while being copied to a temporary file in the store,
+        which is then renamed into place, so a crash never leaves a partial
+        blob under a valid name. If the content is already stored, the copy is
+        discarded. progress, if given, is called with the bytes copied so far.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.root_dir, suffix=".tmp")
+        try:
+            with open(source_path, "rb") as source, os.fdopen(fd, "wb") as target:
+                while True:
+                    chunk = source.read(COPY_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    target.write(chunk)
+                    size += len(chunk)
+                    if progress:
+                        progress(size)
+                target.flush()
+                os.fsync(target.fileno())
+
+            sha256 = digest.hexdigest()
+            final_path = self.path_for(sha256)
+            if os.path.exists(final_path) and os.path.getsize(final_path) == size:
+                os.remove(temp_path)  # Already stored
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(temp_path, final_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return sha256, size
+
+    @contextmanager
+    def open_blob(self, sha256):
+        """
+        Memory-maps a stored file read-only for the duration of the with block.
+        The pages come straight from the OS page cache, so slicing the mapping
+        (or wrapping it in a memoryview) reads without copying the file.
+        Raises FileNotFoundError if the blob is missing.
+        """
+        with open(self.path_for(sha256), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""  # Empty files cannot be mapped
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def verify(self, sha256, size=None):
+        """Re-hashes a stored file: returns 'ok', 'missing' or 'corrupt'."""
+        try:
+            with self.open_blob(sha256) as data:
+                if size is not None and len(data) != size:
+                    return "corrupt"
+                return "ok" if hashlib.sha256(data).hexdigest() == sha256 else "corrupt"
+        except FileNotFoundError:
+            return "missing"
+
+    def delete(self, sha256):
+        """Removes a stored file (and its shard directory once empty)."""
+        path = self.path_for(sha256)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass  # Other blobs still in the shard
+
+    def export_copy(self, sha256, filename):
+        """
+        Gives a stored file its original name, for opening in another program:
+        a hard link (no copy) in a temporary folder where possible.
+        """
+        target_dir = tempfile.mkdtemp(prefix="reading-tracker-")
+        target = os.path.join(target_dir, os.path.basename(filename))
+        try:
+            os.link(self.path_for(sha256), target)
+        except OSError:
+            shutil.copyfile(self.path_for(sha256), target)
+        return target
+
+
+class MappedFile(io.RawIOBase):
+    """
+    A read-only, seekable file over a memory-mapped blob, for parsers that
+    want a file object (zipfile, pypdf). Reads copy only what is asked for.
+    """
+
+    def __init__(self, data):
+        super().__init__()
+        self._data = data
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = max(0, min(len(buffer), len(self._data) - self._pos))
+        buffer[:count] = self._data[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._data)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+def guess_media_type(filename):
+    return mimetypes.guess_type(filename)[0]
+
+
+# --- Background tasks (run on the TaskExecutor with serial=ATTACHMENT_SERIAL) ---
+
+def attach_files(ctx, store, reading_id, paths):
+    """
+    Background task: copies files into the store and attaches them to a reading.
+    Progress is reported as (file name, bytes copied). Returns the new attachment ids.
+    """
+    attachment_ids = []
+    for path in paths:
+        ctx.check_cancelled()
+        name = os.path.basename(path)
+        sha256, size = store.put_file(path, progress=lambda done: ctx.report_progress((name, done)))
+        attachment_ids.append(ctx.db.add_attachment(reading_id, sha256, size, name, guess_media_type(name)))
+    return attachment_ids
+
+
+def import_folder(ctx, store, project_id, folder):
+    """
+    Background task: adds every source file in a folder to a project as a
+    new reading (titled after the file) with the file attached. Progress is
+    reported as (files imported, total). Returns the number imported.
+    """
+    names = sorted(
+        name for name in os.listdir(folder)
+        if name.lower().endswith(SOURCE_EXTENSIONS) and os.path.isfile(os.path.join(folder, name))
+    )
+    for index, name in enumerate(names, 1):
+        ctx.check_cancelled()
+        sha256, size = store.put_file(os.path.join(folder, name))
+        reading_id = ctx.db.add_reading(project_id, os.path.splitext(name)[0])
+        ctx.db.add_attachment(reading_id, sha256, size, name, guess_media_type(name))
+        ctx.report_progress((index, len(names)))
+    return len(names)
+
+
+def collect_garbage(ctx, store):
+    """Background task: deletes the files of blobs nothing refers to any more. Returns how many went."""
+    removed = 0
+    while True:
+        ctx.check_cancelled()
+        unreferenced = ctx.db.get_unreferenced_blobs()
+        if not unreferenced:
+            return removed
+        for sha256 in unreferenced:
+            if ctx.db.forget_blob(sha256):
+                store.delete(sha256)
+                removed += 1
+
+
+def verify_blobs(ctx, store, max_age_days=VERIFY_INTERVAL_DAYS):
+    """
+    Background task: re-hashes every blob not checked in the last max_age_days
+    and records the result. Reports the number checked so far; returns
+    (checked, list of sha256 found missing or corrupt).
+    """
+    verified_before = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+    checked = 0
+    damaged = []
+    while True:
+        batch = ctx.db.get_blobs_to_verify(verified_before, VERIFY_BATCH)
+        if not batch:
+            return checked, damaged
+        for sha256, size in batch:
+            ctx.check_cancelled()
+            status = store.verify(sha256, size)
+            ctx.db.mark_blob_verified(sha256, status)
+            if status != "ok":
+                damaged.append(sha256)
+            checked += 1
+            ctx.report_progress(checked)
@@ -0,0 +1,88 @@
+import sqlite3
+import tkinter as tk
+
+POLL_INTERVAL_MS = 2000  # How often the database is checked for outside changes (when Tk is idle)
+
+
+class ChangeWatcher:
+    """
+    Notices writes made to the database by anything other than the app's own
+    connection: a second app instance, a script, or the background workers.
+
+    Every POLL_INTERVAL_MS, once Tk is idle, it reads PRAGMA data_version,
+    which costs no I/O and only changes when another connection commits.
+    When it has changed, the change_log rows written since the last check are
+    fetched with one indexed range query and handed to every subscriber, which
+    refreshes just the rows they mention.
+    """
+
+    def __init__(self, root, db_manager, interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.db = db_manager
+        self.interval_ms = interval_ms
+        self._subscribers = []  # (callback, owner widget or None)
+        self._data_version = self.db.get_data_version()
+        self._last_change = self.db.get_last_change_version()
+        self._job = None
+        self._schedule()
+
+    def subscribe(self, callback, owner=None):
+        """
+        Calls callback(changes) with each batch of change_log rows.
+        A subscriber is dropped automatically once its owner widget is destroyed.
+        """
+        self._subscribers.append((callback, owner))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, owner) for cb, owner in self._subscribers if cb != callback]
+
+    def _schedule(self):
+        try:
+            self._job = self.root.after(self.interval_ms, self._on_timer)
+        except tk.TclError:
+            self._job = None  # Tk is shutting down
+
+    def _on_timer(self):
+        # Wait for pending redraws and input before touching the database
+        self._job = self.root.after_idle(self._check)
+
+    def _check(self):
+        self._job = None
+        self._schedule()
+        try:
+            data_version = self.db.get_data_version()
+        except sqlite3.OperationalError as e:
+            print(f"Change check skipped: {e}")
+            return
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        self.check_now()
+
+    def check_now(self):
+        """Delivers any change_log rows written since the last delivery."""
+        changes = self.db.get_changes_since(self._last_change)
+        if not changes:
+            return
+        self._last_change = changes[-1]['version']
+
+        self._subscribers = [(cb, owner) for cb, owner in self._subscribers if self._owner_alive(owner)]
+        for callback, _ in list(self._subscribers):
+            callback(changes)
+
+    @staticmethod
+    def _owner_alive(owner):
+        if owner is None:
+            return True
+        try:
+            return bool(owner.winfo_exists())
+        except Exception:
+            return False
+
+    def stop(self):
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except tk.TclError:
+                pass  # Tk already destroyed
+            self._job = None
@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# --- Add project root to sys.path ---
+import sys
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+from utils.text_extraction import extract_chunks
+
+JOBS_PER_WORKER = 2  # Jobs kept queued per process, so no core waits for the next file
+WAIT_SECONDS = 0.5  # How often the coordinator wakes to check for cancellation and new jobs
+
+
+def run_extraction_jobs(ctx, store_root, max_workers=None):
+    """
+    Background task: works through the persisted extraction_jobs queue with
+    a pool of worker processes (one per core), saving each file's text
+    chunks to the full-text index as soon as it is extracted.
+
+    Jobs are claimed a few at a time, so files attached while this runs are
+    picked up too. Progress is reported as (files done, files left). When
+    cancelled, claimed jobs go back to the queue. A worker crash breaks the
+    whole pool, so it is not known which file caused it: the jobs in flight
+    are rerun one at a time, and only a job that crashes on its own is
+    counted as a failed attempt. Returns the number of files processed.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    processed = 0
+    in_flight = {}  # future -> job
+    suspects = deque()  # Jobs in flight when a worker crashed, rerun alone to find the culprit
+    # Worker processes are spawned, not forked: forking a process running Tk threads is unsafe
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        while True:
+            ctx.check_cancelled()
+            if suspects:
+                jobs = [suspects.popleft()] if not in_flight else []
+            else:
+                free = workers * JOBS_PER_WORKER - len(in_flight)
+                jobs = ctx.db.claim_extraction_jobs(free) if free > 0 else []
+            for job in jobs:
+                future = pool.submit(extract_chunks, store_root, job['sha256'], job['media_type'], job['filename'])
+                in_flight[future] = job
+            if not in_flight:
+                return processed
+
+            done, _ = wait(in_flight, timeout=WAIT_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    chunks = future.result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. on a malformed file)
+                    if in_flight:
+                        # Any of the jobs sharing the pool may have caused it
+                        suspects.append(job)
+                        suspects.extend(in_flight.values())
+                        in_flight.clear()
+                    else:
+                        ctx.db.release_extraction_jobs([job['sha256']], attempt_failed=True)
+                    pool.shutdown(wait=False)
+                    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                    break
+                except Exception as e:
+                    ctx.db.fail_extraction_job(job['sha256'], str(e) or type(e).__name__)
+                else:
+                    ctx.db.save_extraction_result(job['sha256'], chunks)
+                processed += 1
+            ctx.report_progress((processed, ctx.db.count_open_extraction_jobs()))
+    finally:
+        unfinished = list(in_flight.values()) + list(suspects)
+        if unfinished:
+            ctx.db.release_extraction_jobs([job['sha256'] for job in unfinished])
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ExtractionQueue:
+    """
+    Tk-side handle on the text extraction queue.
+
+    The queue itself lives in the database (extraction_jobs), so it survives
+    restarts: resume() re-queues jobs a previous run left half done. start()
+    runs the queue on the task executor if it is not already running;
+    subscribers get each progress report, and None once the queue is empty.
+    """
+
+    def __init__(self, executor, db_manager, store):
+        self.executor = executor
+        self.db = db_manager
+        self.store = store
+        self._task = None
+        self._subscribers = []  # (callback, owner widget or None)
+
+    def subscribe(self, callback, owner=None):
+        """Calls callback((done, left)) while the queue runs; dropped once owner is destroyed."""
+        self._subscribers.append((callback, owner))
+
+    def resume(self):
+        """Called once at startup: picks up where the last run stopped."""
+        self.db.release_all_running_extraction_jobs()
+        if self.db.count_open_extraction_jobs(pending_only=True):
+            self.start()
+
+    def start(self):
+        if self.running():
+            return  # The running task claims newly queued jobs itself
+        self._task = self.executor.submit(
+            run_extraction_jobs, self.store.root_dir,
+            on_done=self._on_done,
+            on_error=self._on_error,
+            on_progress=self._notify
+        )
+
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def stop(self):
+        """Lets the files being extracted finish; the rest stay queued for next time."""
+        if self._task is not None:
+            self._task.cancel()
+
+    def _on_done(self, processed):
+        # Jobs queued just as the task ran out of work would otherwise wait until the next start()
+        if self.db.count_open_extraction_jobs(pending_only=True):
+            self._task = None
+            self.start()
+        else:
+            self._notify(None)
+
+    def _on_error(self, error):
+        print(f"Text extraction stopped: {error!r}")
+        self._notify(None)
+
+    def _notify(self, progress):
+        self._subscribers = [(cb, owner) for cb, owner in self._subscribers if self._owner_alive(owner)]
+        for callback, _ in list(self._subscribers):
+            callback(progress)
+
+    @staticmethod
+    def _owner_alive(owner):
+        if owner is None:
+            return True
+        try:
+            return bool(owner.winfo_exists())
+        except Exception:
+            return False
@@ -0,0 +1,213 @@
+"""
+Graph analytics over the connections network.
+
+The whole link graph is exported from SQLite in one snapshot and held as a
+COO edge list (parallel source/target index arrays). Sparse products are
+np.bincount scatters over those arrays, so PageRank, label propagation and
+the cross-class report are a few vectorized passes per iteration.
+
+Results are cached in the analytics_cache table keyed on graph_version,
+which triggers bump whenever connections (or reading/class membership)
+change; opening the panel again is then a single row read.
+"""
+import json
+
+import numpy as np
+
+from database_manager import parse_node_key
+
+CACHE_NAME = "graph_analytics"
+TOP_CENTRAL = 25
+MIN_CLUSTER_SIZE = 2
+
+
+def _symmetric_edges(source, target, weights=None):
+    """Both directions of an undirected COO edge list."""
+    weights = np.ones(len(source)) if weights is None else weights
+    return (np.concatenate([source, target]),
+            np.concatenate([target, source]),
+            np.concatenate([weights, weights]))
+
+
+def pagerank(count, source, target, damping=0.85, tolerance=1e-8, max_iterations=100):
+    """
+    PageRank by power iteration on an undirected graph.
+
+    :param count: Number of nodes
+    :param source: Edge source indexes
+    :param target: Edge target indexes
+    :return: (count,) scores summing to 1
+    """
+    if count == 0:
+        return np.zeros(0)
+    rows, cols, weights = _symmetric_edges(source, target)
+    out_weight = np.bincount(rows, weights=weights, minlength=count)
+    dangling = out_weight == 0
+    # Each edge carries its share of the source's rank
+    edge_share = weights / np.where(out_weight > 0, out_weight, 1)[rows]
+
+    rank = np.full(count, 1.0 / count)
+    for _ in range(max_iterations):
+        spread = np.bincount(cols, weights=rank[rows] * edge_share, minlength=count)
+        new_rank = (1 - damping) / count + damping * (spread + rank[dangling].sum() / count)
+        if np.abs(new_rank - rank).sum() < tolerance:
+            return new_rank
+        rank = new_rank
+    return rank
+
+
+def label_propagation(count, source, target, weights, max_iterations=30, seed=0):
+    """
+    Community detection: every node repeatedly adopts the label carrying the
+    most edge weight among its neighbours. Half the nodes update per round
+    (chosen at random) so the labels settle instead of oscillating.
+
+    :return: (count,) cluster label per node (isolated nodes keep their own)
+    """
+    labels = np.arange(count)
+    if count == 0 or len(source) == 0:
+        return labels
+    rows, cols, weights = _symmetric_edges(source, target, weights)
+    rng = np.random.default_rng(seed)
+
+    for _ in range(max_iterations):
+        # Total weight per (node, neighbour label), then the heaviest label per node
+        pair = rows * count + labels[cols]
+        pairs, inverse = np.unique(pair, return_inverse=True)
+        totals = np.bincount(inverse, weights=weights)
+        nodes = pairs // count
+        candidate = pairs % count
+        # Sort by node, then weight descending, then label ascending (ties -> smallest label)
+        order = np.lexsort((candidate, -totals, nodes))
+        first = order[np.r_[True, nodes[order][1:] != nodes[order][:-1]]]
+
+        best = labels.copy()
+        best[nodes[first]] = candidate[first]
+        if (best == labels).all():
+            break
+        labels = np.where(rng.random(count) < 0.5, best, labels)
+    return labels
+
+
+def compute_graph_analytics(connections, readings, projects):
+    """
+    :param connections: (source_key, target_key) tuples
+    :param readings: (reading_id, project_id, title) tuples
+    :param projects: (project_id, name, class_id, class_name) tuples, class_id 0 = none
+    :return: JSON-serialisable dict with 'central', 'clusters' and 'shared_readings'
+    """
+    # --- Node-level graph ---
+    keys = np.array([key for pair in connections for key in pair], dtype=object)
+    if len(keys):
+        node_keys, flat = np.unique(keys, return_inverse=True)
+        source, target = flat[0::2], flat[1::2]
+    else:
+        node_keys = np.array([], dtype=object)
+        source = target = np.zeros(0, dtype=np.int64)
+
+    scores = pagerank(len(node_keys), source, target)
+    top = np.argsort(-scores, kind="stable")[:TOP_CENTRAL]
+    central = [[node_keys[i], float(scores[i])] for i in top]
+
+    # --- Project-level graph: notes and readings fold into their project ---
+    reading_project = {reading_id: project_id for reading_id, project_id, _ in readings}
+    owner = np.zeros(len(node_keys), dtype=np.int64)
+    for index, key in enumerate(node_keys):
+        kind, item_id, _ = parse_node_key(key)
+        owner[index] = reading_project.get(item_id, 0) if kind == "reading" else item_id
+
+    project_ids = np.array([row[0] for row in projects], dtype=np.int64)
+    project_ids.sort()
+    project_source = owner[source]
+    project_target = owner[target]
+    keep = (project_source != project_target) & np.isin(project_source, project_ids) \
+        & np.isin(project_target, project_ids)
+    a = np.searchsorted(project_ids, project_source[keep])
+    b = np.searchsorted(project_ids, project_target[keep])
+    # Merge parallel links into weighted edges
+    span = max(len(project_ids), 1)
+    merged, link_count = np.unique(np.minimum(a, b) * span + np.maximum(a, b), return_counts=True)
+
+    cluster_labels = label_propagation(len(project_ids), merged // span, merged % span, link_count.astype(float))
+    linked = np.zeros(len(project_ids), dtype=bool)
+    linked[merged // span] = True
+    linked[merged % span] = True
+    clusters = []
+    for label in np.unique(cluster_labels[linked]):
+        members = project_ids[(cluster_labels == label) & linked]
+        if len(members) >= MIN_CLUSTER_SIZE:
+            clusters.append([int(project_id) for project_id in members])
+    clusters.sort(key=len, reverse=True)
+
+    return {
+        "central": central,
+        "clusters": clusters,
+        "shared_readings": shared_readings_across_classes(readings, projects, owner, node_keys, source, target),
+    }
+
+
+def shared_readings_across_classes(readings, projects, owner, node_keys, source, target):
+    """
+    Readings that reach more than one class: the same title read in projects of
+    different classes, or a reading linked to projects in other classes.
+
+    :return: [[title, [class names]], ...], most widely shared first
+    """
+    if not readings:
+        return []
+    class_of = {row[0]: row[2] for row in projects}
+    class_names = {row[2]: row[3] for row in projects if row[2]}
+
+    reading_ids = np.array([row[0] for row in readings], dtype=np.int64)
+    titles = np.array([" ".join(str(row[2]).lower().split()) for row in readings], dtype=object)
+    _, first_reading, title_index = np.unique(titles, return_index=True, return_inverse=True)
+    reading_class = np.array([class_of.get(row[1], 0) for row in readings], dtype=np.int64)
+
+    # (title, class) pairs from ownership...
+    pair_title = [title_index]
+    pair_class = [reading_class]
+
+    # ...and from links between a reading and any project-owned node
+    if len(node_keys):
+        is_reading = np.array([key.startswith("reading:") for key in node_keys])
+        node_item = np.array([parse_node_key(key)[1] for key in node_keys], dtype=np.int64)
+        order = np.argsort(reading_ids)
+        for reading_end, other_end in ((source, target), (target, source)):
+            mask = is_reading[reading_end] & ~is_reading[other_end]
+            found = np.searchsorted(reading_ids[order], node_item[reading_end[mask]])
+            found = np.clip(found, 0, len(reading_ids) - 1)
+            valid = reading_ids[order][found] == node_item[reading_end[mask]]
+            rows = order[found[valid]]
+            pair_title.append(title_index[rows])
+            pair_class.append(np.array([class_of.get(int(p), 0) for p in owner[other_end[mask]][valid]],
+                                       dtype=np.int64))
+
+    titles_flat = np.concatenate(pair_title)
+    classes_flat = np.concatenate(pair_class)
+    in_class = classes_flat > 0
+    pairs = np.unique(np.stack([titles_flat[in_class], classes_flat[in_class]], axis=1), axis=0)
+    if not len(pairs):
+        return []
+    title_ids, class_counts = np.unique(pairs[:, 0], return_counts=True)
+
+    shared = []
+    for title_id in title_ids[class_counts > 1]:
+        classes = pairs[pairs[:, 0] == title_id, 1]
+        shared.append([readings[first_reading[title_id]][2], sorted(class_names[int(c)] for c in classes)])
+    shared.sort(key=lambda entry: (-len(entry[1]), entry[0]))
+    return shared
+
+
+def load_graph_analytics(db):
+    """
+    Returns the analytics for the current graph, recomputing only if the
+    graph changed since they were last cached.
+    """
+    version = db.get_graph_version()
+    cached = db.get_analytics_cache(CACHE_NAME)
+    if cached is not None and cached[0] == version:
+        return json.loads(cached[1])
+
+    result = compute_graph_analytics(*db.get_graph_snapshot())
+    db.save_analytics_cache(CACHE_NAME, version, json.dumps(result))
+    return result
@@ -0,0 +1,235 @@
+"""
+Export of projects to Markdown or HTML files, as a streaming pipeline:
+projects are read from the database one at a time, rendered into text
+chunks and written straight to disk, so memory use stays flat however
+many projects (or readings) are exported.
+"""
+import os
+import re
+from html import escape
+
+from database_manager import NOTE_FIELDS, decode_note
+from utils.markdown_syntax import HEADING_RE, QUOTE_RE, BULLET_RE, FENCE_RE, INLINE_RE
+
+# Format name -> file extension
+EXPORT_FORMATS = {
+    "markdown": ".md",
+    "html": ".html",
+}
+# Note field -> the instructions column shown above it on the dashboard
+SECTION_INSTRUCTIONS = {
+    "key_questions_text": "key_questions_instr",
+    "thesis_text": "thesis_instr",
+    "insights_text": "insights_instr",
+    "unresolved_text": "unresolved_instr",
+}
+SLUG_MAX_CHARS = 60  # Longest name part of an exported file or folder name
+HTML_STYLE = (
+    "body{font-family:sans-serif;max-width:50em;margin:2em auto;padding:0 1em;line-height:1.5}"
+    "table{border-collapse:collapse}th,td{border:1px solid #ccc;padding:.25em .5em;text-align:left}"
+    "blockquote{color:#555;border-left:3px solid #ccc;margin-left:0;padding-left:1em}"
+)
+
+
+def slugify(name):
+    """A file-system-safe version of a name."""
+    slug = re.sub(r"[^\w\- ]+", "", name).strip()
+    slug = re.sub(r"\s+", "-", slug)[:SLUG_MAX_CHARS]
+    return slug or "untitled"
+
+
+# --- Markdown ---
+
+def markdown_cell(value):
+    return "" if value is None else str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def render_markdown(project, readings):
+    """Yields the Markdown text of one project, piece by piece."""
+    yield f"# {project['name']}\n\n"
+    if project['class_name']:
+        yield f"*Class: {project['class_name']}*\n\n"
+
+    for field, label in NOTE_FIELDS.items():
+        yield f"## {label}\n\n"
+        instructions = project[SECTION_INSTRUCTIONS[field]] if field in SECTION_INSTRUCTIONS else None
+        if instructions:
+            yield "".join(f"> {line}\n" for line in instructions.splitlines()) + "\n"
+        text = (decode_note(project[field]) or "").strip()
+        yield f"{text}\n\n" if text else "*No notes yet.*\n\n"
+
+    yield "## Readings\n\n"
+    header_written = False
+    for reading in readings:
+        if not header_written:
+            yield "| Title | Authors | Status | Pages |\n|---|---|---|---|\n"
+            header_written = True
+        pages = f"{reading['pages_read']} / {reading['total_pages']}" if reading['total_pages'] else reading['pages_read']
+        yield (f"| {markdown_cell(reading['title'])} | {markdown_cell(reading['authors'])} "
+               f"| {markdown_cell(reading['status'])} | {markdown_cell(pages)} |\n")
+    yield "\n" if header_written else "*No readings yet.*\n"
+
+
+# --- HTML ---
+
+def inline_html(text):
+    """Escapes a line of note text, turning `code`, **bold** and *italic* into tags."""
+    parts = []
+    position = 0
+    for match in INLINE_RE.finditer(text):
+        parts.append(escape(text[position:match.start()]))
+        token = match.group()
+        if match.lastgroup == "code":
+            parts.append(f"<code>{escape(token[1:-1])}</code>")
+        elif match.lastgroup == "bold":
+            parts.append(f"<strong>{escape(token[2:-2])}</strong>")
+        else:
+            parts.append(f"<em>{escape(token[1:-1])}</em>")
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return "".join(parts)
+
+
+def markdown_to_html(text, heading_offset=2):
+    """
+    Yields the HTML of a note, line by line, for the same Markdown subset the
+    note editor highlights (headings, quotes, lists, code fences and inline
+    styles). Note headings are shifted down by heading_offset levels so they
+    nest under the section heading.
+    """
+    in_list = False
+    in_code = False
+    for line in text.splitlines():
+        if FENCE_RE.match(line):
+            yield "</code></pre>\n" if in_code else ("</ul>\n" if in_list else "") + "<pre><code>"
+            in_list = False
+            in_code = not in_code
+            continue
+        if in_code:
+            yield escape(line) + "\n"
+            continue
+
+        bullet = BULLET_RE.match(line)
+        if bullet:
+            if not in_list:
+                yield "<ul>\n"
+                in_list = True
+            yield f"<li>{inline_html(line[bullet.end():])}</li>\n"
+            continue
+        if in_list:
+            yield "</ul>\n"
+            in_list = False
+
+        heading = HEADING_RE.match(line)
+        quote = QUOTE_RE.match(line)
+        if heading:
+            level = min(len(heading.group(1)) + heading_offset, 6)
+            yield f"<h{level}>{inline_html(line[len(heading.group(1)):].strip())}</h{level}>\n"
+        elif quote:
+            yield f"<blockquote>{inline_html(line[quote.end():])}</blockquote>\n"
+        elif line.strip():
+            yield f"<p>{inline_html(line)}</p>\n"
+    if in_code:
+        yield "</code></pre>\n"
+    if in_list:
+        yield "</ul>\n"
+
+
+def html_page_start(title):
+    return (f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{escape(title)}</title>\n"
+            f"<style>{HTML_STYLE}</style>\n</head>\n<body>\n")
+
+
+def render_html(project, readings):
+    """Yields the HTML page of one project, piece by piece."""
+    yield html_page_start(project['name'])
+    yield f"<h1>{escape(project['name'])}</h1>\n"
+    if project['class_name']:
+        yield f"<p><em>Class: {escape(project['class_name'])}</em></p>\n"
+
+    for field, label in NOTE_FIELDS.items():
+        yield f"<h2>{escape(label)}</h2>\n"
+        instructions = project[SECTION_INSTRUCTIONS[field]] if field in SECTION_INSTRUCTIONS else None
+        if instructions:
+            yield f"<blockquote>{escape(instructions)}</blockquote>\n"
+        text = (decode_note(project[field]) or "").strip()
+        if text:
+            yield from markdown_to_html(text)
+        else:
+            yield "<p><em>No notes yet.</em></p>\n"
+
+    yield "<h2>Readings</h2>\n"
+    header_written = False
+    for reading in readings:
+        if not header_written:
+            yield "<table>\n<tr><th>Title</th><th>Authors</th><th>Status</th><th>Pages</th></tr>\n"
+            header_written = True
+        pages = f"{reading['pages_read']} / {reading['total_pages']}" if reading['total_pages'] else reading['pages_read']
+        yield (f"<tr><td>{escape(reading['title'])}</td><td>{escape(reading['authors'] or '')}</td>"
+               f"<td>{escape(reading['status'])}</td><td>{escape(str(pages))}</td></tr>\n")
+    yield "</table>\n" if header_written else "<p><em>No readings yet.</em></p>\n"
+    yield "</body>\n</html>\n"
+
+
+RENDERERS = {
+    "markdown": render_markdown,
+    "html": render_html,
+}
+
+
+# --- Writing ---
+
+def write_chunks(path, chunks):
+    """Writes text chunks to a file as they arrive; the file appears under its name only once complete."""
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="\n") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def export_projects(ctx, root_id, fmt, target_dir):
+    """
+    Background task: exports the projects under root_id (a project, a class,
+    or None for the whole library) into target_dir, one file per project in a
+    folder per class, plus an index file linking them all. Progress is
+    reported as (projects written, total, project name). Returns
+    (number exported, path of the index file).
+    """
+    extension = EXPORT_FORMATS[fmt]
+    render = RENDERERS[fmt]
+    total = ctx.db.count_export_projects(root_id)
+    os.makedirs(target_dir, exist_ok=True)
+    index_path = os.path.join(target_dir, "index" + extension)
+
+    exported = 0
+    current_class = None
+    with open(index_path, "w", encoding="utf-8", newline="\n") as index:
+        index.write(html_page_start("Reading Tracker Export") + "<h1>Reading Tracker Export</h1>\n<ul>\n"
+                    if fmt == "html" else "# Reading Tracker Export\n\n")
+        for project in ctx.db.iter_export_projects(root_id):
+            ctx.check_cancelled()
+            folder = ""
+            if project['class_name'] is not None:
+                folder = f"{project['parent_id']}-{slugify(project['class_name'])}"
+                os.makedirs(os.path.join(target_dir, folder), exist_ok=True)
+                if project['parent_id'] != current_class:
+                    current_class = project['parent_id']
+                    index.write(f"</ul>\n<h2>{escape(project['class_name'])}</h2>\n<ul>\n"
+                                if fmt == "html" else f"\n## {project['class_name']}\n\n")
+            file_name = f"{project['id']}-{slugify(project['name'])}{extension}"
+            relative_path = f"{folder}/{file_name}" if folder else file_name
+
+            write_chunks(os.path.join(target_dir, folder, file_name),
+                         render(project, ctx.db.iter_project_readings(project['id'])))
+            index.write(f"<li><a href=\"{escape(relative_path)}\">{escape(project['name'])}</a></li>\n"
+                        if fmt == "html" else f"- [{project['name']}]({relative_path})\n")
+            exported += 1
+            ctx.report_progress((exported, total, project['name']))
+        index.write("</ul>\n</body>\n</html>\n" if fmt == "html" else "")
+    return exported, index_path
@@ -0,0 +1,207 @@
+import tkinter as tk
+from tkinter import font
+
+from utils.markdown_syntax import STATE_NORMAL, HIGHLIGHT_TAGS, tokenize_line
+
+
+class MarkdownHighlighter:
+    """
+    Live markdown-style highlighting for a tk.Text widget.
+
+    Edits are intercepted at the Tcl widget command, so only the lines an
+    insert/delete touches are re-tokenized. Each line's end state and the tags
+    applied to it are cached, and re-tokenizing stops as soon as a line ends in
+    the same state it did before.
+    """
+
+    def __init__(self, text_widget, lines_per_pass=300):
+        self.text_widget = text_widget
+        self.lines_per_pass = lines_per_pass
+
+        # One entry per line: (end_state, tags applied to that line)
+        self.line_cache = [(None, ())]
+        # Sorted, non-overlapping [first, last] line ranges still to tokenize
+        self.pending = []
+        self._after_id = None
+        self._edit_count = 0  # Inserts/deletes seen, including those an undo replays
+        self.fonts = {}
+
+        self._configure_tags()
+
+        # --- Wrap the widget command to see every edit ---
+        widget_cmd = str(text_widget)
+        self._orig_cmd = widget_cmd + "_orig"
+        text_widget.tk.call("rename", widget_cmd, self._orig_cmd)
+        text_widget.tk.createcommand(widget_cmd, self._proxy)
+        text_widget.bind("<Destroy>", self._on_destroy, add="+")
+
+        self._on_lines_changed(1, self._line_count() - 1)
+
+    def _configure_tags(self):
+        """Configures the tags not already set up by TextToolbar."""
+        base = font.Font(font=self.text_widget.cget("font")).actual()
+        for level, delta in ((1, 6), (2, 4), (3, 2)):
+            self.fonts[level] = font.Font(**{**base, "size": base["size"] + delta, "weight": "bold"})
+            self.text_widget.tag_configure(f"heading{level}", font=self.fonts[level])
+
+        self.fonts["code"] = font.Font(family="Courier", size=base["size"])
+        self.text_widget.tag_configure("code", font=self.fonts["code"], background="#F2F2F2")
+        self.text_widget.tag_configure("md_marker", foreground="#9A9A9A")
+
+        # Keep the dynamic toolbar font tags ('f_...') winning over these
+        existing_tags = self.text_widget.tag_names()
+        for tag in HIGHLIGHT_TAGS:
+            if tag in existing_tags:
+                self.text_widget.tag_lower(tag)
+
+    # --- Edit tracking ---
+
+    def _call(self, *args):
+        return self.text_widget.tk.call((self._orig_cmd,) + args)
+
+    def _line_count(self):
+        return int(str(self._call("index", "end-1c")).split(".")[0])
+
+    def _line_of(self, index):
+        return int(str(self._call("index", index)).split(".")[0])
+
+    def _proxy(self, command, *args):
+        """Replacement widget command; forwards everything to the real widget."""
+        if command not in ("insert", "delete", "replace", "edit"):
+            return self._call(command, *args)
+
+        if command == "edit":
+            if not args or args[0] not in ("undo", "redo"):
+                return self._call(command, *args)
+            # Tk replays an undo step as insert/delete calls on the widget command,
+            # which come back through here and splice the cache where they happen
+            edits = self._edit_count
+            result = self._call(command, *args)
+            if self._edit_count == edits:
+                # The change bypassed this proxy, so where it happened is unknown
+                self._invalidate_all()
+            return result
+
+        self._edit_count += 1
+        before = self._line_count()
+        first = min(self._line_of(args[0]), before)
+
+        result = self._call(command, *args)
+
+        self._on_lines_changed(first, self._line_count() - before)
+        return result
+
+    def _invalidate_all(self):
+        """Re-tokenizes every line, clearing all highlight tags on the way."""
+        line_count = self._line_count()
+        self.line_cache = [(None, HIGHLIGHT_TAGS)] * line_count
+        self.pending = [[1, line_count]]
+        self._schedule()
+
+    def _on_lines_changed(self, first, delta):
+        """Splices the line cache and marks the touched lines for tokenizing."""
+        index = first - 1
+        if delta > 0:
+            # Split lines may still carry the original line's tags
+            _, old_tags = self.line_cache[index]
+            self.line_cache[index + 1:index + 1] = [(None, old_tags)] * delta
+        elif delta < 0:
+            # The merged line ends where the last removed line used to end
+            removed = self.line_cache[index:index + 1 - delta]
+            merged_tags = tuple({tag for _, tags in removed for tag in tags})
+            self.line_cache[index:index + 1 - delta] = [(removed[-1][0], merged_tags)]
+
+        self._shift_pending(first, delta)
+        self._add_pending(first, first + max(delta, 0))
+        self._schedule()
+
+    def _shift_pending(self, first, delta):
+        """Moves pending ranges below an edit by the number of lines it added/removed."""
+        if delta == 0:
+            return
+        shifted = []
+        for start, end in self.pending:
+            if start > first:
+                start = max(first, start + delta)
+            if end > first:
+                end = max(first, end + delta)
+            shifted.append([start, end])
+        self.pending = shifted
+
+    def _add_pending(self, first, last):
+        """Adds a line range, keeping the pending list sorted and merged."""
+        merged = []
+        for start, end in sorted(self.pending + [[first, last]]):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.pending = merged
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.text_widget.after_idle(self._process_pending)
+
+    # --- Tokenizing ---
+
+    def _process_pending(self):
+        """Tokenizes pending lines, up to lines_per_pass per idle callback."""
+        self._after_id = None
+        budget = self.lines_per_pass
+        line_count = len(self.line_cache)
+
+        while self.pending and budget > 0:
+            start, end = self.pending.pop(0)
+            line = start
+            while line <= line_count:
+                if budget == 0:
+                    # Out of budget: resume from this line on the next pass
+                    self._add_pending(line, max(end, line))
+                    break
+                state_changed = self._tokenize(line)
+                budget -= 1
+                line += 1
+                if line > end and not state_changed:
+                    break
+
+        if self.pending:
+            self._after_id = self.text_widget.after(1, self._process_pending)
+
+    def _tokenize(self, line_no):
+        """
+        Re-tokenizes one line.
+        :return: True if the line's end state differs from the cached one
+        """
+        index = line_no - 1
+        in_state = STATE_NORMAL
+        if index > 0:
+            in_state = self.line_cache[index - 1][0] or STATE_NORMAL
+
+        line_start = f"{line_no}.0"
+        line_end = f"{line_no}.end"
+        old_state, old_tags = self.line_cache[index]
+        for tag in old_tags:
+            self._call("tag", "remove", tag, line_start, line_end)
+
+        text = self._call("get", line_start, line_end)
+        spans, end_state = tokenize_line(str(text), in_state)
+        for tag, start, end in spans:
+            if end > start:
+                self._call("tag", "add", tag, f"{line_no}.{start}", f"{line_no}.{end}")
+
+        self.line_cache[index] = (end_state, tuple({tag for tag, _, _ in spans}))
+        return end_state != old_state
+
+    def _on_destroy(self, event):
+        if event.widget is not self.text_widget:
+            return
+        if self._after_id is not None:
+            try:
+                self.text_widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        try:
+            self.text_widget.tk.deletecommand(str(self.text_widget))
+        except tk.TclError:
+            pass
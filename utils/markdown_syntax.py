@@ -0,0 +1,75 @@
+"""
+The markdown-style syntax of project notes, without Tk: the note editor
+highlights it (utils/markdown_highlighter.py) and exports render it.
+"""
+import re
+
+
+# Line states carried from one line to the next
+STATE_NORMAL = 0
+STATE_CODE_FENCE = 1
+
+HEADING_RE = re.compile(r"^(#{1,3})\s+\S")
+QUOTE_RE = re.compile(r"^>\s?")
+BULLET_RE = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+")
+FENCE_RE = re.compile(r"^\s*```")
+
+INLINE_RE = re.compile(
+    r"(?P<code>`[^`\n]+`)"
+    r"|(?P<bold>\*\*(?=\S)[^\n]+?(?<=\S)\*\*)"
+    r"|(?P<italic>(?<![*\w])\*(?=[^\s*])[^*\n]+?(?<=\S)\*(?!\*)"
+    r"|(?<!\w)_(?=\S)[^_\n]+?(?<=\S)_(?!\w))"
+)
+
+# Tags this highlighter may add. 'bold', 'italic', 'bullet' and 'indent' are the
+# names TextToolbar configures; the rest are configured here.
+HIGHLIGHT_TAGS = ("bold", "italic", "bullet", "indent",
+                  "heading1", "heading2", "heading3", "code", "md_marker")
+
+
+def tokenize_line(line, state):
+    """
+    Tokenizes a single line of markdown-style text.
+
+    :param line: The line text, without its trailing newline
+    :param state: The state the previous line ended in
+    :return: (spans, end_state), where spans is a list of (tag, start_col, end_col)
+    """
+    if FENCE_RE.match(line):
+        new_state = STATE_NORMAL if state == STATE_CODE_FENCE else STATE_CODE_FENCE
+        return [("code", 0, len(line))], new_state
+
+    if state == STATE_CODE_FENCE:
+        return [("code", 0, len(line))], state
+
+    spans = []
+    inline_start = 0
+
+    heading = HEADING_RE.match(line)
+    if heading:
+        level = len(heading.group(1))
+        spans.append((f"heading{level}", 0, len(line)))
+        spans.append(("md_marker", 0, level))
+        return spans, state
+
+    quote = QUOTE_RE.match(line)
+    if quote:
+        spans.append(("indent", 0, len(line)))
+        spans.append(("md_marker", 0, quote.end()))
+        inline_start = quote.end()
+    else:
+        bullet = BULLET_RE.match(line)
+        if bullet:
+            spans.append(("bullet", 0, len(line)))
+            spans.append(("md_marker", 0, bullet.end()))
+            inline_start = bullet.end()
+
+    for match in INLINE_RE.finditer(line, inline_start):
+        kind = match.lastgroup
+        start, end = match.span()
+        marker = 2 if kind == "bold" else 1
+        spans.append((kind, start, end))
+        spans.append(("md_marker", start, start + marker))
+        spans.append(("md_marker", end - marker, end))
+
+    return spans, state
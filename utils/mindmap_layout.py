@@ -0,0 +1,274 @@
+"""
+Automatic mindmap layouts (force-directed and tree), vectorized with NumPy.
+
+Layouts run in a separate process (see run_layout_job) and stream
+intermediate positions back through a multiprocessing queue, so the
+Tk event loop keeps running and nodes can be animated into place.
+"""
+import itertools
+
+import numpy as np
+
+IDEAL_EDGE_LENGTH = 180.0
+EXACT_REPULSION_LIMIT = 400  # Below this many nodes, repulsion is computed pair by pair
+BLOCK_ROWS = 256  # Rows per block when building (rows x n) force matrices
+TREE_X_GAP = 170.0
+TREE_Y_GAP = 110.0
+
+
+# --- Force-directed layout ---
+
+def _pairwise_repulsion(targets, sources, k_squared):
+    """Repulsion on each target point from every source point (self-pairs contribute 0)."""
+    delta = targets[:, None, :] - sources[None, :, :]
+    dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+    inverse = np.divide(k_squared, dist_sq, out=np.zeros_like(dist_sq), where=dist_sq > 1e-9)
+    return np.einsum("ijk,ij->ik", delta, inverse)
+
+
+def _repulsion(positions, k_squared):
+    """
+    Repulsive displacement for every node.
+
+    Small maps use exact all-pairs forces. Larger maps bucket nodes into a
+    grid: nodes in the same or adjacent cells repel exactly, farther cells
+    act as a single mass at their centroid.
+    """
+    count = len(positions)
+    displacement = np.zeros_like(positions)
+
+    if count <= EXACT_REPULSION_LIMIT:
+        for start in range(0, count, BLOCK_ROWS):
+            rows = slice(start, start + BLOCK_ROWS)
+            displacement[rows] = _pairwise_repulsion(positions[rows], positions, k_squared)
+        return displacement
+
+    grid_size = int(np.clip(np.ceil(np.sqrt(count / 8)), 2, 64))
+    low = positions.min(axis=0)
+    extent = np.maximum(positions.max(axis=0) - low, 1.0)
+    cell_xy = np.minimum((positions - low) / extent * grid_size, grid_size - 1).astype(np.int64)
+    cells, node_cell = np.unique(cell_xy[:, 0] * grid_size + cell_xy[:, 1], return_inverse=True)
+    cell_counts = np.bincount(node_cell)
+    centroids = np.stack([
+        np.bincount(node_cell, weights=positions[:, 0]),
+        np.bincount(node_cell, weights=positions[:, 1]),
+    ], axis=1) / cell_counts[:, None]
+    cells_x = cells // grid_size
+    cells_y = cells % grid_size
+
+    # --- Far field: cell against cell, for cells that are not adjacent ---
+    far = (np.abs(cells_x[:, None] - cells_x[None, :]) > 1) | (np.abs(cells_y[:, None] - cells_y[None, :]) > 1)
+    delta = centroids[:, None, :] - centroids[None, :, :]
+    dist_sq = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), 1e-9)
+    weights = np.where(far, cell_counts[None, :] * k_squared / dist_sq, 0.0)
+    displacement += np.einsum("ijk,ij->ik", delta, weights)[node_cell]
+
+    # --- Near field: exact forces between nodes of the same or adjacent cells ---
+    order = np.argsort(node_cell, kind="stable")
+    first_member = np.concatenate([[0], np.cumsum(cell_counts)[:-1]])
+    lookup = np.full(grid_size * grid_size, -1, dtype=np.int64)
+    lookup[cells] = np.arange(len(cells))
+
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            nx = cells_x + dx
+            ny = cells_y + dy
+            inside = (nx >= 0) & (nx < grid_size) & (ny >= 0) & (ny < grid_size)
+            a_cells = np.flatnonzero(inside)
+            b_cells = lookup[nx[inside] * grid_size + ny[inside]]
+            a_cells = a_cells[b_cells >= 0]
+            b_cells = b_cells[b_cells >= 0]
+
+            # Every (node in a, node in b) pair, generated without a Python loop
+            a_counts = cell_counts[a_cells]
+            b_counts = cell_counts[b_cells]
+            sizes = a_counts * b_counts
+            owner = np.repeat(np.arange(len(a_cells)), sizes)
+            local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            i = order[first_member[a_cells][owner] + local // b_counts[owner]]
+            j = order[first_member[b_cells][owner] + local % b_counts[owner]]
+
+            pair_delta = positions[i] - positions[j]
+            pair_dist_sq = np.einsum("ij,ij->i", pair_delta, pair_delta)
+            push = np.divide(k_squared, pair_dist_sq, out=np.zeros_like(pair_dist_sq), where=pair_dist_sq > 1e-9)
+            displacement[:, 0] += np.bincount(i, weights=pair_delta[:, 0] * push, minlength=count)
+            displacement[:, 1] += np.bincount(i, weights=pair_delta[:, 1] * push, minlength=count)
+
+    return displacement
+
+
+def force_directed_layout(positions, edges, pinned=None, iterations=250, ideal_length=IDEAL_EDGE_LENGTH,
+                          report=None, report_every=5, initial_temperature=None):
+    """
+    Fruchterman-Reingold layout.
+
+    :param positions: (n, 2) starting positions
+    :param edges: (m, 2) array of node index pairs
+    :param pinned: Optional boolean mask of nodes that must not move
+    :param iterations: Number of simulation steps
+    :param ideal_length: Preferred edge length
+    :param report: Optional callback receiving the positions every report_every steps
+    :param initial_temperature: Largest step a node may take at first
+    :return: (n, 2) final positions
+    """
+    positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    count = len(positions)
+    if count == 0:
+        return positions
+
+    movable = np.ones(count, dtype=bool) if pinned is None else ~np.asarray(pinned, dtype=bool)
+    k = float(ideal_length)
+    k_squared = k * k
+    temperature = initial_temperature or k * 2
+    cooling = (0.02 ** (1.0 / max(iterations, 1)))
+
+    # Separate nodes that start on top of each other
+    rng = np.random.default_rng(0)
+    positions[movable] += rng.normal(scale=1.0, size=(movable.sum(), 2))
+
+    sources = edges[:, 0]
+    targets = edges[:, 1]
+    for step in range(iterations):
+        displacement = _repulsion(positions, k_squared)
+
+        delta = positions[sources] - positions[targets]
+        distance = np.sqrt(np.einsum("ij,ij->i", delta, delta))[:, None]
+        pull = delta * distance / k
+        np.subtract.at(displacement, sources, pull)
+        np.add.at(displacement, targets, pull)
+
+        length = np.sqrt(np.einsum("ij,ij->i", displacement, displacement))
+        limited = np.minimum(length, temperature)
+        step_scale = np.divide(limited, length, out=np.zeros_like(length), where=length > 0)
+        positions[movable] += displacement[movable] * step_scale[movable, None]
+        temperature *= cooling
+
+        if report is not None and (step + 1) % report_every == 0:
+            report(positions)
+
+    return positions
+
+
+# --- Tree layout ---
+
+def tree_layout(count, edges, roots=None, x_gap=TREE_X_GAP, y_gap=TREE_Y_GAP):
+    """
+    Layered tree layout: depth sets the row, and each subtree gets a band as wide
+    as its number of leaves. Edges are followed source -> target breadth-first;
+    nodes left unreached (e.g. in cycles) start new trees.
+
+    :param count: Number of nodes
+    :param edges: (m, 2) array of node index pairs
+    :param roots: Optional node indexes to start from
+    :return: (count, 2) positions
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if count == 0:
+        return np.zeros((0, 2))
+
+    # Adjacency in CSR form (both directions, so every edge is walkable)
+    both = np.concatenate([edges, edges[:, ::-1]])
+    order = np.argsort(both[:, 0], kind="stable")
+    neighbour = both[order, 1]
+    offsets = np.searchsorted(both[order, 0], np.arange(count + 1))
+
+    if roots is None:
+        has_parent = np.zeros(count, dtype=bool)
+        has_parent[edges[:, 1]] = True
+        roots = np.flatnonzero(~has_parent)
+
+    parent = np.full(count, -1, dtype=np.int64)
+    depth = np.full(count, -1, dtype=np.int64)
+    levels = []
+    for root in itertools.chain(roots, range(count)):
+        if depth[root] >= 0:
+            continue
+        depth[root] = 0
+        frontier = np.array([root])
+        level = 0
+        while len(frontier):
+            if len(levels) <= level:
+                levels.append([])
+            levels[level].append(frontier)
+            # Expand the whole frontier at once
+            starts = offsets[frontier]
+            lengths = offsets[frontier + 1] - starts
+            owners = np.repeat(frontier, lengths)
+            flat = np.repeat(starts - np.cumsum(np.concatenate([[0], lengths[:-1]])), lengths) \
+                + np.arange(lengths.sum())
+            candidates = neighbour[flat]
+            fresh = depth[candidates] < 0
+            candidates, owners = candidates[fresh], owners[fresh]
+            candidates, first = np.unique(candidates, return_index=True)
+            owners = owners[first]
+            depth[candidates] = level + 1
+            parent[candidates] = owners
+            frontier = candidates
+            level += 1
+
+    levels = [np.concatenate(level) for level in levels]
+
+    # --- Bottom-up: a subtree is as wide as its leaves ---
+    width = np.zeros(count)
+    for level in reversed(levels):
+        # Children were summed into their parents already; leaves are 1 wide
+        width[level] = np.where(width[level] > 0, width[level], 1.0)
+        children = level[parent[level] >= 0]
+        np.add.at(width, parent[children], width[children])
+
+    # --- Top-down: place each child band inside its parent's band ---
+    left = np.zeros(count)
+    tree_roots = levels[0] if levels else np.array([], dtype=np.int64)
+    left[tree_roots] = np.concatenate([[0], np.cumsum(width[tree_roots])[:-1]])
+    for level in levels[1:]:
+        level = level[np.argsort(parent[level], kind="stable")]
+        parents = parent[level]
+        running = np.cumsum(width[level])
+        group_start = np.searchsorted(parents, parents)
+        before_group = np.where(group_start > 0, running[group_start - 1], 0.0)
+        left[level] = left[parents] + running - width[level] - before_group
+
+    positions = np.empty((count, 2))
+    positions[:, 0] = (left + width / 2) * x_gap
+    positions[:, 1] = depth * y_gap
+    return positions
+
+
+# --- Worker process ---
+
+def run_layout_job(job, out_queue):
+    """
+    Worker-process entry point.
+
+    :param job: dict with 'algorithm' ('force' or 'tree'), 'positions', 'edges'
+                and optionally 'pinned', 'iterations', 'frames'
+    :param out_queue: Receives ('frame', positions), then ('done', positions) or ('error', message)
+    """
+    try:
+        start = np.asarray(job['positions'], dtype=np.float64).reshape(-1, 2)
+        edges = job['edges']
+
+        if job['algorithm'] == 'tree':
+            final = tree_layout(len(start), edges)
+            if len(start):
+                # Keep the map roughly where it was
+                final += start.mean(axis=0) - final.mean(axis=0)
+            frames = job.get('frames', 30)
+            for frame in range(1, frames):
+                t = frame / frames
+                eased = t * t * (3 - 2 * t)
+                out_queue.put(('frame', (start + (final - start) * eased).astype(np.float32)))
+        else:
+            final = force_directed_layout(
+                start,
+                edges,
+                pinned=job.get('pinned'),
+                iterations=job.get('iterations', 250),
+                initial_temperature=job.get('temperature'),
+                report=lambda positions: out_queue.put(('frame', positions.astype(np.float32)))
+            )
+
+        out_queue.put(('done', final))
+    except Exception as e:
+        out_queue.put(('error', str(e)))
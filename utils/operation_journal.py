@@ -0,0 +1,86 @@
+from collections import deque
+
+MAX_ENTRIES = 100  # Undo steps kept
+
+
+class OperationJournal:
+    """
+    Multi-level undo/redo for structural edits of the class/project tree.
+
+    Instead of snapshotting the database, each step stores the single action
+    that reverses it:
+
+        ("rename", item_id, name)
+        ("position", item_id, parent_id, display_order)
+        ("delete", item_id)      # move to the Trash
+        ("undelete", item_id)    # take back out of the Trash
+
+    Applying an action returns the action that reverses *it*, so undoing a
+    step yields its redo step and vice versa. Deleted subtrees stay in the
+    database as trashed rows, so every step is a few ids and the journal's
+    storage is bounded by MAX_ENTRIES. Steps whose items were purged from
+    the Trash in the meantime fail with LookupError and are dropped.
+    """
+
+    def __init__(self, db_manager, max_entries=MAX_ENTRIES):
+        self.db = db_manager
+        self._undo = deque(maxlen=max_entries)  # (label, action), newest on the right
+        self._redo = []
+
+    def record(self, label, undo_action):
+        """Stores the action that undoes a just-made edit; clears the redo history."""
+        self._redo.clear()
+        self._undo.append((label, undo_action))
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo_label(self):
+        return self._undo[-1][0] if self._undo else None
+
+    def redo_label(self):
+        return self._redo[-1][0] if self._redo else None
+
+    def undo(self):
+        """Reverses the latest edit. Returns its label, or None if there is nothing to undo."""
+        return self._step(self._undo, self._redo)
+
+    def redo(self):
+        """Re-applies the latest undone edit. Returns its label, or None."""
+        return self._step(self._redo, self._undo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+    def _step(self, source, target):
+        if not source:
+            return None
+        label, action = source.pop()
+        # If this raises (e.g. the item was purged meanwhile) the step is dropped
+        target.append((label, self._apply(action)))
+        return label
+
+    def _apply(self, action):
+        """Performs one action and returns the action that reverses it."""
+        kind = action[0]
+        item = self.db.get_item_details(action[1])
+        if item is None:
+            raise LookupError("The item no longer exists (it may have been purged from the Trash).")
+
+        if kind == "rename":
+            self.db.rename_item(item['id'], action[2])
+            return ("rename", item['id'], item['name'])
+        if kind == "position":
+            self.db.set_item_position(item['id'], action[2], action[3])
+            return ("position", item['id'], item['parent_id'], item['display_order'])
+        if kind == "delete":
+            self.db.delete_item(item['id'])
+            return ("undelete", item['id'])
+        if kind == "undelete":
+            self.db.restore_item(item['id'])
+            return ("delete", item['id'])
+        raise ValueError(f"Unknown journal action: {kind}")
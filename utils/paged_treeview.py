@@ -0,0 +1,78 @@
+import tkinter as tk
+
+
+class PagedTreeview:
+    """
+    Fills a flat ttk.Treeview one page at a time as the user scrolls.
+
+    Only the first page is fetched up front; the next page is requested
+    when the visible area nears the bottom of what has been loaded.
+    """
+
+    def __init__(self, tree, scrollbar, fetch_page, row_to_item, page_size=100, prefetch_at=0.85,
+                 on_view_changed=None):
+        """
+        :param tree: The ttk.Treeview to fill
+        :param scrollbar: Its vertical ttk.Scrollbar
+        :param fetch_page: fetch_page(last_row, limit) -> rows after last_row (None for the first page)
+        :param row_to_item: row_to_item(row) -> (iid, text, values) for one tree row
+        :param page_size: Rows fetched per page
+        :param prefetch_at: Scroll fraction at which the next page is requested
+        :param on_view_changed: Called whenever the rows in view may have changed (scroll, resize, reload)
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.row_to_item = row_to_item
+        self.page_size = page_size
+        self.prefetch_at = prefetch_at
+        self.on_view_changed = on_view_changed
+
+        self.last_row = None
+        self.exhausted = False
+        self._load_pending = False
+
+        self.tree.configure(yscrollcommand=self._on_tree_scrolled)
+
+    def reload(self):
+        """Clears the tree and loads the first page again."""
+        self.tree.delete(*self.tree.get_children())
+        self.last_row = None
+        self.exhausted = False
+        self.load_next_page()
+
+    def load_next_page(self):
+        """Fetches and appends the next page of rows, if there is one."""
+        self._load_pending = False
+        if self.exhausted:
+            return
+
+        rows = self.fetch_page(self.last_row, self.page_size)
+        for row in rows:
+            iid, text, values = self.row_to_item(row)
+            self.tree.insert("", "end", iid=iid, text=text, values=values)
+
+        if rows:
+            self.last_row = rows[-1]
+        if len(rows) < self.page_size:
+            self.exhausted = True
+
+    def refresh_row(self, row):
+        """Updates a single already-loaded row in place."""
+        iid, text, values = self.row_to_item(row)
+        if self.tree.exists(iid):
+            self.tree.item(iid, text=text, values=values)
+
+    def _on_tree_scrolled(self, first, last):
+        """yscrollcommand hook: keeps the scrollbar in sync and pages in more rows."""
+        self.scrollbar.set(first, last)
+        if self.on_view_changed:
+            self.on_view_changed()
+        if self.exhausted or self._load_pending:
+            return
+        if float(last) >= self.prefetch_at:
+            self._load_pending = True
+            try:
+                self.tree.after_idle(self.load_next_page)
+            except tk.TclError:
+                self._load_pending = False  # Tree is being destroyed
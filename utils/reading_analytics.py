@@ -0,0 +1,183 @@
+"""
+Reading pace analytics and completion forecasts.
+
+Session history is bulk-loaded from SQLite as column arrays and every
+statistic is computed with NumPy group-bys (bincount / ufunc.at), so
+recomputing a whole class of projects costs a handful of array passes.
+"""
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+
+def _safe_divide(numerator, denominator):
+    """Element-wise division that yields 0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _forecast(today, remaining, pages_per_day):
+    """Projected completion dates; NaT where nothing remains or there is no pace."""
+    days_needed = np.ceil(_safe_divide(remaining, pages_per_day))
+    forecast = np.full(remaining.shape, np.datetime64("NaT"), dtype="datetime64[D]")
+    has_forecast = (remaining > 0) & (pages_per_day > 0)
+    forecast[has_forecast] = today + days_needed[has_forecast].astype("timedelta64[D]")
+    return forecast
+
+
+def compute_pace_stats(session_rows, reading_rows, today, window_days=7, history_days=90):
+    """
+    Computes per-reading and per-project pace and completion forecasts.
+
+    :param session_rows: (reading_id, project_id, start_epoch, duration_seconds, pages_read) tuples
+    :param reading_rows: (reading_id, project_id, total_pages, pages_read) tuples
+    :param today: The date forecasts are made from (datetime.date or 'YYYY-MM-DD')
+    :param window_days: Width of the rolling average, in days
+    :param history_days: How many days of rolling-average history to return
+    :return: dict with 'readings' and 'projects', each a dict of equal-length column arrays
+    """
+    today = np.datetime64(today, "D")
+    readings = np.array(reading_rows, dtype=np.int64).reshape(-1, 4)
+    sessions = np.array(session_rows, dtype=np.int64).reshape(-1, 5)
+
+    reading_ids = readings[:, 0]
+    total_pages = readings[:, 2]
+    progress = readings[:, 3]
+    project_ids, reading_project_index = np.unique(readings[:, 1], return_inverse=True)
+    reading_count = len(reading_ids)
+    project_count = len(project_ids)
+
+    # --- Map each session to its reading's row ---
+    order = np.argsort(reading_ids)
+    positions = np.searchsorted(reading_ids[order], sessions[:, 0])
+    positions = np.clip(positions, 0, max(reading_count - 1, 0))
+    if reading_count:
+        known = reading_ids[order][positions] == sessions[:, 0]
+    else:
+        known = np.zeros(len(sessions), dtype=bool)
+    sessions = sessions[known]
+    session_reading = order[positions[known]]
+    session_project = reading_project_index[session_reading]
+
+    starts = sessions[:, 2]
+    durations = sessions[:, 3].astype(np.float64)
+    pages = sessions[:, 4].astype(np.float64)
+    session_days = (starts // SECONDS_PER_DAY).astype("datetime64[D]")
+    days_ago = (today - session_days).astype(np.int64)
+
+    # --- Per reading ---
+    reading_pages = np.bincount(session_reading, weights=pages, minlength=reading_count)
+    reading_seconds = np.bincount(session_reading, weights=durations, minlength=reading_count)
+    reading_first_day = np.full(reading_count, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(reading_first_day, session_reading, days_ago)
+    reading_active_days = np.where(reading_first_day >= 0, reading_first_day + 1, 0)
+
+    reading_pace = _safe_divide(reading_pages, reading_active_days)
+    remaining = np.where(total_pages > 0, np.maximum(total_pages - progress, 0), 0)
+
+    # --- Per project: daily totals -> rolling average series ---
+    project_pages = np.bincount(session_project, weights=pages, minlength=project_count)
+    project_seconds = np.bincount(session_project, weights=durations, minlength=project_count)
+    project_first_day = np.full(project_count, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(project_first_day, session_project, days_ago)
+    project_active_days = np.where(project_first_day >= 0, project_first_day + 1, 0)
+
+    span = history_days + window_days
+    recent = (days_ago >= 0) & (days_ago < span)
+    daily = np.zeros((project_count, span), dtype=np.float64)
+    # Column 0 is the oldest day, column span-1 is today
+    np.add.at(daily, (session_project[recent], span - 1 - days_ago[recent]), pages[recent])
+    cumulative = np.cumsum(np.pad(daily, ((0, 0), (1, 0))), axis=1)
+    rolling = (cumulative[:, window_days:] - cumulative[:, :-window_days]) / window_days
+    rolling = rolling[:, -history_days:]
+    rolling_now = rolling[:, -1] if history_days else np.zeros(project_count)
+
+    project_remaining = np.bincount(reading_project_index, weights=remaining, minlength=project_count)
+    overall_pace = _safe_divide(project_pages, project_active_days)
+    # Forecast from the recent pace, falling back to the long-run pace when idle
+    project_pace = np.where(rolling_now > 0, rolling_now, overall_pace)
+
+    return {
+        "readings": {
+            "id": reading_ids,
+            "project_id": project_ids[reading_project_index],
+            "pages": reading_pages,
+            "hours": reading_seconds / 3600,
+            "pages_per_hour": _safe_divide(reading_pages, reading_seconds / 3600),
+            "pages_per_day": reading_pace,
+            "remaining": remaining,
+            "forecast": _forecast(today, remaining, reading_pace),
+        },
+        "projects": {
+            "id": project_ids,
+            "pages": project_pages,
+            "hours": project_seconds / 3600,
+            "pages_per_hour": _safe_divide(project_pages, project_seconds / 3600),
+            "rolling_pages_per_day": rolling_now,
+            "rolling_series": rolling,
+            "remaining": project_remaining,
+            "forecast": _forecast(today, project_remaining, project_pace),
+        },
+    }
+
+
+def summarize_projects(stats, today):
+    """
+    Collapses the per-project columns into one combined row (e.g. for a class).
+    :return: dict with pages, hours, pages_per_hour, rolling_pages_per_day, remaining, forecast
+    """
+    today = np.datetime64(today, "D")
+    projects = stats["projects"]
+    pages = projects["pages"].sum()
+    hours = projects["hours"].sum()
+    pace = projects["rolling_pages_per_day"].sum()
+    remaining = projects["remaining"].sum()
+    forecast = _forecast(today, np.array([remaining]), np.array([pace]))[0]
+    return {
+        "pages": float(pages),
+        "hours": float(hours),
+        "pages_per_hour": float(_safe_divide(pages, hours)),
+        "rolling_pages_per_day": float(pace),
+        "remaining": float(remaining),
+        "forecast": forecast,
+    }
+
+
+def load_pace_stats(db, project_ids, today, window_days=7):
+    """Loads the sessions and readings of the given projects in bulk and computes their stats."""
+    project_ids = list(project_ids)
+    return compute_pace_stats(
+        db.get_session_rows(project_ids),
+        db.get_reading_progress_rows(project_ids),
+        today,
+        window_days=window_days
+    )
+
+
+def load_class_pace_stats(db, class_id, today, window_days=7):
+    """Computes stats for every project in a class in one pass."""
+    project_ids = [item['id'] for item in db.get_items(class_id) if item['type'] == 'project']
+    return load_pace_stats(db, project_ids, today, window_days)
+
+
+def load_pace_panel(db, project_id, class_id, today, window_days=7):
+    """
+    Everything the dashboard's Pace & Forecast panel shows, so it can be
+    computed off the Tk thread.
+    :return: dict with stats, summary (None without a class), titles and names (id -> text)
+    """
+    if class_id is not None:
+        stats = load_class_pace_stats(db, class_id, today, window_days)
+        summary = summarize_projects(stats, today)
+        names = {item['id']: item['name'] for item in db.get_items(class_id)}
+    else:
+        stats = load_pace_stats(db, [project_id], today, window_days)
+        summary = None
+        names = {}
+    return {
+        "stats": stats,
+        "summary": summary,
+        "titles": {row['id']: row['title'] for row in db.get_reading_titles(project_id)},
+        "names": names,
+    }
@@ -0,0 +1,88 @@
+import heapq
+import itertools
+import time
+
+MAX_WAIT_MS = 24 * 60 * 60 * 1000  # Re-check at least daily (guards against clock changes and sleep)
+
+
+class ReminderScheduler:
+    """
+    Fires callbacks at wall-clock times from inside the Tk event loop.
+
+    Pending reminders live in a min-heap ordered by due time, and a single
+    after() timer is armed for the earliest one, so nothing runs (and the
+    database is never polled) until a reminder is actually due.
+    Rescheduling or cancelling a key just invalidates its old heap entry.
+    """
+
+    def __init__(self, root, on_due):
+        """
+        :param root: Any Tk widget, used for after()
+        :param on_due: Called with the key of each reminder as it comes due
+        """
+        self.root = root
+        self.on_due = on_due
+        self._heap = []  # (due_epoch, sequence, key)
+        self._entries = {}  # key -> sequence of its live heap entry
+        self._sequence = itertools.count()
+        self._timer = None
+        self._timer_due = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def schedule(self, key, due_epoch):
+        """Schedules (or moves) the reminder for key to a Unix timestamp."""
+        sequence = next(self._sequence)
+        self._entries[key] = sequence
+        heapq.heappush(self._heap, (due_epoch, sequence, key))
+        self._arm()
+
+    def cancel(self, key):
+        """Forgets a key's reminder; its heap entry is skipped when reached."""
+        if self._entries.pop(key, None) is not None:
+            self._arm()
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+        self._arm()
+
+    def _discard_stale(self):
+        """Pops cancelled or superseded entries off the top of the heap."""
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def _arm(self):
+        """Points the single after() timer at the earliest live reminder."""
+        self._discard_stale()
+        next_due = self._heap[0][0] if self._heap else None
+        if next_due == self._timer_due and self._timer is not None:
+            return
+
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+            self._timer_due = None
+        if next_due is None:
+            return
+
+        delay_ms = int(max(0.0, next_due - time.time()) * 1000)
+        self._timer = self.root.after(min(delay_ms, MAX_WAIT_MS), self._wake)
+        self._timer_due = next_due
+
+    def _wake(self):
+        self._timer = None
+        self._timer_due = None
+        now = time.time()
+        due_keys = []
+        self._discard_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key = heapq.heappop(self._heap)
+            del self._entries[key]
+            due_keys.append(key)
+            self._discard_stale()
+
+        self._arm()
+        for key in due_keys:
+            self.on_due(key)
@@ -0,0 +1,105 @@
+import math
+
+
+class GridIndex:
+    """
+    Uniform-grid spatial index of axis-aligned bounding boxes.
+
+    Each key is bucketed into every grid cell its box overlaps, so rectangle
+    and point queries only look at the handful of cells they cover instead
+    of every item.
+    """
+
+    def __init__(self, cell_size=200.0):
+        self.cell_size = float(cell_size)
+        self.cells = {}  # (cell_x, cell_y) -> set of keys
+        self.bounds = {}  # key -> (x0, y0, x1, y1)
+        self._key_cells = {}  # key -> cell range it is bucketed in
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def __contains__(self, key):
+        return key in self.bounds
+
+    def _cell_range(self, x0, y0, x1, y1):
+        size = self.cell_size
+        return (math.floor(x0 / size), math.floor(y0 / size),
+                math.floor(x1 / size), math.floor(y1 / size))
+
+    def _cells_in(self, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def insert(self, key, bbox):
+        """Adds (or replaces) a key with the given (x0, y0, x1, y1) box."""
+        if key in self.bounds:
+            self.remove(key)
+        x0, y0, x1, y1 = bbox
+        bbox = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        cell_range = self._cell_range(*bbox)
+        for cell in self._cells_in(cell_range):
+            self.cells.setdefault(cell, set()).add(key)
+        self.bounds[key] = bbox
+        self._key_cells[key] = cell_range
+
+    def remove(self, key):
+        """Removes a key; unknown keys are ignored."""
+        if key not in self.bounds:
+            return
+        for cell in self._cells_in(self._key_cells.pop(key)):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[cell]
+        del self.bounds[key]
+
+    def update(self, key, bbox):
+        """Moves a key to a new box, only re-bucketing it if it changed cells."""
+        x0, y0, x1, y1 = bbox
+        bbox = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        if key in self.bounds and self._key_cells[key] == self._cell_range(*bbox):
+            self.bounds[key] = bbox
+        else:
+            self.insert(key, bbox)
+
+    def clear(self):
+        self.cells.clear()
+        self.bounds.clear()
+        self._key_cells.clear()
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Returns the set of keys whose boxes intersect the rectangle."""
+        cell_range = self._cell_range(x0, y0, x1, y1)
+        cx0, cy0, cx1, cy1 = cell_range
+        candidates = set()
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # Zoomed far out: walking the occupied cells is cheaper
+            for (cx, cy), bucket in self.cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    candidates.update(bucket)
+        else:
+            for cell in self._cells_in(cell_range):
+                bucket = self.cells.get(cell)
+                if bucket:
+                    candidates.update(bucket)
+
+        bounds = self.bounds
+        return {
+            key for key in candidates
+            if bounds[key][0] <= x1 and bounds[key][2] >= x0
+            and bounds[key][1] <= y1 and bounds[key][3] >= y0
+        }
+
+    def query_point(self, x, y):
+        """Returns the set of keys whose boxes contain the point."""
+        size = self.cell_size
+        bucket = self.cells.get((math.floor(x / size), math.floor(y / size)), ())
+        bounds = self.bounds
+        return {
+            key for key in bucket
+            if bounds[key][0] <= x <= bounds[key][2] and bounds[key][1] <= y <= bounds[key][3]
+        }
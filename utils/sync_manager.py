@@ -0,0 +1,89 @@
+"""
+Syncing two copies of the database (e.g. on two machines) through small
+change files instead of copying the whole database file around.
+
+A change file holds the edits made on one database since the other last
+confirmed what it had imported: a header line, then one JSON line per
+changed row, gzip-compressed. Importing resolves each field last writer
+wins (see DatabaseManager.apply_sync_changes) and records which of the
+sender's changes are now here, which the next file sent back confirms.
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+
+SYNC_FILE_EXTENSION = ".rtsync"
+SYNC_FORMAT = 1  # Bumped when the file layout changes incompatibly
+SYNC_FILE_TYPES = [
+    ("Reading Tracker changes", f"*{SYNC_FILE_EXTENSION}"),
+    ("All files", "*.*"),
+]
+
+
+class SyncError(Exception):
+    """A change file that can't be imported into this database."""
+
+
+def export_changes(ctx, path, since_version=None):
+    """
+    Background task: writes this database's changes after since_version
+    (default: everything a peer hasn't confirmed yet) to a change file.
+    Rows are streamed from the database to the compressed file. Reports the
+    number of rows written; returns (rows, file size in bytes).
+    """
+    db = ctx.db
+    if since_version is None:
+        since_version = db.get_sync_watermark()
+    header = {
+        "format": SYNC_FORMAT,
+        "site": db.get_sync_site(),
+        "since": since_version,
+        "version": db.get_sync_version(),
+        "acks": db.get_sync_acks(),
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    rows = 0
+    temp_path = path + ".tmp"
+    try:
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for change in db.iter_sync_changes(since_version, header["version"]):
+                ctx.check_cancelled()
+                f.write(json.dumps(change, separators=(",", ":")) + "\n")
+                rows += 1
+                ctx.report_progress(rows)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return rows, os.path.getsize(path)
+
+
+def read_changes(f):
+    """Yields the change rows of an open change file, one at a time."""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def import_changes(ctx, path):
+    """
+    Background task: applies a change file written by another copy of the
+    database. Reports the number of rows handled; returns the counts from
+    apply_sync_changes. Raises SyncError for a file this database can't use.
+    """
+    db = ctx.db
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if not isinstance(header, dict) or header.get("format") != SYNC_FORMAT:
+                raise SyncError("This is not a change file this version can read.")
+            if header["site"] == db.get_sync_site():
+                raise SyncError("This change file was exported from this database.")
+            return db.apply_sync_changes(header, read_changes(f), progress=ctx.report_progress)
+    except (OSError, EOFError, ValueError) as e:
+        # gzip.BadGzipFile is an OSError, broken JSON a ValueError
+        raise SyncError(f"The change file could not be read: {e}") from e
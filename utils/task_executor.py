@@ -0,0 +1,252 @@
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Add project root to sys.path ---
+import sys
+import os
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(file_dir)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+# --- END FIX ---
+
+from database_manager import DatabaseManager
+
+POLL_MS = 25  # How often finished tasks are picked up while any are outstanding
+CLOSE_WAIT_SECONDS = 10  # How long a worker holds on at shutdown so each worker gets a close task
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task by TaskContext.check_cancelled()."""
+
+
+class TaskContext:
+    """What a background task gets as its first argument."""
+
+    def __init__(self, executor, future):
+        self._executor = executor
+        self._future = future
+
+    @property
+    def db(self):
+        """This worker thread's own DatabaseManager (SQLite connections are per thread)."""
+        return self._executor._thread_db()
+
+    @property
+    def cancelled(self):
+        return self._future._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def report_progress(self, value):
+        """Sends value to the task's on_progress callback (on the Tk thread)."""
+        self._executor._results.put(("progress", self._future, value))
+
+
+class TaskFuture:
+    """Handle to a submitted task."""
+
+    def __init__(self, on_done, on_error, on_progress, owner):
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.owner = owner
+        self._cancel_event = threading.Event()
+        self._done = False
+        self._result = None
+        self._error = None
+
+    def cancel(self):
+        """
+        Cancels the task. A task that has not started never runs; a running one
+        sees ctx.cancelled. Either way none of its callbacks are called.
+        """
+        self._cancel_event.set()
+
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        """The task's return value (only meaningful once done)."""
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class TaskExecutor:
+    """
+    Runs database work on a small thread pool so the Tk thread never blocks.
+
+    Each worker thread opens its own DatabaseManager on the same file.
+    Results, errors and progress reports are put on a queue that the Tk
+    thread drains with after(), so every callback runs on the Tk thread.
+    Tasks sharing a serial key run one after another in submission order
+    (e.g. successive saves of the same note).
+    """
+
+    def __init__(self, root, db_file, max_workers=2):
+        self.root = root
+        self.db_file = db_file
+        self._max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-task")
+        self._local = threading.local()
+        self._results = queue.Queue()
+        self._outstanding = 0
+        self._poll_job = None
+        self._serial_lock = threading.Lock()
+        self._serial_queues = {}  # serial key -> list of (future, fn, args, kwargs) waiting to run
+
+    def _thread_db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = DatabaseManager(self.db_file, initialize=False)
+            self._local.db = db
+        return db
+
+    def _close_thread_db(self, barrier):
+        """
+        Closes this worker's connection. SQLite connections must be closed on
+        the thread that opened them, so shutdown queues one of these per worker;
+        the barrier keeps a worker from taking a second one.
+        """
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.conn.close()
+            self._local.db = None
+        try:
+            barrier.wait(CLOSE_WAIT_SECONDS)
+        except threading.BrokenBarrierError:
+            pass  # Another worker is still busy; its connection closes when the process exits
+
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None, owner=None, serial=None, **kwargs):
+        """
+        Runs fn(ctx, *args, **kwargs) on a worker thread.
+
+        :param on_done: Called with the return value
+        :param on_error: Called with the exception (default: printed)
+        :param on_progress: Called with each value passed to ctx.report_progress
+        :param owner: Widget the callbacks belong to; they are skipped once it is destroyed
+        :param serial: Tasks with the same key run one at a time, in order
+        :return: TaskFuture
+        """
+        future = TaskFuture(on_done, on_error, on_progress, owner)
+        self._outstanding += 1
+        self._ensure_polling()
+
+        if serial is None:
+            self._pool.submit(self._run, future, fn, args, kwargs)
+            return future
+
+        with self._serial_lock:
+            waiting = self._serial_queues.setdefault(serial, [])
+            waiting.append((future, fn, args, kwargs))
+            if len(waiting) == 1:
+                self._pool.submit(self._run_serial, serial)
+        return future
+
+    def _run(self, future, fn, args, kwargs):
+        if future.cancelled():
+            self._results.put(("cancelled", future, None))
+            return
+        try:
+            result = fn(TaskContext(self, future), *args, **kwargs)
+        except TaskCancelled:
+            self._results.put(("cancelled", future, None))
+        except Exception as e:
+            self._results.put(("error", future, e))
+        else:
+            self._results.put(("done", future, result))
+
+    def _run_serial(self, serial):
+        """Runs the serial queue's tasks back to back on this worker."""
+        while True:
+            with self._serial_lock:
+                future, fn, args, kwargs = self._serial_queues[serial][0]
+            self._run(future, fn, args, kwargs)
+            with self._serial_lock:
+                waiting = self._serial_queues[serial]
+                waiting.pop(0)
+                if not waiting:
+                    del self._serial_queues[serial]
+                    return
+
+    def idle(self):
+        """True when no submitted task is still waiting, running or undelivered."""
+        return self._outstanding == 0
+
+    # --- Tk side ---
+
+    def _ensure_polling(self):
+        if self._poll_job is None:
+            try:
+                self._poll_job = self.root.after(POLL_MS, self._drain)
+            except tk.TclError:
+                pass  # Tk is shutting down; the work still runs, its callbacks are dropped
+
+    def _drain(self):
+        self._poll_job = None
+        while True:
+            try:
+                kind, future, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind != "progress":
+                future._done = True
+                self._outstanding -= 1
+                if kind == "done":
+                    future._result = value
+                elif kind == "error":
+                    future._error = value
+            if future.cancelled() or kind == "cancelled":
+                continue
+            if future.owner is not None and not self._owner_alive(future.owner):
+                continue
+            self._dispatch(kind, future, value)
+
+        if self._outstanding > 0:
+            self._ensure_polling()
+
+    @staticmethod
+    def _owner_alive(owner):
+        try:
+            return bool(owner.winfo_exists())
+        except Exception:
+            return False
+
+    @staticmethod
+    def _dispatch(kind, future, value):
+        if kind == "progress":
+            if future.on_progress:
+                future.on_progress(value)
+        elif kind == "done":
+            if future.on_done:
+                future.on_done(value)
+        elif future.on_error:
+            future.on_error(value)
+        else:
+            print(f"Background task failed: {value!r}")
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting work and closes the workers' connections once the
+        queued tasks are done; with wait=True, outstanding saves are finished first.
+        """
+        if self._poll_job is not None:
+            try:
+                self.root.after_cancel(self._poll_job)
+            except tk.TclError:
+                pass  # Tk already destroyed
+            self._poll_job = None
+        barrier = threading.Barrier(self._max_workers)
+        for _ in range(self._max_workers):
+            self._pool.submit(self._close_thread_db, barrier)
+        self._pool.shutdown(wait=wait)
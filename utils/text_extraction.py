@@ -0,0 +1,119 @@
+"""
+Text extraction from attachment files. Runs in worker processes (see
+utils/extraction_queue.py), so nothing here touches Tk or the database:
+a job gets a stored file and returns the text chunks to index.
+"""
+import re
+import zipfile
+from html.parser import HTMLParser
+
+try:
+    import pypdf  # Optional: without it PDF jobs fail with a clear message
+except ImportError:
+    pypdf = None
+
+from utils.attachment_store import AttachmentStore, MappedFile
+
+CHUNK_CHARS = 2000  # Target size of one indexed chunk; chunks break at paragraph/word boundaries
+TEXT_MEDIA_TYPES = ("text/plain", "text/markdown", "text/x-markdown")
+EPUB_MEDIA_TYPE = "application/epub+zip"
+PDF_MEDIA_TYPE = "application/pdf"
+WHITESPACE_RUN = re.compile(r"[ \t\r\f\v]+")
+
+
+class UnsupportedFileType(Exception):
+    """The file's type has no extractor; the job is marked failed with this message."""
+
+
+def extract_chunks(store_root, sha256, media_type, filename):
+    """Worker entry point: the chunked text of one stored file."""
+    store = AttachmentStore(store_root)
+    with store.open_blob(sha256) as data:
+        if media_type == PDF_MEDIA_TYPE or filename.lower().endswith(".pdf"):
+            text = extract_pdf(data)
+        elif media_type == EPUB_MEDIA_TYPE or filename.lower().endswith(".epub"):
+            text = extract_epub(data)
+        elif media_type in TEXT_MEDIA_TYPES or filename.lower().endswith((".txt", ".md")):
+            text = decode_text(data)
+        else:
+            raise UnsupportedFileType(f"No text extractor for '{filename}'")
+    return chunk_text(text)
+
+
+def decode_text(data):
+    raw = bytes(data)
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def extract_pdf(data):
+    if pypdf is None:
+        raise UnsupportedFileType("PDF text extraction needs the pypdf package")
+    # Objects are read from the mapping as pages need them, without loading the whole file
+    reader = pypdf.PdfReader(MappedFile(data))
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+class _HTMLText(HTMLParser):
+    """Collects the visible text of an XHTML document, one paragraph per block element."""
+    BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "blockquote"}
+    SKIP_TAGS = {"script", "style", "head"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skipping += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def extract_epub(data):
+    """The text of an EPUB's XHTML documents, in the order they are stored in the archive."""
+    parts = []
+    with zipfile.ZipFile(MappedFile(data)) as archive:
+        for name in archive.namelist():
+            if not name.lower().endswith((".xhtml", ".html", ".htm")):
+                continue
+            parser = _HTMLText()
+            parser.feed(archive.read(name).decode("utf-8", errors="replace"))
+            parser.close()
+            parts.append("".join(parser.parts))
+    return "\n\n".join(parts)
+
+
+def chunk_text(text, chunk_chars=CHUNK_CHARS):
+    """Splits text into chunks of about chunk_chars, preferring paragraph breaks, then spaces."""
+    paragraphs = [WHITESPACE_RUN.sub(" ", p).strip() for p in re.split(r"\n\s*\n", text)]
+    chunks = []
+    current = ""
+    for paragraph in filter(None, paragraphs):
+        while len(paragraph) > chunk_chars:
+            cut = paragraph.rfind(" ", 0, chunk_chars)
+            if cut <= 0:
+                cut = chunk_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if current and len(current) + len(paragraph) + 2 > chunk_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
@@ -26,6 +26,18 @@ class TextToolbar(ttk.Frame):
         )
         self.indent_active = False  # State tracker
 
+        # Named style tags, shared with the markdown highlighter
+        base_font = font.Font(font=self.text_widget.cget("font")).actual()
+        self.fonts["bold"] = font.Font(**{**base_font, "weight": "bold"})
+        self.fonts["italic"] = font.Font(**{**base_font, "slant": "italic"})
+        self.text_widget.tag_configure("bold", font=self.fonts["bold"])
+        self.text_widget.tag_configure("italic", font=self.fonts["italic"])
+        self.text_widget.tag_configure(
+            "bullet",
+            lmargin1=10,
+            lmargin2=25
+        )
+
         # --- Create Buttons (Now with Tooltips) ---
         btn_bold = ttk.Button(self, text="B", width=3, command=lambda: self.toggle_tag("bold"))
         btn_bold.pack(side="left", padx=2, pady=2)
@@ -0,0 +1,323 @@
+"""
+Cover thumbnails for attached files, rendered with PIL in worker processes
+and kept in a size-capped, least-recently-used cache on disk.
+"""
+import multiprocessing
+import os
+import posixpath
+import queue
+import tkinter as tk
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from xml.etree import ElementTree
+
+from PIL import Image
+
+try:
+    import fitz  # Optional (PyMuPDF): renders the first page of a PDF
+except ImportError:
+    fitz = None
+try:
+    import pypdf  # Optional: falls back to the first image embedded in page 1
+except ImportError:
+    pypdf = None
+
+from utils.attachment_store import AttachmentStore, MappedFile
+
+CACHE_DIR_NAME = "thumbnails"  # Created next to the database file
+CACHE_MAX_BYTES = 32 * 1024 * 1024  # Least recently used thumbnails are deleted past this
+# Thumbnail sizes (width, height) by where they are shown
+THUMBNAIL_SIZES = {
+    "row": (24, 32),  # Reading list rows
+}
+THUMBNAIL_WORKERS = min(4, os.cpu_count() or 1)
+POLL_MS = 50  # How often finished thumbnails are picked up while any are being made
+NO_COVER_SUFFIX = ".none"  # Empty marker: the file has no usable cover, don't try again
+NO_COVER_MARKER_BYTES = 512  # What a marker counts toward the cache size, so old ones are evicted too
+MAX_RENDER_ATTEMPTS = 3  # Failed renders of a file per session before it is shown without a cover
+
+
+# --- Rendering (runs in the worker processes) ---
+
+def render_thumbnail(store_root, sha256, media_type, size, target_path):
+    """
+    Worker entry point: writes the cover of a stored file, scaled to fit
+    size, as a PNG at target_path. Returns target_path, or None (after
+    writing the no-cover marker) when the file has no cover to show.
+    """
+    store = AttachmentStore(store_root)
+    with store.open_blob(sha256) as data:
+        if media_type == "application/pdf":
+            image = pdf_cover(data, size)
+        elif media_type == "application/epub+zip":
+            image = epub_cover(data, size)
+        else:
+            image = Image.open(MappedFile(data))
+        if image is None:
+            open(target_path + NO_COVER_SUFFIX, "wb").close()
+            return None
+
+        # For JPEGs, draft() decodes straight at a reduced scale, which is far cheaper than a full decode
+        image.draft("RGB", size)
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        temp_path = target_path + ".tmp"
+        image.save(temp_path, "PNG")
+    os.replace(temp_path, target_path)  # Never leaves a half-written thumbnail behind
+    return target_path
+
+
+def pdf_cover(data, size):
+    if fitz is not None:
+        with fitz.open(stream=bytes(data), filetype="pdf") as document:
+            if document.page_count == 0:
+                return None
+            page = document[0]
+            scale = min(size[0] * 2 / page.rect.width, size[1] * 2 / page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale))
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+    if pypdf is not None:
+        reader = pypdf.PdfReader(MappedFile(data))
+        if reader.pages and reader.pages[0].images:
+            return reader.pages[0].images[0].image
+    return None
+
+
+def epub_cover(data, size):
+    """The cover image an EPUB's package file declares (EPUB 3 or 2), else an image named 'cover'."""
+    with zipfile.ZipFile(MappedFile(data)) as archive:
+        names = archive.namelist()
+        href = None
+        try:
+            container = ElementTree.fromstring(archive.read("META-INF/container.xml"))
+            rootfile = next(el for el in container.iter() if el.tag.endswith("rootfile"))
+            opf_path = rootfile.get("full-path")
+            package = ElementTree.fromstring(archive.read(opf_path))
+            items = [el for el in package.iter() if el.tag.endswith("item")]
+            cover_id = next((el.get("content") for el in package.iter()
+                             if el.tag.endswith("meta") and el.get("name") == "cover"), None)
+            for item in items:
+                if "cover-image" in (item.get("properties") or "").split() or item.get("id") == cover_id:
+                    href = posixpath.normpath(posixpath.join(posixpath.dirname(opf_path), item.get("href")))
+                    break
+        except (KeyError, StopIteration, ElementTree.ParseError):
+            pass
+        if href not in names:
+            href = next((name for name in names if "cover" in name.lower()
+                         and name.lower().endswith((".jpg", ".jpeg", ".png", ".gif"))), None)
+        if href is None:
+            return None
+        image = Image.open(archive.open(href))
+        image.draft("RGB", size)
+        image.load()  # Read it before the archive closes
+        return image
+
+
+# --- Cache (Tk side) ---
+
+class ThumbnailCache:
+    """
+    Thumbnails of attached files, by blob and size.
+
+    Each thumbnail is a small PNG in the cache directory, named after the
+    blob's sha256 and the size. Missing ones are rendered in a process
+    pool; a cache hit touches the file's mtime, which is the LRU order (so
+    it survives restarts), and once the cache is over CACHE_MAX_BYTES the
+    least recently used files are deleted. Callers get file paths and decide
+    themselves when to decode them into PhotoImages.
+
+    A file whose render fails is retried on later requests, up to
+    MAX_RENDER_ATTEMPTS per session. A worker crash breaks the whole pool:
+    it is replaced, and the thumbnails that were in flight are rendered
+    again one at a time, so only the file that crashes on its own is
+    charged an attempt.
+    """
+
+    def __init__(self, root, cache_dir, store, max_bytes=CACHE_MAX_BYTES):
+        self.root = root
+        self.cache_dir = cache_dir
+        self.store = store
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._pool = None
+        self._pool_generation = 0  # Results from a pool that was replaced are ignored
+        self._results = queue.Queue()
+        self._waiting = {}  # target path -> [(callback, owner)]
+        self._jobs = {}  # target path -> render_thumbnail arguments, until it finishes
+        self._in_flight = set()  # Target paths submitted to the current pool
+        self._suspects = deque()  # Target paths in flight when a worker crashed, rerun one at a time
+        self._failures = {}  # target path -> failed renders this session
+        self._poll_job = None
+        self._index = None  # file name -> bytes, least recently used first (built on first use)
+        self._total_bytes = 0
+
+    @classmethod
+    def for_database(cls, root, db_file, store):
+        return cls(root, os.path.join(os.path.dirname(os.path.abspath(db_file)), CACHE_DIR_NAME), store)
+
+    def request(self, sha256, media_type, callback, kind="row", owner=None):
+        """
+        Calls callback(path) with the PNG thumbnail of a blob, or callback(None)
+        if it has no cover. Immediate on a cache hit; otherwise the thumbnail
+        is rendered in the background and callback runs on the Tk thread
+        (skipped if owner has been destroyed by then).
+        """
+        width, height = THUMBNAIL_SIZES[kind]
+        name = f"{sha256}_{width}x{height}.png"
+        path = os.path.join(self.cache_dir, name)
+        self._ensure_index()
+        if name in self._index:
+            self._touch(name, path)
+            callback(path)
+            return
+        if name + NO_COVER_SUFFIX in self._index or self._failures.get(path, 0) >= MAX_RENDER_ATTEMPTS:
+            callback(None)
+            return
+
+        if path in self._waiting:
+            self._waiting[path].append((callback, owner))
+            return
+        self._waiting[path] = [(callback, owner)]
+        self._jobs[path] = (self.store.root_dir, sha256, media_type, (width, height), path)
+        if self._suspects:
+            self._suspects.append(path)  # Waits until the crash is tracked down
+        else:
+            self._submit(path)
+        self._ensure_polling()
+
+    def _submit(self, path):
+        if self._pool is None:
+            # Spawned, not forked: forking a process that runs Tk is unsafe
+            self._pool = ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        future = self._pool.submit(render_thumbnail, *self._jobs[path])
+        generation = self._pool_generation
+        future.add_done_callback(lambda f, path=path: self._results.put((path, f, generation)))
+        self._in_flight.add(path)
+
+    def _replace_pool(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._pool_generation += 1
+        self._in_flight.clear()
+
+    def shutdown(self):
+        if self._poll_job is not None:
+            try:
+                self.root.after_cancel(self._poll_job)
+            except tk.TclError:
+                pass
+            self._poll_job = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- LRU bookkeeping ---
+
+    def _ensure_index(self):
+        if self._index is not None:
+            return
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith((".png", NO_COVER_SUFFIX)):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, self._entry_size(entry.name, stat.st_size)))
+        entries.sort()
+        self._index = OrderedDict((name, size) for _, name, size in entries)
+        self._total_bytes = sum(self._index.values())
+
+    def _touch(self, name, path):
+        self._index.move_to_end(name)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _entry_size(name, size):
+        return NO_COVER_MARKER_BYTES if name.endswith(NO_COVER_SUFFIX) else size
+
+    def _add(self, name, path):
+        try:
+            size = self._entry_size(name, os.path.getsize(path))
+        except OSError:
+            return
+        self._index[name] = size
+        self._total_bytes += size
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            old_name, old_size = self._index.popitem(last=False)
+            self._total_bytes -= old_size
+            try:
+                os.remove(os.path.join(self.cache_dir, old_name))
+            except OSError:
+                pass
+
+    # --- Tk side ---
+
+    def _ensure_polling(self):
+        if self._poll_job is None:
+            try:
+                self._poll_job = self.root.after(POLL_MS, self._drain)
+            except tk.TclError:
+                pass  # Tk is shutting down
+
+    def _drain(self):
+        self._poll_job = None
+        while True:
+            try:
+                path, future, generation = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._pool_generation:
+                continue  # Already queued again after the crash
+            self._in_flight.discard(path)
+            if future.cancelled():
+                self._jobs.pop(path, None)
+                self._waiting.pop(path, None)
+                continue
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # A worker died (e.g. PyMuPDF on a malformed PDF)
+                if self._in_flight:
+                    # Any of the thumbnails sharing the pool may have caused it
+                    self._suspects.extendleft(reversed([path] + sorted(self._in_flight)))
+                    self._replace_pool()
+                    continue
+                self._replace_pool()
+                self._failures[path] = self._failures.get(path, 0) + 1
+                print(f"Thumbnail worker crashed on {os.path.basename(path)}")
+                if self._failures[path] < MAX_RENDER_ATTEMPTS:
+                    self._submit(path)
+                    continue
+                result = None
+            except Exception as e:
+                # Unreadable file: shown without a cover, tried again on a later request
+                print(f"Thumbnail failed for {os.path.basename(path)}: {e!r}")
+                self._failures[path] = self._failures.get(path, 0) + 1
+                result = None
+            else:
+                name = os.path.basename(path)
+                self._add(name if result else name + NO_COVER_SUFFIX, result or path + NO_COVER_SUFFIX)
+            self._finish(path, result)
+
+        if self._suspects and not self._in_flight:
+            self._submit(self._suspects.popleft())
+        if self._waiting:
+            self._ensure_polling()
+
+    def _finish(self, path, result):
+        self._jobs.pop(path, None)
+        for callback, owner in self._waiting.pop(path, []):
+            if owner is None or self._owner_alive(owner):
+                callback(result)
+
+    @staticmethod
+    def _owner_alive(owner):
+        try:
+            return bool(owner.winfo_exists())
+        except Exception:
+            return False